@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import json
 import os
+from pathlib import Path
 
 # Backend API base URL for the local TestProduct API
 # e.g. http://localhost:8000
@@ -27,3 +29,212 @@ COOKIE_DOMAIN = os.getenv("TESTPRODUCT_AUTH_ORIGIN", UI_BASE_URL.rstrip("/"))
 #   TESTPRODUCT_PASSWORD
 API_USERNAME = os.getenv("TESTPRODUCT_USERNAME", "user1")
 API_PASSWORD = os.getenv("TESTPRODUCT_PASSWORD", "123456")
+
+# Source directory of the TestProduct API (server.js, store.js). Used to map API routes to
+# handler code for impact-based test selection.
+API_SOURCE_DIR = Path(
+    os.getenv("TESTPRODUCT_API_SOURCE_DIR", str(Path(__file__).resolve().parents[2] / "TestProduct" / "API"))
+)
+
+# Path to the TestProduct API JSON store. Used by the seeding tool (utils/seed_data.py) to
+# bulk-load large datasets directly; only valid when the API runs on the same machine.
+# Defaults to the ignored copy the API uses when started with DATA_FILE=.data/data.json (as
+# in CI), so seeding never rewrites the tracked data.json. If the API was started without
+# it, the file does not exist and seeding goes through the API instead.
+API_DATA_FILE = Path(
+    os.getenv(
+        "TESTPRODUCT_API_DATA_FILE",
+        str(Path(__file__).resolve().parents[2] / "TestProduct" / "API" / ".data" / "data.json"),
+    )
+)
+
+# Last name used to tag seeded clients so they can be purged in bulk (letters-only).
+SEED_LAST_NAME = os.getenv("TESTPRODUCT_SEED_LAST_NAME", "Seeded")
+
+# Dataset sizes and render budgets for the client list scaling tests (tests/test_ui_scaling.py).
+#   TESTPRODUCT_SCALING_SIZES=1000,10000,100000
+#   TESTPRODUCT_SCALING_RENDER_BUDGET_MS=60000
+SCALING_SIZES = [int(s) for s in os.getenv("TESTPRODUCT_SCALING_SIZES", "1000,10000,100000").split(",") if s.strip()]
+SCALING_RENDER_BUDGET_MS = int(os.getenv("TESTPRODUCT_SCALING_RENDER_BUDGET_MS", "60000"))
+SCALING_LOCATOR_BUDGET_MS = int(os.getenv("TESTPRODUCT_SCALING_LOCATOR_BUDGET_MS", "5000"))
+
+# Adaptive timeouts (utils/timeouts.py): page objects derive waits from the p99 latency
+# observed in recent runs instead of fixed worst-case values.
+#   TESTPRODUCT_ADAPTIVE_TIMEOUTS=0 disables learning and uses the static defaults.
+ADAPTIVE_TIMEOUTS = os.getenv("TESTPRODUCT_ADAPTIVE_TIMEOUTS", "1").lower() not in ("0", "false", "no")
+TIMEOUT_HISTORY_DIR = Path(os.getenv("TESTPRODUCT_TIMEOUT_HISTORY_DIR", str(Path(__file__).resolve().parents[1] / ".timings")))
+TIMEOUT_SAFETY_FACTOR = float(os.getenv("TESTPRODUCT_TIMEOUT_SAFETY_FACTOR", "3"))
+TIMEOUT_MIN_SAMPLES = int(os.getenv("TESTPRODUCT_TIMEOUT_MIN_SAMPLES", "10"))
+TIMEOUT_WINDOW = int(os.getenv("TESTPRODUCT_TIMEOUT_WINDOW", "200"))
+TIMEOUT_FLOOR_MS = float(os.getenv("TESTPRODUCT_TIMEOUT_FLOOR_MS", "1000"))
+TIMEOUT_MAX_MULTIPLIER = float(os.getenv("TESTPRODUCT_TIMEOUT_MAX_MULTIPLIER", "2"))
+
+# Per-probe timeout (seconds) for the pre-session dependency health gate (utils/health.py).
+HEALTH_PROBE_TIMEOUT_S = float(os.getenv("TESTPRODUCT_HEALTH_PROBE_TIMEOUT_S", "3"))
+
+# Failure artifacts (browser event logs, traces, ...) are written under this directory.
+ARTIFACTS_DIR = Path(os.getenv("TESTPRODUCT_ARTIFACTS_DIR", str(Path(__file__).resolve().parents[1] / ".artifacts")))
+
+# Browser event capture for UI tests (utils/browser_events.py). Events are buffered in memory
+# per page and only written (as JSON lines) when a test fails.
+#   TESTPRODUCT_BROWSER_EVENT_LEVELS: comma-separated subset of error,warning,info,debug
+#   TESTPRODUCT_BROWSER_EVENT_URL_PATTERN: regex applied to network event URLs
+BROWSER_EVENT_BUFFER_SIZE = int(os.getenv("TESTPRODUCT_BROWSER_EVENT_BUFFER_SIZE", "500"))
+BROWSER_EVENT_LEVELS = [s.strip() for s in os.getenv("TESTPRODUCT_BROWSER_EVENT_LEVELS", "error,warning").split(",") if s.strip()]
+BROWSER_EVENT_URL_PATTERN = os.getenv("TESTPRODUCT_BROWSER_EVENT_URL_PATTERN") or None
+
+# Retry layer for infrastructure failures (utils/retry.py). Only failures classified as
+# environmental (connection errors, 5xx, crashed browser, warmup navigation timeouts) are
+# retried, with exponential backoff starting at INFRA_RETRY_BACKOFF_S.
+INFRA_RETRIES = int(os.getenv("TESTPRODUCT_INFRA_RETRIES", "2"))
+INFRA_RETRY_BACKOFF_S = float(os.getenv("TESTPRODUCT_INFRA_RETRY_BACKOFF_S", "1.0"))
+RETRY_WARMUP_TESTS = int(os.getenv("TESTPRODUCT_RETRY_WARMUP_TESTS", "3"))
+
+# Impact-based selection (utils/impact.py): per-test file/route map recorded with
+# --record-impact and consumed by --changed-since=<ref>.
+IMPACT_MAP_DIR = Path(os.getenv("TESTPRODUCT_IMPACT_MAP_DIR", str(Path(__file__).resolve().parents[1] / ".impact")))
+
+# Persistent result cache for deterministic tests (utils/result_cache.py, --result-cache).
+RESULT_CACHE_DIR = Path(os.getenv("TESTPRODUCT_RESULT_CACHE_DIR", str(Path(__file__).resolve().parents[1] / ".result-cache")))
+
+# Request-level latency profiling of api_context (utils/api_profiler.py). Per-test call
+# tables go into the HTML report; the session summary is written to ARTIFACTS_DIR.
+API_PROFILE = os.getenv("TESTPRODUCT_API_PROFILE", "1").lower() not in ("0", "false", "no")
+
+# Read-only UI checks (utils/readonly_batch.py, --readonly-batch): maximum number of pages
+# driven concurrently inside the shared context.
+READONLY_BATCH_CONCURRENCY = int(os.getenv("TESTPRODUCT_READONLY_BATCH_CONCURRENCY", "4"))
+
+# Browser launch profile for UI tests (utils/browser_profile.py, --browser-profile).
+#   default: stock launch, every resource loaded.
+#   lean:    Chromium launched with unused features off, and non-essential requests
+#            (resource types / URL globs below) aborted through context routing.
+# Tests opt back in with @pytest.mark.allow_resources(...) (see pytest.ini).
+BROWSER_PROFILE = os.getenv("TESTPRODUCT_BROWSER_PROFILE", "default")
+LEAN_BLOCKED_RESOURCE_TYPES = [
+    s.strip() for s in os.getenv("TESTPRODUCT_LEAN_BLOCKED_RESOURCE_TYPES", "image,media,font").split(",") if s.strip()
+]
+LEAN_BLOCKED_URL_PATTERNS = [
+    s.strip()
+    for s in os.getenv(
+        "TESTPRODUCT_LEAN_BLOCKED_URL_PATTERNS",
+        "**/client-actions/**,**/*google-analytics.com/**,**/*googletagmanager.com/**,"
+        "**/fonts.googleapis.com/**,**/fonts.gstatic.com/**",
+    ).split(",")
+    if s.strip()
+]
+
+# Memory monitor for browser workers (utils/memory.py, --memory-monitor). RSS of the pytest
+# worker and its Playwright driver/browser processes is sampled around every test.
+#   MEMORY_HEADROOM: fraction of available RAM the recommended worker count may use
+MEMORY_HEADROOM = float(os.getenv("TESTPRODUCT_MEMORY_HEADROOM", "0.8"))
+
+# Session browser recycling (utils/browser_manager.py). The browser is relaunched between
+# tests after BROWSER_RECYCLE_TESTS tests (0 = never) or once its process tree exceeds
+# MEMORY_RECYCLE_MB of RSS (checked only when psutil is installed; 0 = never).
+BROWSER_RECYCLE_TESTS = int(os.getenv("TESTPRODUCT_BROWSER_RECYCLE_TESTS", "0"))
+MEMORY_RECYCLE_MB = float(os.getenv("TESTPRODUCT_MEMORY_RECYCLE_MB", "1500"))
+
+# Shared browser servers (utils/browser_server.py, --browser-server). The xdist controller
+# starts BROWSER_SERVER_POOL_SIZE browser servers; workers connect to them round-robin.
+BROWSER_SERVER_POOL_SIZE = int(os.getenv("TESTPRODUCT_BROWSER_SERVER_POOL_SIZE", "1"))
+BROWSER_SERVER_START_TIMEOUT_S = float(os.getenv("TESTPRODUCT_BROWSER_SERVER_START_TIMEOUT_S", "30"))
+
+# Run history (utils/run_history.py): every run's results and step timings go into a local
+# SQLite database. Tests whose flake score (outcome flips over the last FLAKE_WINDOW runs)
+# reaches FLAKE_THRESHOLD after at least FLAKE_MIN_RUNS runs are quarantined automatically.
+RUN_HISTORY = os.getenv("TESTPRODUCT_RUN_HISTORY", "1").lower() not in ("0", "false", "no")
+RUN_HISTORY_DB = Path(os.getenv("TESTPRODUCT_RUN_HISTORY_DB", str(Path(__file__).resolve().parents[1] / ".history" / "runs.sqlite")))
+FLAKE_WINDOW = int(os.getenv("TESTPRODUCT_FLAKE_WINDOW", "20"))
+FLAKE_MIN_RUNS = int(os.getenv("TESTPRODUCT_FLAKE_MIN_RUNS", "5"))
+FLAKE_THRESHOLD = float(os.getenv("TESTPRODUCT_FLAKE_THRESHOLD", "0.3"))
+
+# Visual checks (utils/visual.py). Baselines are content-addressed PNGs plus an index under
+# VISUAL_BASELINE_DIR (commit them); diff images for failures go to ARTIFACTS_DIR/visual.
+#   TESTPRODUCT_VISUAL: check (default), update (re-record every baseline) or off
+#   VISUAL_PIXEL_TOLERANCE: per-channel difference (0-255) below which a pixel counts as equal
+#   VISUAL_MAX_DIFF_RATIO: fraction of differing pixels still accepted
+VISUAL_MODE = os.getenv("TESTPRODUCT_VISUAL", "check")
+VISUAL_BASELINE_DIR = Path(os.getenv("TESTPRODUCT_VISUAL_BASELINE_DIR", str(Path(__file__).resolve().parents[1] / "visual-baselines")))
+VISUAL_PIXEL_TOLERANCE = int(os.getenv("TESTPRODUCT_VISUAL_PIXEL_TOLERANCE", "16"))
+VISUAL_MAX_DIFF_RATIO = float(os.getenv("TESTPRODUCT_VISUAL_MAX_DIFF_RATIO", "0.001"))
+# Record missing baselines in VISUAL_BASELINE_DIR (default off under CI, where a recorded
+# baseline would be thrown away). Otherwise the check passes with a MissingBaselineWarning and
+# the capture is saved in baseline layout under ARTIFACTS_DIR/visual/new for approval.
+VISUAL_RECORD_MISSING = os.getenv("TESTPRODUCT_VISUAL_RECORD_MISSING", "0" if os.getenv("CI") else "1") == "1"
+
+# Created-entity teardown (utils/entity_registry.py). Entities created during a test (API or
+# UI) are deleted by id afterwards, TEARDOWN_CONCURRENCY at a time; deletes are confirmed
+# and retried for up to TEARDOWN_ROUNDS rounds.
+TEARDOWN_CONCURRENCY = int(os.getenv("TESTPRODUCT_TEARDOWN_CONCURRENCY", "4"))
+TEARDOWN_ROUNDS = int(os.getenv("TESTPRODUCT_TEARDOWN_ROUNDS", "3"))
+TEARDOWN_TIMEOUT_S = float(os.getenv("TESTPRODUCT_TEARDOWN_TIMEOUT_S", "10"))
+
+# Sharding (utils/sharding.py, --shard=i/N). Each shard streams its results as JSONL into
+# SHARD_RESULTS_DIR; `python -m utils.sharding merge` combines them into one report.
+SHARD_RESULTS_DIR = Path(os.getenv("TESTPRODUCT_SHARD_RESULTS_DIR", str(ARTIFACTS_DIR / "shards")))
+
+# Response contract validation (utils/contract.py). Every api_context response is checked
+# against the OpenAPI response schema for its route and status.
+#   TESTPRODUCT_CONTRACT: warn (default; report drift), strict (fail the API call) or off
+#   CONTRACT_CLOSED_OBJECTS: documented objects reject undocumented properties
+#   CONTRACT_MAX_ARRAY_ITEMS: list responses are checked on their first N items
+#   TESTPRODUCT_CONTRACT_SPEC: read the spec from a JSON file instead of the running API
+CONTRACT_MODE = os.getenv("TESTPRODUCT_CONTRACT", "warn")
+CONTRACT_CLOSED_OBJECTS = os.getenv("TESTPRODUCT_CONTRACT_CLOSED_OBJECTS", "1").lower() not in ("0", "false", "no")
+CONTRACT_MAX_ARRAY_ITEMS = int(os.getenv("TESTPRODUCT_CONTRACT_MAX_ARRAY_ITEMS", "100"))
+CONTRACT_SPEC_FILE = os.getenv("TESTPRODUCT_CONTRACT_SPEC") or None
+
+# Property-based fuzzing of the clients API (utils/fuzz.py, --fuzz). Cases run
+# FUZZ_CONCURRENCY at a time; each distinct failure is shrunk with at most
+# FUZZ_MAX_SHRINK_STEPS extra requests. Minimal failures and one case per distinct server
+# answer are kept in FUZZ_CORPUS_DIR (commit it) and replayed first on every fuzz run.
+# TESTPRODUCT_FUZZ_SEED makes the generated cases reproducible.
+FUZZ_CONCURRENCY = int(os.getenv("TESTPRODUCT_FUZZ_CONCURRENCY", "4"))
+FUZZ_MAX_SHRINK_STEPS = int(os.getenv("TESTPRODUCT_FUZZ_MAX_SHRINK_STEPS", "200"))
+FUZZ_CORPUS_DIR = Path(os.getenv("TESTPRODUCT_FUZZ_CORPUS_DIR", str(Path(__file__).resolve().parents[1] / "fuzz-corpus")))
+FUZZ_SEED = int(os.environ["TESTPRODUCT_FUZZ_SEED"]) if os.getenv("TESTPRODUCT_FUZZ_SEED") else None
+
+# Soak mode (utils/soak.py, `python -m utils.soak run`). A scenario mix loops for
+# SOAK_DURATION_S with SOAK_CONCURRENCY API users and SOAK_UI_WORKERS browser users, each
+# pausing SOAK_THINK_TIME_S between scenarios. Every SOAK_SAMPLE_INTERVAL_S the run records
+# latency percentiles, token.json/data.json sizes and process RSS. A series is flagged when
+# a linear fit over at least SOAK_MIN_WINDOWS samples grows by SOAK_TREND_MIN_GROWTH (as a
+# fraction of its fitted start) with r² of at least SOAK_TREND_MIN_R2. A 401 is expected
+# only after SOAK_TOKEN_INACTIVITY_S idle seconds (the API's TOKEN_INACTIVITY_MINUTES); users
+# log in again before SOAK_TOKEN_LIFETIME_S (the JWT expiresIn) runs out.
+SOAK_DURATION_S = float(os.getenv("TESTPRODUCT_SOAK_DURATION_S", "14400"))
+SOAK_CONCURRENCY = int(os.getenv("TESTPRODUCT_SOAK_CONCURRENCY", "4"))
+SOAK_UI_WORKERS = int(os.getenv("TESTPRODUCT_SOAK_UI_WORKERS", "1"))
+SOAK_THINK_TIME_S = float(os.getenv("TESTPRODUCT_SOAK_THINK_TIME_S", "0.5"))
+SOAK_SAMPLE_INTERVAL_S = float(os.getenv("TESTPRODUCT_SOAK_SAMPLE_INTERVAL_S", "60"))
+SOAK_MIN_WINDOWS = int(os.getenv("TESTPRODUCT_SOAK_MIN_WINDOWS", "6"))
+SOAK_TREND_MIN_GROWTH = float(os.getenv("TESTPRODUCT_SOAK_TREND_MIN_GROWTH", "0.2"))
+SOAK_TREND_MIN_R2 = float(os.getenv("TESTPRODUCT_SOAK_TREND_MIN_R2", "0.5"))
+SOAK_TOKEN_INACTIVITY_S = float(os.getenv("TESTPRODUCT_SOAK_TOKEN_INACTIVITY_S", "1800"))
+SOAK_TOKEN_LIFETIME_S = float(os.getenv("TESTPRODUCT_SOAK_TOKEN_LIFETIME_S", "7200"))
+
+# Web performance budgets (utils/web_perf.py). Page objects measure each page load
+# (Navigation/Resource Timing, long tasks, LCP) and check it against the page's budget.
+#   TESTPRODUCT_WEBPERF: soft (default; report overruns), hard (fail the page load) or off
+#   TESTPRODUCT_WEBPERF_BUDGETS: JSON merged over the defaults, e.g. {"dashboard": {"lcp_ms": 3000}}
+#   WEBPERF_HISTORY: per-run medians; a median WEBPERF_REGRESSION_RATIO times the median of
+#   the previous WEBPERF_WINDOW runs is reported as a regression
+# The defaults suit the Angular dev server (unminified bundles); tighten them for builds.
+WEBPERF_MODE = os.getenv("TESTPRODUCT_WEBPERF", "soft")
+WEBPERF_BUDGETS = {
+    "dashboard": {
+        "ttfb_ms": 1000,
+        "dom_content_loaded_ms": 4000,
+        "lcp_ms": 4000,
+        "ready_ms": 8000,
+        "total_blocking_ms": 600,
+        "transfer_kb": 8000,
+        "resources": 200,
+    },
+}
+for _page, _budget in json.loads(os.getenv("TESTPRODUCT_WEBPERF_BUDGETS", "{}")).items():
+    WEBPERF_BUDGETS.setdefault(_page, {}).update(_budget)
+WEBPERF_HISTORY = Path(os.getenv("TESTPRODUCT_WEBPERF_HISTORY", str(Path(__file__).resolve().parents[1] / ".webperf" / "history.jsonl")))
+WEBPERF_WINDOW = int(os.getenv("TESTPRODUCT_WEBPERF_WINDOW", "10"))
+WEBPERF_REGRESSION_RATIO = float(os.getenv("TESTPRODUCT_WEBPERF_REGRESSION_RATIO", "1.25"))
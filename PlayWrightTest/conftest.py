@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 # Core Pytest and typing
+import base64
+import logging
 import os
+import shutil
+import tempfile
+import time
 
 import json
 
@@ -9,6 +14,7 @@ from pathlib import Path
 from typing import Generator, Optional
 
 import pytest
+from _pytest.runner import runtestprotocol
 
 # Playwright sync API (used by pytest-playwright under the hood)
 from playwright.sync_api import (
@@ -26,14 +32,536 @@ from config.settings import (
     LOGIN_API_PATH,
     AUTH_COOKIE_NAME,
     COOKIE_DOMAIN,
-    API_USERNAME,
-    API_PASSWORD,
-
     UI_BASE_URL,
 
+    ARTIFACTS_DIR,
+    BROWSER_PROFILE,
+    CONTRACT_MODE,
+    RUN_HISTORY,
+    API_PROFILE,
+    INFRA_RETRIES,
+    INFRA_RETRY_BACKOFF_S,
+    RETRY_WARMUP_TESTS,
 )
-from utils.auth import create_authenticated_storage_state
-from utils.step import current_steps
+from utils.auth import create_authenticated_storage_state, fetch_api_token
+from utils.step import current_steps, step
+from utils.timeouts import timeouts
+from utils.health import describe, failed_dependencies, probe_environment, required_probes
+from utils.browser_events import BrowserEventRecorder
+from utils.tracing import StepTracer
+from utils.retry import classify_failure, remove_failed_fixture_results
+from utils.api_client import InstrumentedAPIRequestContext
+from utils.contract import MODES as CONTRACT_MODES, ContractValidator
+from utils.entity_registry import EntityRegistry
+from utils.fuzz import parse_budget as parse_fuzz_budget
+from utils.impact import ImpactRecorder, affected_tests, load_map, repo_root
+from utils.result_cache import ResultCache
+from utils.api_profiler import ApiProfiler, summarize as summarize_api_latency
+from utils.readonly_batch import ReadOnlyCheck, ReadOnlyRunner, run_on_sync_page
+from utils.browser_profile import PROFILES, ResourceBlocker, launch_options
+from utils.memory import MemoryMonitor, psutil
+from utils.browser_manager import BrowserManager
+from utils.browser_server import BrowserServerPool, endpoint_healthy
+from utils.browser_matrix import BrowserMatrix, engine_of
+from utils.run_history import LANES, RunHistory
+from utils.sharding import ShardPlugin, parse_shard
+from utils.visual import MODES as VISUAL_MODES, VisualMismatchError, visual
+from utils.web_perf import MODES as WEBPERF_MODES, web_perf
+
+
+# -------------------------------
+# Command-line options
+# -------------------------------
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("testproduct", "TestProduct framework options")
+    group.addoption(
+        "--run-scaling",
+        action="store_true",
+        default=False,
+        help="Run the large-dataset client list scaling tests (marker: scaling).",
+    )
+    group.addoption(
+        "--fuzz",
+        metavar="SECONDS|replay",
+        type=parse_fuzz_budget,
+        default=None,
+        help="Run the clients API fuzz tests (marker: fuzz): replay the fuzz corpus, then "
+        "generate cases for SECONDS. 'replay' only replays the corpus.",
+    )
+    group.addoption(
+        "--health-gate",
+        choices=("skip", "fail", "off"),
+        default="skip",
+        help="Probe API/login/UI once before the session and skip (or fail) dependent tests "
+        "immediately when a dependency is down. Default: skip.",
+    )
+    group.addoption(
+        "--infra-retries",
+        type=int,
+        default=INFRA_RETRIES,
+        help="Retry a test up to N times when its failure is classified as infrastructure "
+        "(connection reset/refused, 5xx, browser crash, warmup navigation timeout). 0 disables.",
+    )
+    group.addoption(
+        "--record-impact",
+        action="store_true",
+        default=False,
+        help="Record which source files and API routes each test touches (for --changed-since).",
+    )
+    group.addoption(
+        "--changed-since",
+        metavar="REF",
+        default=None,
+        help="Run only tests affected by changes since git REF, using the recorded impact map. "
+        "Falls back to a full run when the map is missing or a global file changed.",
+    )
+    group.addoption(
+        "--result-cache",
+        choices=("off", "on", "dry-run"),
+        default="off",
+        help="Skip previously-passing tests marked 'deterministic' whose test/fixture/API sources "
+        "are unchanged ('dry-run' only lists them). Clear with: python -m utils.result_cache clear",
+    )
+    group.addoption(
+        "--step-traces",
+        choices=("off", "on-failure"),
+        default="off",
+        help="Trace auth_context in per-step chunks and keep only the failing step's chunk.",
+    )
+    group.addoption(
+        "--step-trace-screenshots",
+        action="store_true",
+        default=False,
+        help="With --step-traces, record trace screenshots and save page screenshots on failure.",
+    )
+    group.addoption(
+        "--browser-profile",
+        choices=PROFILES,
+        default=BROWSER_PROFILE if BROWSER_PROFILE in PROFILES else "default",
+        help="'lean' launches Chromium with unused features disabled and aborts images, media, "
+        "fonts, the per-row actions iframes and analytics; tests opt back in with "
+        "@pytest.mark.allow_resources(...). Default: TESTPRODUCT_BROWSER_PROFILE or 'default'.",
+    )
+    group.addoption(
+        "--visual",
+        choices=VISUAL_MODES,
+        default=visual.mode,
+        help="Visual checks in page objects: 'check' compares against baselines (recording "
+        "missing ones), 'update' re-records every baseline, 'off' skips them.",
+    )
+    group.addoption(
+        "--contract",
+        choices=CONTRACT_MODES,
+        default=CONTRACT_MODE if CONTRACT_MODE in CONTRACT_MODES else "warn",
+        help="Validate every api_context response against the API's OpenAPI response schemas: "
+        "'warn' reports drift at the end of the run, 'strict' fails the call, 'off' disables.",
+    )
+    group.addoption(
+        "--web-perf",
+        choices=WEBPERF_MODES,
+        default=web_perf.mode,
+        help="Page load budgets (Navigation/Resource Timing, long tasks, LCP) checked by page "
+        "objects: 'soft' reports overruns, 'hard' fails the page load, 'off' disables.",
+    )
+    group.addoption(
+        "--lane",
+        choices=LANES,
+        default="all",
+        help="Quarantine lane from the run history: 'all' runs quarantined (flaky) tests as "
+        "non-strict xfail, 'main' deselects them, 'quarantine' runs only them and never fails.",
+    )
+    group.addoption(
+        "--shard",
+        metavar="I/N",
+        default=None,
+        help="Run shard I of N (1-based). Shards are balanced from the run history's recorded "
+        "durations and stream their results to .artifacts/shards/*.jsonl; combine them with "
+        "'python -m utils.sharding merge'.",
+    )
+    group.addoption(
+        "--browser-server",
+        action="store_true",
+        default=False,
+        help="With xdist: start a small pool of shared browser servers on the controller "
+        "(TESTPRODUCT_BROWSER_SERVER_POOL_SIZE) that workers connect to instead of each "
+        "launching its own browser. Falls back to a local launch if a server is unhealthy.",
+    )
+    group.addoption(
+        "--memory-monitor",
+        action="store_true",
+        default=False,
+        help="Sample worker and browser RSS around each test, report per-test growth, recycle "
+        "the session browser above TESTPRODUCT_MEMORY_RECYCLE_MB and recommend a worker count "
+        "(requires psutil).",
+    )
+    group.addoption(
+        "--readonly-batch",
+        action="store_true",
+        default=False,
+        help="Run tests marked readonly_ui concurrently as pages of one shared context "
+        "(async API, results still reported per test). Under xdist requires --dist loadgroup.",
+    )
+
+
+_impact_key = pytest.StashKey[ImpactRecorder]()
+_api_profiler_key = pytest.StashKey[ApiProfiler]()
+_entity_registry_key = pytest.StashKey[EntityRegistry]()
+_contract_key = pytest.StashKey[ContractValidator]()
+_api_latency_key = pytest.StashKey[Optional[list]]()
+_readonly_batch_key = pytest.StashKey[dict]()
+
+
+def _requested_engines(config: pytest.Config) -> list:
+    """Engines from (repeatable) --browser, de-duplicated, in the given order."""
+    option = config.getoption("--browser") or ["chromium"]
+    if not isinstance(option, (list, tuple)):
+        option = [option]
+    return list(dict.fromkeys(_normalize_browser_name(opt) for opt in option))
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    visual.mode = config.getoption("--visual")
+    web_perf.mode = config.getoption("--web-perf")
+    # Sharded runs reach the history through `python -m utils.sharding merge --history`.
+    web_perf.record = not config.getoption("--shard")
+    if web_perf.mode != "off":
+        config.pluginmanager.register(web_perf, "testproduct-web-perf")
+    engines = _requested_engines(config)
+    if len(engines) > 1:
+        config.pluginmanager.register(BrowserMatrix(engines), "testproduct-browser-matrix")
+    config.stash[_entity_registry_key] = EntityRegistry()
+    contract_mode = config.getoption("--contract")
+    if contract_mode != "off":
+        validator = ContractValidator(contract_mode)
+        config.stash[_contract_key] = validator
+        config.pluginmanager.register(validator, "testproduct-contract")
+    if API_PROFILE:
+        config.stash[_api_profiler_key] = ApiProfiler()
+    if config.getoption("--record-impact"):
+        recorder = ImpactRecorder(config)
+        config.stash[_impact_key] = recorder
+        config.pluginmanager.register(recorder, "testproduct-impact-recorder")
+    shard = config.getoption("--shard")
+    if shard:
+        index, count = parse_shard(shard)
+        config.pluginmanager.register(ShardPlugin(config, index, count), "testproduct-shard")
+    if RUN_HISTORY:
+        # Sharded runs reach the history through `python -m utils.sharding merge --history`.
+        config.pluginmanager.register(
+            RunHistory(config, lane=config.getoption("--lane"), record=not shard), "testproduct-run-history"
+        )
+    if config.getoption("--memory-monitor"):
+        if psutil is None:
+            config.issue_config_time_warning(
+                pytest.PytestConfigWarning("--memory-monitor needs psutil (pip install psutil); disabled"), stacklevel=2
+            )
+        else:
+            config.pluginmanager.register(MemoryMonitor(config), "testproduct-memory-monitor")
+    result_cache = config.getoption("--result-cache")
+    if result_cache != "off":
+        config.pluginmanager.register(
+            ResultCache(config, dry_run=result_cache == "dry-run"), "testproduct-result-cache"
+        )
+
+
+def _impact_recorder(config: pytest.Config) -> Optional[ImpactRecorder]:
+    return config.stash.get(_impact_key, None)
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list) -> None:
+    if not config.getoption("--run-scaling"):
+        skip_scaling = pytest.mark.skip(reason="Scaling tests are opt-in; pass --run-scaling")
+        for item in items:
+            if "scaling" in item.keywords:
+                item.add_marker(skip_scaling)
+    if config.getoption("--fuzz") is None:
+        skip_fuzz = pytest.mark.skip(reason="Fuzz tests are opt-in; pass --fuzz=SECONDS or --fuzz=replay")
+        for item in items:
+            if "fuzz" in item.keywords:
+                item.add_marker(skip_fuzz)
+
+    ref = config.getoption("--changed-since")
+    if ref:
+        rootdir = Path(config.rootpath)
+        selected, reason = affected_tests(
+            [item.nodeid for item in items], load_map(), repo_root(rootdir), rootdir, ref
+        )
+        terminal = config.pluginmanager.get_plugin("terminalreporter")
+        if selected is None:
+            if terminal:
+                terminal.write_line(f"impact selection: full run ({reason})")
+            return
+        deselected = [item for item in items if item.nodeid not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in selected]
+        if terminal:
+            terminal.write_line(f"impact selection: {len(items)} test(s) affected ({reason})")
+
+    if _readonly_batching(config):
+        for item in items:
+            if _readonly_check_of(item) is not None:
+                # Keep the batch on one xdist worker so it runs as a single context.
+                item.add_marker(pytest.mark.xdist_group("readonly-ui"))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_finish(session: pytest.Session) -> None:
+    # Built after every plugin's modifyitems (deselection, --shard), so only tests that
+    # actually run in this process are batched and probed for. tryfirst: an xdist worker
+    # must publish its probe needs before reporting its collection to the controller.
+    config = session.config
+    _collect_health_needs(config, session.items)
+    if _readonly_batching(config):
+        batch = {}  # engine -> {nodeid: check}
+        for item in session.items:
+            check = _readonly_check_of(item)
+            if check is not None:
+                batch.setdefault(engine_of(item), {})[item.nodeid] = check
+        config.stash[_readonly_batch_key] = batch
+
+
+def _readonly_check_of(item: pytest.Item) -> Optional[ReadOnlyCheck]:
+    # Given as a keyword: a lone positional callable would make the mark decorate it instead.
+    marker = item.get_closest_marker("readonly_ui")
+    return marker.kwargs.get("check") if marker is not None else None
+
+
+def _readonly_batching(config: pytest.Config) -> bool:
+    # Each xdist worker collects every test; without loadgroup scheduling a worker would batch
+    # checks that belong to other workers, so fall back to running them one by one.
+    if not config.getoption("--readonly-batch"):
+        return False
+    return not hasattr(config, "workerinput") or config.getoption("dist", "no") == "loadgroup"
+
+
+# -------------------------------
+# Dependency health gate
+# -------------------------------
+_health_key = pytest.StashKey[Optional[dict]]()
+_health_dir_key = pytest.StashKey[Path]()
+
+
+def _health_dir(config: pytest.Config) -> Path:
+    """Controller-side exchange directory: workers write the probes their tests need, the
+    controller writes the results."""
+    if _health_dir_key not in config.stash:
+        config.stash[_health_dir_key] = Path(tempfile.mkdtemp(prefix="testproduct-health-"))
+    return config.stash[_health_dir_key]
+
+
+def _collect_health_needs(config: pytest.Config, items: list) -> None:
+    """Probe only what the collected tests depend on (nothing for e.g. `-m unit`): the login
+    probe issues a real token. Without xdist the probes run here; an xdist worker hands its
+    needs to the controller, which probes once before any test is scheduled."""
+    if config.getoption("--health-gate") == "off" or config.option.collectonly:
+        return
+    needed = required_probes(getattr(item, "fixturenames", ()) for item in items)
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None:
+        _publish_health(config, probe_environment(needed))
+    elif "testproduct_health_dir" in workerinput:
+        needs = Path(workerinput["testproduct_health_dir"]) / f"needs-{workerinput['workerid']}.json"
+        needs.write_text(json.dumps(needed), encoding="utf8")
+
+
+def _publish_health(config: pytest.Config, health: dict) -> None:
+    config.stash[_health_key] = health
+    terminal = config.pluginmanager.get_plugin("terminalreporter")
+    if terminal and health:
+        parts = [f"{name}={'up' if r['ok'] else 'DOWN'} ({r['elapsed_ms']:.0f}ms)" for name, r in health.items()]
+        terminal.write_line("testproduct health: " + ", ".join(parts))
+
+
+def _session_health(config: pytest.Config) -> Optional[dict]:
+    """Probe results for this run: computed after collection, once per run (on the xdist
+    controller when distributed) and read by workers before their first test."""
+    if config.getoption("--health-gate") == "off":
+        return None
+    if _health_key not in config.stash:
+        workerinput = getattr(config, "workerinput", None)
+        if workerinput is None or "testproduct_health_dir" not in workerinput:
+            return None
+        results = Path(workerinput["testproduct_health_dir"]) / "health.json"
+        config.stash[_health_key] = json.loads(results.read_text(encoding="utf8")) if results.exists() else {}
+    return config.stash[_health_key]
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node) -> None:
+    # Runs on the controller for each worker before any test is scheduled. Workers collect
+    # the same tests, so only the first one normally adds probes.
+    config = node.config
+    if config.getoption("--health-gate") == "off":
+        return
+    exchange = _health_dir(config)
+    needs_file = exchange / f"needs-{node.gateway.id}.json"
+    needed = json.loads(needs_file.read_text(encoding="utf8")) if needs_file.exists() else []
+    health = config.stash.get(_health_key, None) or {}
+    missing = [name for name in needed if name not in health]
+    if missing or _health_key not in config.stash:
+        health = {**health, **probe_environment(missing)}
+        (exchange / "health.json").write_text(json.dumps(health), encoding="utf8")
+        _publish_health(config, health)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node) -> None:
+    # pytest-xdist: where the worker exchanges probe needs and results with the controller.
+    if node.config.getoption("--health-gate") != "off":
+        node.workerinput["testproduct_health_dir"] = str(_health_dir(node.config))
+    pool = _browser_server_pool(node.config)
+    if pool is not None:
+        node.workerinput["testproduct_browser_ws"] = pool.endpoints_for(node.gateway.id)
+
+
+# -------------------------------
+# Shared browser servers (xdist)
+# -------------------------------
+_browser_pool_key = pytest.StashKey[Optional[BrowserServerPool]]()
+
+
+def _browser_server_pool(config: pytest.Config) -> Optional[BrowserServerPool]:
+    """Started once on the controller, when the first xdist worker is configured."""
+    if not config.getoption("--browser-server"):
+        return None
+    if _browser_pool_key not in config.stash:
+        profile = config.getoption("--browser-profile")
+        pool = BrowserServerPool(
+            {engine: launch_options(engine, profile) for engine in _requested_engines(config)},
+            headless=not config.getoption("--headed"),
+        )
+        try:
+            pool.start()
+        except Exception as exc:
+            print(f"[SETUP] Browser server pool failed to start ({exc}); workers launch locally")
+            pool = None
+        config.stash[_browser_pool_key] = pool
+    return config.stash[_browser_pool_key]
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    pool = config.stash.get(_browser_pool_key, None)
+    if pool is not None:
+        pool.stop()
+    exchange = config.stash.get(_health_dir_key, None)
+    if exchange is not None:
+        shutil.rmtree(exchange, ignore_errors=True)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item: pytest.Item) -> None:
+    # Runs before fixture setup, so no browser is launched and no login is attempted.
+    health = _session_health(item.config)
+    if not health:
+        return
+    failed = failed_dependencies(health, getattr(item, "fixturenames", ()))
+    if failed:
+        msg = f"Health gate: dependency down - {describe(health, failed)}"
+        if item.config.getoption("--health-gate") == "fail":
+            pytest.fail(msg, pytrace=False)
+        pytest.skip(msg)
+
+
+# -------------------------------
+# Infra-failure retry layer
+# -------------------------------
+_tests_started_key = pytest.StashKey[int]()
+
+
+class _AttemptNextItem:
+    """`nextitem` for one attempt of a retried test.
+
+    Teardown tears down every node that `nextitem.listchain()` does not share. While another
+    attempt will follow, that chain is the test's parents, so only its function-scoped
+    fixtures are torn down even for the last test of a module or session; otherwise it is the
+    real next item. Other attributes come from the real next item.
+    """
+
+    def __init__(self, item: pytest.Item, nextitem: Optional[pytest.Item], max_retries: int) -> None:
+        self._item = item
+        self._nextitem = nextitem
+        self._max_retries = max_retries
+        self.attempt = 0
+
+    def listchain(self) -> list:
+        if self._item.infra_failure is not None and self.attempt < self._max_retries:
+            return self._item.listchain()[:-1]
+        return self._nextitem.listchain() if self._nextitem is not None else []
+
+    def __getattr__(self, name: str):
+        return getattr(self._nextitem, name)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: Optional[pytest.Item]) -> Optional[bool]:
+    """
+    Run the test, re-running it only while its failure is classified as infra.
+
+    Intermediate attempts are not logged, so a transient ECONNRESET does not count against
+    --maxfail. Session-scoped fixtures (browser, API context) stay warm between attempts;
+    only fixtures whose setup failed are rebuilt, and wider-scoped fixtures are torn down
+    once, after the last attempt.
+    """
+    max_retries = item.config.getoption("--infra-retries")
+    item.config.stash[_tests_started_key] = item.config.stash.get(_tests_started_key, 0) + 1
+    if max_retries <= 0:
+        return None
+
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    reasons = []
+    attempt_nextitem = _AttemptNextItem(item, nextitem, max_retries)
+    for attempt in range(max_retries + 1):
+        item.infra_failure = None
+        attempt_nextitem.attempt = attempt
+        reports = runtestprotocol(item, nextitem=attempt_nextitem, log=False)
+        if item.infra_failure is None or attempt == max_retries:
+            break
+        reasons.append(item.infra_failure)
+        time.sleep(INFRA_RETRY_BACKOFF_S * (2 ** attempt))
+        remove_failed_fixture_results(item)
+
+    for report in reports:
+        if reasons:
+            report.user_properties.append(("infra_retries", len(reasons)))
+            report.user_properties.append(("infra_retry_reasons", reasons))
+            if report.when == "call":
+                _attach_retry_stats(report, reasons)
+        item.ihook.pytest_runtest_logreport(report=report)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+def _classify_infra_failure(item, call, report) -> None:
+    if report.failed and report.when in ("setup", "call"):
+        warmup = item.config.stash.get(_tests_started_key, 0) <= RETRY_WARMUP_TESTS
+        item.infra_failure = classify_failure(call.excinfo, warmup=warmup)
+
+
+def _attach_retry_stats(report, reasons) -> None:
+    try:
+        from pytest_html import extras
+        if not hasattr(report, "extras"):
+            report.extras = []
+        items = "".join(f"<li>attempt {n}: {reason}</li>" for n, reason in enumerate(reasons, start=1))
+        report.extras.append(extras.html(
+            f"<div><h4>Infra retries: {len(reasons)}</h4><ul>{items}</ul></div>"
+        ))
+    except ImportError:
+        pass
+
+
+def _summarize_retries(terminalreporter) -> None:
+    retried = []
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            props = dict(getattr(report, "user_properties", ()))
+            if getattr(report, "when", None) == "call" and props.get("infra_retries"):
+                retried.append((report.nodeid, report.outcome, props["infra_retries"], props["infra_retry_reasons"]))
+    if retried:
+        terminalreporter.section("infra retries")
+        for nodeid, outcome, count, reasons in retried:
+            terminalreporter.write_line(f"{nodeid}: {count} retr{'y' if count == 1 else 'ies'} -> {outcome} ({', '.join(reasons)})")
 
 
 # -------------------------------
@@ -47,6 +575,30 @@ def session_setup_teardown() -> Generator[None, None, None]:
     finally:
         print("[TEARDOWN] Test session finish")
 
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    # Persist latency samples so the next run can calibrate page-object timeouts.
+    timeouts.save()
+    profiler = session.config.stash.get(_api_profiler_key, None)
+    if profiler is not None:
+        profiler.dump_samples(ARTIFACTS_DIR)
+        if not hasattr(session.config, "workerinput"):
+            # Controller: workers are done, merge their samples into the session table.
+            session.config.stash[_api_latency_key] = summarize_api_latency(ARTIFACTS_DIR)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    _summarize_retries(terminalreporter)
+    summary = config.stash.get(_api_latency_key, None)
+    if summary:
+        terminalreporter.section("API latency (slowest p95)")
+        terminalreporter.write_line(f"{'route':<28}{'calls':>7}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        for row in summary[:10]:
+            terminalreporter.write_line(
+                f"{row['route']:<28}{row['calls']:>7}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['max_ms']:>10}"
+            )
+        terminalreporter.write_line(f"full table: {ARTIFACTS_DIR / 'api-latency.json'}")
+
+
 @pytest.fixture(autouse=True)
 def per_test_setup_teardown() -> Generator[None, None, None]:
     print("[SETUP] Test start")
@@ -65,6 +617,35 @@ def reset_step_history():
     yield
 
 
+@pytest.fixture(autouse=True)
+def reset_api_profile(pytestconfig: pytest.Config):
+    """
+    Start a fresh per-test API call list (autouse, so it runs before data fixtures make calls).
+    """
+    profiler = pytestconfig.stash.get(_api_profiler_key, None)
+    if profiler is not None:
+        profiler.start_test()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def cleanup_created_entities(pytestconfig: pytest.Config, request: pytest.FixtureRequest):
+    """
+    Delete whatever the test created (via api_context or the UI) by id, after all other
+    fixtures have torn down. Entities are recorded from their create responses, so tests
+    do not need to look them up again to clean up.
+    """
+    registry = pytestconfig.stash[_entity_registry_key]
+    registry.start_test()
+    yield
+    result = registry.teardown()
+    if result["deleted"] or result["failed"]:
+        request.node.user_properties.append(("teardown_deleted", result["deleted"]))
+    if result["failed"]:
+        reason = f" ({result['error']})" if result["error"] else ""
+        logging.warning(f"Teardown could not delete {result['failed']}{reason}")
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
@@ -72,6 +653,22 @@ def pytest_runtest_makereport(item, call):
     """
     outcome = yield
     report = outcome.get_result()
+    # Expose phase reports to fixtures (e.g. auth_context decides whether to keep traces).
+    setattr(item, f"rep_{report.when}", report)
+    _classify_infra_failure(item, call, report)
+
+    if report.failed:
+        _attach_browser_events(item, report)
+        _attach_visual_diff(call, report)
+    if report.failed or report.when == "teardown":
+        _attach_trace_artifacts(item, report)
+    if report.when == "call":
+        _attach_api_calls(item, report)
+        if current_steps:
+            # Step timings for the run history (serialisable, so they survive xdist).
+            report.user_properties.append(
+                ("step_timings", [(st["name"], st["status"], st["duration_ms"]) for st in current_steps])
+            )
 
     if report.when == "call":
         # Only add steps if we have them and it's the main call phase
@@ -92,10 +689,10 @@ def pytest_runtest_makereport(item, call):
                     <tbody>
             """
             
-            for step in current_steps:
-                status = step["status"]
-                name = step["name"]
-                error = step["error"]
+            for step_record in current_steps:
+                status = step_record["status"]
+                name = step_record["name"]
+                error = step_record["error"]
                 
                 # Style based on status
                 if status == "passed":
@@ -136,6 +733,74 @@ def pytest_runtest_makereport(item, call):
                 pass
 
 
+def _attach_api_calls(item, report) -> None:
+    """Per-test API call totals (user_properties) and call table (HTML report)."""
+    profiler = item.config.stash.get(_api_profiler_key, None)
+    if profiler is None or not profiler.current:
+        return
+    report.user_properties.extend(profiler.test_totals().items())
+    try:
+        from pytest_html import extras
+        if not hasattr(report, "extras"):
+            report.extras = []
+        report.extras.append(extras.html(profiler.test_table_html()))
+    except ImportError:
+        pass
+
+
+def _attach_browser_events(item, report) -> None:
+    """On failure, add the page's buffered browser events to the report and the JSONL log."""
+    recorder = getattr(item, "browser_events", None)
+    if recorder is None or not recorder.events:
+        return
+    context = {"nodeid": item.nodeid, "phase": report.when}
+    recorder.append_to(ARTIFACTS_DIR / "browser-events.jsonl", **context)
+    try:
+        from pytest_html import extras
+        if not hasattr(report, "extras"):
+            report.extras = []
+        report.extras.append(extras.json(recorder.to_records(**context), name="Browser events"))
+    except ImportError:
+        pass
+
+
+def _attach_visual_diff(call, report) -> None:
+    """Show the diff image of a failed visual check (changed pixels in red)."""
+    error = call.excinfo.value if call.excinfo is not None else None
+    if not isinstance(error, VisualMismatchError) or error.diff_path is None or not error.diff_path.exists():
+        return
+    try:
+        from pytest_html import extras
+        if not hasattr(report, "extras"):
+            report.extras = []
+        report.extras.append(extras.png(base64.b64encode(error.diff_path.read_bytes()).decode(), name=f"Visual diff: {error.key}"))
+    except ImportError:
+        pass
+
+
+def _attach_trace_artifacts(item, report) -> None:
+    """Attach step-trace chunks and screenshots saved so far that are not yet in the report."""
+    tracer = getattr(item, "step_tracer", None)
+    if tracer is None or not tracer.artifacts:
+        return
+    artifacts, tracer.artifacts = tracer.artifacts, []
+    try:
+        from pytest_html import extras
+    except ImportError:
+        return
+    if not hasattr(report, "extras"):
+        report.extras = []
+    for artifact in artifacts:
+        path = artifact["path"]
+        if artifact["kind"] == "trace":
+            report.extras.append(extras.url(path.resolve().as_uri(), name=f"Trace: {artifact['step']}"))
+            report.extras.append(extras.html(
+                f"<p>Open with: <code>playwright show-trace {path}</code></p>"
+            ))
+        elif path.exists():
+            report.extras.append(extras.png(base64.b64encode(path.read_bytes()).decode(), name=artifact["step"]))
+
+
 # -------------------------------
 # API Fixtures
 # -------------------------------
@@ -144,34 +809,42 @@ def api_token(playwright: Playwright) -> str:
     """
     Get a valid JWT token for API interactions.
     """
-    request_context = playwright.request.new_context(base_url=BASE_URL)
-    response = request_context.post(
-        LOGIN_API_PATH,
-
-        data=json.dumps({"username": API_USERNAME, "password": API_PASSWORD}),
-        headers={"Content-Type": "application/json"},
-
-    )
-    if not response.ok:
-        raise RuntimeError(f"Failed to get API token: {response.status} {response.text()}")
-    
-    data = response.json()
-    token = data.get("token") or data.get("access_token")
-    if not token:
-        raise RuntimeError("No token found in login response")
-    
-    return token
+    return fetch_api_token(playwright, BASE_URL)
 
 @pytest.fixture(scope="session")
-def api_context(playwright: Playwright, api_token: str) -> Generator[APIRequestContext, None, None]:
+def api_context(
+    playwright: Playwright, api_token: str, pytestconfig: pytest.Config
+) -> Generator[APIRequestContext, None, None]:
     """
     Session-scoped authenticated APIRequestContext.
     """
     headers = {"Authorization": f"Bearer {api_token}"}
-    context = playwright.request.new_context(base_url=BASE_URL, extra_http_headers=headers)
+    context = InstrumentedAPIRequestContext(
+        playwright.request.new_context(base_url=BASE_URL, extra_http_headers=headers)
+    )
+    recorder = _impact_recorder(pytestconfig)
+    if recorder is not None:
+        context.listeners.append(recorder.on_request)
+    profiler = pytestconfig.stash.get(_api_profiler_key, None)
+    if profiler is not None:
+        context.listeners.append(profiler.on_request)
+    registry = pytestconfig.stash[_entity_registry_key]
+    registry.token = api_token
+    context.listeners.append(registry.on_request)
+    validator = pytestconfig.stash.get(_contract_key, None)
+    if validator is not None:
+        context.listeners.append(validator.on_request)
     yield context
     context.dispose()
 
+@pytest.fixture
+def entity_registry(pytestconfig: pytest.Config) -> EntityRegistry:
+    """
+    The session's EntityRegistry, for tests that create entities outside api_context/the UI
+    (e.g. over plain HTTP) and want them deleted at teardown.
+    """
+    return pytestconfig.stash[_entity_registry_key]
+
 @pytest.fixture
 def new_client(api_context: APIRequestContext) -> Generator[dict, None, None]:
     """
@@ -211,42 +884,81 @@ def new_client(api_context: APIRequestContext) -> Generator[dict, None, None]:
 # -------------------------------
 # Browser lifecycle (session-wide)
 # -------------------------------
+def _normalize_browser_name(opt) -> str:
+    """Normalize --browser which can be: Enum, string, or a list/tuple (select first)."""
+    try:
+        # If list/tuple provided, take the first value
+        if isinstance(opt, (list, tuple)):
+            opt = opt[0] if opt else "chromium"
+        # Prefer Enum.name, then Enum.value, else string
+        if hasattr(opt, "name"):
+            name = opt.name
+        elif hasattr(opt, "value"):
+            name = opt.value
+        else:
+            name = str(opt)
+        return str(name).strip().lower()
+    except Exception:
+        return "chromium"
+
+
+_browser_manager_key = pytest.StashKey[BrowserManager]()
+
+
 @pytest.fixture(scope="session")
-def session_browser(playwright: Playwright, pytestconfig: pytest.Config) -> Generator[Browser, None, None]:
+def session_browser(
+    playwright: Playwright, browser_name: str, pytestconfig: pytest.Config
+) -> Generator[BrowserManager, None, None]:
     """
-    Launch a single Browser instance for the entire test session.
+    Launch a single Browser instance per engine for the entire test session.
+
+    The browser sits behind a BrowserManager (used like a Browser) that relaunches it after a
+    crash and recycles it every TESTPRODUCT_BROWSER_RECYCLE_TESTS tests or above
+    TESTPRODUCT_MEMORY_RECYCLE_MB of RSS.
 
     Notes
     - We deliberately manage a dedicated session-scoped browser here instead of using the
       default pytest-playwright `browser` fixture to demonstrate explicit lifecycle control.
     - Headless/Browser selection follow pytest-playwright CLI options:
-        * --browser [chromium|firefox|webkit]
+        * --browser [chromium|firefox|webkit], repeatable: pytest-playwright parametrizes
+          `browser_name`, so every UI test runs once per engine (see utils/browser_matrix.py)
         * --headed (otherwise runs headless by default)
+    - --browser-profile=lean adds the Chromium args from utils/browser_profile.py.
+    - With --browser-server under xdist, connects to a controller-started browser server and
+      falls back to a local launch when it is unreachable.
     """
-    browser_opt = pytestconfig.getoption("--browser") or "chromium"
-    # Normalize --browser which can be: Enum, string, or a list/tuple (select first)
-    def _normalize_browser_name(opt):
-        try:
-            # If list/tuple provided, take the first value
-            if isinstance(opt, (list, tuple)):
-                opt = opt[0] if opt else "chromium"
-            # Prefer Enum.name, then Enum.value, else string
-            if hasattr(opt, "name"):
-                name = opt.name
-            elif hasattr(opt, "value"):
-                name = opt.value
-            else:
-                name = str(opt)
-            return str(name).strip().lower()
-        except Exception:
-            return "chromium"
-
-    browser_name = _normalize_browser_name(browser_opt)
+    browser_name = _normalize_browser_name(browser_name or "chromium")
     headed = pytestconfig.getoption("--headed")
     browser_factory = getattr(playwright, browser_name)
-    browser = browser_factory.launch(headless=not headed)
-    yield browser
-    browser.close()
+    profile = pytestconfig.getoption("--browser-profile")
+    ws_endpoint = getattr(pytestconfig, "workerinput", {}).get("testproduct_browser_ws", {}).get(browser_name)
+
+    def launch() -> Browser:
+        if ws_endpoint and endpoint_healthy(ws_endpoint):
+            try:
+                # Contexts created through this connection are isolated from other workers'.
+                return browser_factory.connect(ws_endpoint)
+            except Exception as exc:
+                print(f"[SETUP] Browser server {ws_endpoint} unusable ({exc}); launching locally")
+        return browser_factory.launch(headless=not headed, **launch_options(browser_name, profile))
+
+    manager = BrowserManager(launch)
+    pytestconfig.stash[_browser_manager_key] = manager
+    yield manager
+    del pytestconfig.stash[_browser_manager_key]
+    if manager.stats["launches"] > 1:
+        print(f"[TEARDOWN] Browser manager: {manager.stats}")
+    manager.close()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_runtest_teardown(item: pytest.Item, nextitem: Optional[pytest.Item]) -> None:
+    # trylast: the test's contexts are closed by now, so the browser can be recycled.
+    manager = item.config.stash.get(_browser_manager_key, None)
+    if manager is not None:
+        reason = manager.test_finished()
+        if reason:
+            item.user_properties.append(("browser_recycled", reason))
 
 
 # -------------------------------------------------------------
@@ -309,27 +1021,72 @@ def auth_storage_path(
 # Pre-authenticated Context and Page (test fixtures)
 # -------------------------------------------------
 @pytest.fixture()
-def auth_context(session_browser: Browser, auth_storage_path: str) -> Generator[BrowserContext, None, None]:
+def auth_context(
+    session_browser: BrowserManager,
+    auth_storage_path: str,
+    request: pytest.FixtureRequest,
+    pytestconfig: pytest.Config,
+) -> Generator[BrowserContext, None, None]:
     """
     Create a new BrowserContext that loads the previously generated storageState so tests start
     already logged-in (no UI login flow).
+
+    With --browser-profile=lean, non-essential requests are aborted (see ResourceBlocker)
+    unless the test opts back in via @pytest.mark.allow_resources.
+
+    With --step-traces=on-failure, tracing runs in per-step chunks and only the failing
+    chunk is written (under ARTIFACTS_DIR/traces) and attached to the HTML report.
     """
     context = session_browser.new_context(storage_state=auth_storage_path, base_url=BASE_URL)
+    # Record entities the UI creates (e.g. HomePage.add_client) for cleanup_created_entities.
+    context.on("response", pytestconfig.stash[_entity_registry_key].on_page_response)
+    recorder = _impact_recorder(pytestconfig)
+    if recorder is not None:
+        context.on("request", recorder.on_page_request)
+    blocker = None
+    if pytestconfig.getoption("--browser-profile") == "lean":
+        blocker = ResourceBlocker.for_marker(request.node.get_closest_marker("allow_resources"))
+        if blocker is not None and blocker.active:
+            context.route("**/*", blocker.handle)
+    tracer = None
+    if pytestconfig.getoption("--step-traces") == "on-failure":
+        tracer = StepTracer(
+            context,
+            ARTIFACTS_DIR / "traces",
+            request.node.nodeid,
+            screenshots=pytestconfig.getoption("--step-trace-screenshots"),
+        )
+        tracer.start()
+        request.node.step_tracer = tracer
     try:
         yield context
     finally:
-        context.close()
+        try:
+            if tracer is not None:
+                rep_call = getattr(request.node, "rep_call", None)
+                tracer.finish(failed=bool(rep_call is not None and rep_call.failed))
+        finally:
+            if blocker is not None:
+                request.node.user_properties.append(("blocked_requests", blocker.blocked))
+            context.close()
 
 
 @pytest.fixture()
 
-def auth_page(auth_context: BrowserContext, api_token: str) -> Generator[Page, None, None]:
+def auth_page(
+    auth_context: BrowserContext, api_token: str, request: pytest.FixtureRequest, pytestconfig: pytest.Config
+) -> Generator[Page, None, None]:
     """
     Convenience fixture returning a pre-authenticated Page.
+
+    Console/network events are captured into a bounded buffer (see `browser_events`) and
+    only reported if the test fails.
     """
     # Ensure token is present in localStorage for UI origin before navigating to dashboard
     auth_context.add_init_script("window.localStorage.setItem('token', '" + api_token + "')")
+    pytestconfig.stash[_entity_registry_key].token = api_token
     page = auth_context.new_page()
+    request.node.browser_events = BrowserEventRecorder(page)
     # Prime origin so localStorage is set for the correct site before tests navigate
     try:
         page.goto(UI_BASE_URL)
@@ -339,3 +1096,74 @@ def auth_page(auth_context: BrowserContext, api_token: str) -> Generator[Page, N
         yield page
     finally:
         page.close()
+
+
+@pytest.fixture(scope="session")
+def readonly_runner(
+    auth_storage_path: str, api_token: str, browser_name: str, pytestconfig: pytest.Config
+) -> Generator[ReadOnlyRunner, None, None]:
+    """
+    Async browser (one per worker and engine) that runs batched read-only checks, see
+    `readonly_check`. Only requested with --readonly-batch.
+    """
+    browser_name = _normalize_browser_name(browser_name or "chromium")
+    profile = pytestconfig.getoption("--browser-profile")
+    # Checks share one context in batch mode, so allow_resources markers do not apply here.
+    runner = ReadOnlyRunner(
+        browser_name=browser_name,
+        headless=not pytestconfig.getoption("--headed"),
+        storage_state=auth_storage_path,
+        token=api_token,
+        launch_options=launch_options(browser_name, profile),
+        blocker=ResourceBlocker() if profile == "lean" else None,
+    )
+    yield runner
+    runner.close()
+
+
+@pytest.fixture()
+def readonly_check(request: pytest.FixtureRequest, pytestconfig: pytest.Config):
+    """
+    Callable that runs the async check given by the test's `readonly_ui(check=...)` marker.
+
+    With --readonly-batch the first call runs every pending readonly_ui check of the session
+    concurrently in one context of the async `readonly_runner`; each test then re-raises only
+    its own result. Otherwise the check runs on `auth_page`, so no second browser is started.
+    """
+    check = _readonly_check_of(request.node)
+    if check is None:
+        pytest.fail("readonly_check requires @pytest.mark.readonly_ui(check=<async check>)", pytrace=False)
+    nodeid = request.node.nodeid
+    batching = _readonly_batching(pytestconfig)
+    # Requested here, not in the signature, so only the mode in use is set up.
+    runner: Optional[ReadOnlyRunner] = request.getfixturevalue("readonly_runner") if batching else None
+    page: Optional[Page] = None if batching else request.getfixturevalue("auth_page")
+
+    def run() -> None:
+        with step(f"Read-only check: {check.__name__}"):
+            if runner is None:
+                error, elapsed_ms = run_on_sync_page(check, page)
+            else:
+                batch = pytestconfig.stash.get(_readonly_batch_key, {}).get(engine_of(request.node), {})
+                result = None
+                if nodeid in batch:
+                    runner.run_batch(batch)
+                    result = runner.take(nodeid)
+                if result is None:
+                    result = runner.run_single(check)
+                error, elapsed_ms = result
+                recorder = _impact_recorder(pytestconfig)
+                if recorder is not None:
+                    # Pages run on the async browser, outside the recorder's page listener.
+                    recorder.on_request("GET", APP_URL)
+            request.node.user_properties.append(("readonly_check_ms", round(elapsed_ms, 1)))
+            if error is not None:
+                raise error
+
+    return run
+
+
+@pytest.fixture()
+def browser_events(auth_page: Page, request: pytest.FixtureRequest) -> BrowserEventRecorder:
+    """The BrowserEventRecorder attached to `auth_page`, for tests that assert on events."""
+    return request.node.browser_events
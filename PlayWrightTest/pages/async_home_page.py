@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from playwright.async_api import Page, expect
+
+from pages.home_page import DashboardLocators
+from utils.timeouts import timeouts
+
+
+class AsyncHomePage(DashboardLocators):
+    """Async counterpart of HomePage for read-only checks driven by utils/readonly_batch.py.
+
+    Only the navigation and read-only assertions are mirrored; anything that mutates data
+    stays on the sync HomePage.
+    """
+
+    def __init__(self, page: Page) -> None:
+        super().__init__(page)
+        self.page: Page = page
+
+    async def goto(self) -> None:
+        await self.page.goto(self.URL)
+        await self.page.wait_for_load_state("domcontentloaded")
+        try:
+            await expect(self.add_client_button).to_be_visible(timeout=timeouts.get("navigation"))
+        except Exception:
+            await self.page.wait_for_load_state("networkidle")
+            await expect(self.add_client_button).to_be_visible(timeout=timeouts.get("navigation_retry"))
+
+    async def is_logged_in(self) -> bool:
+        try:
+            await expect(self.add_client_button).to_be_visible(timeout=timeouts.get("navigation"))
+            return True
+        except Exception:
+            return False
+
+    async def is_toolbar_visible(self) -> bool:
+        try:
+            await expect(self.client_list_toolbar).to_be_visible(timeout=timeouts.get("navigation"))
+            return True
+        except Exception:
+            return False
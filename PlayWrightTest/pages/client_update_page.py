@@ -1,5 +1,9 @@
 from playwright.sync_api import Page, expect
 
+from config.settings import UI_BASE_URL
+from utils.timeouts import timeouts
+from utils.visual import visual
+
 class ClientUpdatePage:
     def __init__(self, page: Page):
         self.page = page
@@ -8,9 +12,16 @@ class ClientUpdatePage:
         # Form fields
         self.first_name_input = page.get_by_label("First Name")
         self.last_name_input = page.get_by_label("Last Name")
+        self.dob_input = page.get_by_label("Date of Birth")
         self.sex_select = page.locator("mat-select[formControlName='sex']")
         self.save_button = page.get_by_role("button", name="Save")
 
+    def goto(self, client_id: int) -> None:
+        """Open the update form of a client directly (client-update/:id route)."""
+        self.page.goto(f"{UI_BASE_URL.rstrip('/')}/client-update/{client_id}")
+        expect(self.header).to_be_visible(timeout=timeouts.get("navigation"))
+        expect(self.first_name_input).not_to_have_value("", timeout=timeouts.get("navigation"))
+
     def update_client(self, client_name: str, new_last_name: str, new_sex: str):
         # Verify we are editing the correct client (optional but good)
         expect(self.first_name_input).to_have_value(client_name)
@@ -24,3 +35,11 @@ class ClientUpdatePage:
         
         # Save
         self.save_button.click()
+
+    def verify_form_visual(self):
+        # Field values depend on the client under test, so they are masked out.
+        visual.check(
+            self.page.locator("form"),
+            "client-update-form",
+            mask=[self.first_name_input, self.last_name_input, self.dob_input, self.sex_select],
+        )
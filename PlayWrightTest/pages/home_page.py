@@ -1,43 +1,109 @@
 from __future__ import annotations
 
+import time
+from typing import Dict, Iterable, Optional, Sequence
+
 from playwright.sync_api import Page, expect, Locator
 
 from config.settings import APP_URL
+from utils.table import verify_table
+from utils.timeouts import timeouts
+from utils.visual import visual
+from utils.web_perf import web_perf
 
+# Reads every client row in one round trip. Cells are addressed by their mat-table column
+# class so the result does not depend on column order.
+_TABLE_INDEX_JS = """
+() => {
+  const text = (row, col) => {
+    const cell = row.querySelector(`td.mat-column-${col}`);
+    return cell ? cell.textContent.trim() : null;
+  };
+  return Array.from(document.querySelectorAll('table tr')).filter(r => r.querySelector('td')).map(r => {
+    const id = r.getAttribute('data-client-id');
+    return {
+      id: id === null ? null : Number(id),
+      firstName: text(r, 'firstName'),
+      lastName: text(r, 'lastName'),
+      dob: text(r, 'dob'),
+      sex: text(r, 'sex'),
+    };
+  });
+}
+"""
 
-class HomePage:
-    """POM for the TestProduct Angular UI dashboard."""
 
-    def __init__(self, page: Page) -> None:
+class DashboardLocators:
+    """URL and locators of the dashboard, shared by HomePage and the async AsyncHomePage.
+
+    Locators are built the same way from a sync or an async Playwright page.
+    """
+
+    URL = APP_URL
+
+    def __init__(self, page) -> None:
         self.page = page
         # Toolbar within the dashboard component (unique by containing the Add Client button)
         self.add_client_button = page.locator('button:has-text("Add Client")')
         self.client_list_toolbar = page.locator("mat-toolbar").filter(has=self.add_client_button)
 
+
+class HomePage(DashboardLocators):
+    """POM for the TestProduct Angular UI dashboard."""
+
+    CLIENT_TABLE_HEADERS = ("First Name", "Last Name", "DOB", "Sex")
+    CLIENT_TABLE_COLUMNS = ("firstName", "lastName", "dob", "sex")
+
+    def __init__(self, page: Page) -> None:
+        super().__init__(page)
+        self.page: Page = page
+
     def goto(self) -> None:
-        self.page.goto(APP_URL)
-        # First load of Angular dev server can take time; allow generous waits
+        web_perf.prepare(self.page)
+        start = time.perf_counter()
+        self.page.goto(self.URL)
+        # First load of Angular dev server can take time; waits are learned from past runs
         self.page.wait_for_load_state("domcontentloaded")
         try:
-            expect(self.add_client_button).to_be_visible(timeout=15000)
+            expect(self.add_client_button).to_be_visible(timeout=timeouts.get("navigation"))
         except Exception:
-            # Fallback: wait for network idle then try again briefly
-            self.page.wait_for_load_state("networkidle")
-            expect(self.add_client_button).to_be_visible(timeout=5000)
+            # Fallback: wait for network idle then try again briefly. Timed on its own so slow
+            # fallback loads do not inflate the navigation p99.
+            with timeouts.measure("navigation_retry"):
+                self.page.wait_for_load_state("networkidle")
+                expect(self.add_client_button).to_be_visible(timeout=timeouts.get("navigation_retry"))
+        else:
+            timeouts.record("navigation", (time.perf_counter() - start) * 1000)
+        # Soft or hard budget check of this load (dashboard entry in WEBPERF_BUDGETS)
+        web_perf.measure(self.page, "dashboard")
 
     def is_logged_in(self) -> bool:
         # In this demo app, seeing the Dashboard toolbar and Add Client button implies authenticated state
         try:
-            expect(self.add_client_button).to_be_visible(timeout=15000)
+            expect(self.add_client_button).to_be_visible(timeout=timeouts.get("navigation"))
+            return True
+        except Exception:
+            return False
+
+    def is_toolbar_visible(self) -> bool:
+        try:
+            expect(self.client_list_toolbar).to_be_visible(timeout=timeouts.get("navigation"))
             return True
         except Exception:
             return False
 
     # ---------- UI Actions ----------
-    def add_client(self, first_name: str, last_name: str, dob_str: str, sex: str) -> None:
+    def add_client(self, first_name: str, last_name: str, dob_str: str, sex: str) -> Optional[Dict]:
+        """Create a client through the Add Client dialog.
+
+        Returns the client from the `POST /clients` response (with its `id`), or None if no
+        response was seen. The entity registry records it from the same response, so tests
+        need no cleanup of their own.
+        """
         self.add_client_button.click()
         dlg = self.page.get_by_role("dialog")
-        expect(dlg).to_be_visible()
+        with timeouts.measure("dialog_open"):
+            expect(dlg).to_be_visible(timeout=timeouts.get("dialog_open"))
         self.page.get_by_label("First Name").fill(first_name)
         self.page.get_by_label("Last Name").fill(last_name)
         # The date input accepts typed date; Angular Material parses MM/DD/YYYY
@@ -58,19 +124,22 @@ class HomePage:
         self.page.get_by_role("option", name=sex, exact=True).click()
 
         save_button = dlg.get_by_role("button", name="Save")
-        expect(save_button).to_be_enabled(timeout=10000)
+        with timeouts.measure("save_enabled"):
+            expect(save_button).to_be_enabled(timeout=timeouts.get("save_enabled"))
 
         # Wait for the create call to complete. If the request is blocked (e.g. CORS),
         # this will timeout and provide a clearer signal than a dialog-close wait.
+        created: Optional[Dict] = None
         try:
-            with self.page.expect_response(
+            with timeouts.measure("create_client_response"), self.page.expect_response(
                 lambda r: r.request.method == "POST" and "/clients" in r.url,
-                timeout=20000,
+                timeout=timeouts.get("create_client_response"),
             ) as resp_info:
                 save_button.click()
             resp = resp_info.value
             if resp.status not in (200, 201):
                 raise AssertionError(f"Create client failed: HTTP {resp.status} {resp.url}")
+            created = resp.json()
         except Exception:
             # If no response arrives at all, we still continue into the dialog-close logic
             # below so we can capture any UI-level errors.
@@ -78,7 +147,8 @@ class HomePage:
 
         # Wait for dialog to close and table to refresh.
         try:
-            dlg.wait_for(state="hidden", timeout=30000)
+            with timeouts.measure("dialog_close"):
+                dlg.wait_for(state="hidden", timeout=timeouts.get("dialog_close"))
         except Exception:
             # If the dialog is still open, fail with helpful context (validation/errors/snackbar).
             error_text = ""
@@ -87,17 +157,85 @@ class HomePage:
             except Exception:
                 error_text = ""
             try:
-                snack = self.page.locator("mat-snack-bar-container, .mat-mdc-snack-bar-container, simple-snack-bar").inner_text(timeout=1500)
+                snack = self.page.locator("mat-snack-bar-container, .mat-mdc-snack-bar-container, simple-snack-bar").inner_text(timeout=timeouts.get("snackbar"))
             except Exception:
                 snack = ""
             raise AssertionError(
                 "Add Client dialog did not close after clicking Save. "
                 f"Validation errors: {error_text}. Snack: {snack}."
             )
-        expect(self.add_client_button).to_be_visible(timeout=10000)
+        with timeouts.measure("dashboard_refresh"):
+            expect(self.add_client_button).to_be_visible(timeout=timeouts.get("dashboard_refresh"))
+        return created
 
     def client_row_by_first_name(self, first_name: str) -> Locator:
         # Locate the data row containing the first name
         # Be robust across Angular Material versions (mat-row vs mat-mdc-row).
         # Match any table row that contains the first name text.
         return self.page.locator("table").locator("tr", has_text=first_name)
+
+    def client_row_by_id(self, client_id: int) -> Locator:
+        # Attribute selector on the row key; no text scan across the table.
+        return self.page.locator(f'tr[data-client-id="{client_id}"]')
+
+    def client_row_by_exact_first_name(self, first_name: str) -> Locator:
+        # Exact accessible-name match on the first-name cell instead of a substring over the row.
+        return self.page.get_by_role("row").filter(
+            has=self.page.get_by_role("cell", name=first_name, exact=True)
+        )
+
+    def client_table_index(self) -> Dict[str, Dict]:
+        """Pull the whole client table with a single `evaluate`.
+
+        Returns {"by_id": {id: row}, "by_first_name": {first_name: row}} where each row is a
+        dict of id/firstName/lastName/dob/sex as rendered. Use this for many-row assertions
+        so they cost one browser round trip instead of one locator query per row.
+        """
+        rows = self.page.evaluate(_TABLE_INDEX_JS)
+        by_id: Dict[int, Dict] = {}
+        by_first_name: Dict[str, Dict] = {}
+        for row in rows:
+            if row["id"] is not None:
+                by_id[row["id"]] = row
+            if row["firstName"]:
+                by_first_name.setdefault(row["firstName"], row)
+        return {"by_id": by_id, "by_first_name": by_first_name}
+
+    def find_client_row(self, client_id: Optional[int] = None, first_name: Optional[str] = None) -> Optional[Dict]:
+        """Look up one rendered row by id (preferred) or exact first name; None if absent."""
+        index = self.client_table_index()
+        if client_id is not None:
+            return index["by_id"].get(client_id)
+        if first_name is not None:
+            return index["by_first_name"].get(first_name)
+        raise ValueError("client_id or first_name is required")
+
+    def verify_clients(
+        self,
+        clients: Sequence[Dict],
+        headers: Iterable[str] = CLIENT_TABLE_HEADERS,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Verify headers plus every client's rendered cells in a single batched check.
+
+        `clients` are API client dicts; rows are matched by id and only the displayed
+        columns are compared. All mismatches are reported together.
+        """
+        rows = [
+            {"id": c["id"], **{col: c[col] for col in self.CLIENT_TABLE_COLUMNS if col in c}}
+            for c in clients
+        ]
+        with timeouts.measure("table_verify"):
+            verify_table(
+                self.page,
+                headers=headers,
+                rows=rows,
+                key="id",
+                timeout=timeout if timeout is not None else timeouts.get("table_verify"),
+            )
+
+    # ---------- Visual ----------
+    def verify_dashboard_visual(self) -> None:
+        """Compare the toolbar and the client table header with their visual baselines."""
+        visual.check(self.client_list_toolbar, "home-toolbar")
+        visual.check(self.page.locator("table tr").first, "client-table-header")
@@ -4,6 +4,7 @@ from utils.step import step
 from config.settings import BASE_URL
 
 @pytest.mark.api
+@pytest.mark.deterministic
 class TestAPIExtended:
     
     def test_create_client_missing_fields(self, api_context: APIRequestContext):
@@ -0,0 +1,49 @@
+import pytest
+
+from config.settings import FUZZ_SEED
+from utils.fuzz import Fuzzer, describe_failures
+
+# Opt-in only (--fuzz=SECONDS, or --fuzz=replay for the corpus alone). Accepted fuzz cases
+# write to the API store, whose unlocked read-modify-write can lose other tests' writes, so
+# run it on its own:
+#   pytest tests/test_api_fuzz.py --fuzz=60 -p no:xdist
+pytestmark = [pytest.mark.regressionTest, pytest.mark.fuzz]
+
+# Known server bugs, reproduced by the committed corpus on every run: the handlers check
+# `value.toString()` and `new Date(dob)`, so non-string names (true, ["A"]), non-string
+# dobs (1), loose date strings ("0" -> 2000-01-01) and impossible dates (1979-02-30 ->
+# 1979-03-02) are accepted. Accepting a payload that breaks one of these rules xfails the
+# test; anything else still fails it.
+KNOWN_BUGS = {
+    "firstName: not a string",
+    "lastName: not a string",
+    "dob: not a string",
+    "dob: not YYYY-MM-DD",
+    "dob: not a calendar date",
+}
+
+
+def is_known_bug(failure: dict) -> bool:
+    return failure["reason"] in KNOWN_BUGS and failure["problem"].startswith("invalid payload answered 2")
+
+
+class TestApiFuzz:
+    def test_clients_validation_properties(self, api_token, new_client, entity_registry, pytestconfig, request):
+        fuzzer = Fuzzer(
+            api_token,
+            client_id=new_client["id"],
+            seed=FUZZ_SEED,
+            on_created=lambda client_id: entity_registry.record("client", client_id),
+        )
+        report = fuzzer.run(pytestconfig.getoption("--fuzz"))
+        request.node.user_properties.append(
+            ("fuzz", {k: report[k] for k in ("seed", "replayed", "cases", "cases_per_s", "corpus")})
+        )
+        print(
+            f"Fuzz: {report['cases']} case(s) ({report['replayed']} replayed) at {report['cases_per_s']}/s, "
+            f"seed {report['seed']}, corpus {report['corpus']}"
+        )
+        new = [f for f in report["failures"] if not is_known_bug(f)]
+        assert not new, describe_failures({**report, "failures": new})
+        if report["failures"]:
+            pytest.xfail(describe_failures(report))
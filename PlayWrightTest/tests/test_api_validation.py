@@ -2,7 +2,7 @@ import json
 import pytest
 from playwright.sync_api import expect
 
-pytestmark = pytest.mark.regressionTest
+pytestmark = [pytest.mark.regressionTest, pytest.mark.deterministic]
 
 
 def _post_json(api_context, path, payload):
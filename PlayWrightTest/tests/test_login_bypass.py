@@ -1,16 +1,14 @@
 import pytest
-from utils.step import step
 
-from pages.home_page import HomePage
+
+async def logged_in_via_bypass(home):
+    await home.goto()
+    assert await home.is_logged_in(), "Expected to be logged in via API login bypass without UI login."
 
 
 @pytest.mark.smoke
 @pytest.mark.auth
-def test_login_bypass(auth_page):
+@pytest.mark.readonly_ui(check=logged_in_via_bypass)
+def test_login_bypass(readonly_check):
     """Verify we start in an authenticated state using storageState created via API login bypass."""
-    with step("Navigate to Home Page"):
-        home = HomePage(auth_page)
-        home.goto()
-    
-    with step("Verify Logged In State"):
-        assert home.is_logged_in(), "Expected to be logged in via API login bypass without UI login."
+    readonly_check()
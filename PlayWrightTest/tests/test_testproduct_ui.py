@@ -1,30 +1,34 @@
 import pytest
 from playwright.sync_api import expect
 from utils.step import step
+from utils.timeouts import timeouts
 
 from pages.home_page import HomePage
 from pages.client_update_page import ClientUpdatePage
 
 
+# Read-only checks: run through the readonly_check fixture (concurrently with --readonly-batch).
+async def dashboard_visible(home):
+    await home.goto()
+    assert await home.is_logged_in(), "Expected Client List dashboard to be visible when using pre-auth storageState."
+
+
+async def dashboard_toolbar_visible(home):
+    await home.goto()
+    assert await home.is_toolbar_visible(), "Expected the dashboard toolbar to be visible for a logged-in user."
+
+
 @pytest.mark.ui
 @pytest.mark.regressionTest
 class TestTestProductUI:
-    def test_dashboard_visible_with_pre_authenticated_state(self, auth_page):
+    @pytest.mark.readonly_ui(check=dashboard_visible)
+    def test_dashboard_visible_with_pre_authenticated_state(self, readonly_check):
         """Verify that with API-login-based storageState, we land on the Client List dashboard already logged in."""
-        with step("Navigate to Home Page"):
-            home = HomePage(auth_page)
-            home.goto()
-        
-        with step("Verify User is Logged In"):
-            assert home.is_logged_in(), "Expected Client List dashboard to be visible when using pre-auth storageState."
+        readonly_check()
 
-    def test_add_client_via_ui(self, auth_page, api_context):
+    def test_add_client_via_ui(self, auth_page):
         """Create a client via the UI and assert its first name appears as a clickable entry."""
-        # Capture browser console logs for debugging
-        auth_page.on("console", lambda msg: print(f"BROWSER CONSOLE: {msg.type}: {msg.text}"))
-        auth_page.on("requestfailed", lambda req: print(f"REQUEST FAILED: {req.url} - {req.failure}"))
-        auth_page.on("response", lambda res: print(f"RESPONSE: {res.url} - {res.status}"))
-        
+        # Browser console/network events are captured by auth_page and reported on failure.
         with step("Navigate to Home Page"):
             home = HomePage(auth_page)
             home.goto()
@@ -40,31 +44,15 @@ class TestTestProductUI:
         unique_suffix = ''.join([c for c in str(uuid.uuid4()) if c.isalpha()])[:6] or 'PW'
         first_name = f"Playwright{unique_suffix}"
         
-        try:
-            with step(f"Add Client via UI: {first_name}"):
-                # Using MM/DD/YYYY for UI input as Angular Material default locale often expects this
-                home.add_client(first_name, "User", "01/01/2000", "Male")
-            
-            with step("Verify Client Appears in List"):
-                row = home.client_row_by_first_name(first_name)
-                expect(row).to_be_visible(timeout=10000)
-        finally:
-            with step("Teardown: Delete Client via API"):
-                # Teardown: search for the client via API and delete it if it exists
-                # We need to find the ID first
-                try:
-                    # The API doesn't support searching by name directly (it returns list), 
-                    # but we can filter the list.
-                    # Assuming Admin or Owner, so we should see it.
-                    resp = api_context.get("/clients?mine=true")
-                    if resp.ok:
-                        clients = resp.json()
-                        target = next((c for c in clients if c["firstName"] == first_name), None)
-                        if target:
-                            api_context.delete(f"/clients/{target['id']}")
-                            print(f"Teardown: Deleted client {target['id']} ({first_name})")
-                except Exception as e:
-                    print(f"Teardown failed: {e}")
+        # No finally/teardown here: the client is recorded from the POST /clients response
+        # and deleted by id by the cleanup_created_entities fixture.
+        with step(f"Add Client via UI: {first_name}"):
+            # Using MM/DD/YYYY for UI input as Angular Material default locale often expects this
+            home.add_client(first_name, "User", "01/01/2000", "Male")
+        
+        with step("Verify Client Appears in List"):
+            row = home.client_row_by_first_name(first_name)
+            expect(row).to_be_visible(timeout=timeouts.get("row_visible"))
 
     def test_view_client_details(self, auth_page, new_client):
         """
@@ -75,18 +63,11 @@ class TestTestProductUI:
             home.goto()
         
         with step(f"Verify table headers and row visible: {new_client['firstName']}"):
-            # Verify table headers exist
-            expect(auth_page.locator("th:has-text('First Name')")).to_be_visible()
-            expect(auth_page.locator("th:has-text('Last Name')")).to_be_visible()
-            expect(auth_page.locator("th:has-text('DOB')")).to_be_visible()
-            expect(auth_page.locator("th:has-text('Sex')")).to_be_visible()
+            # Headers, row presence, last name, sex and dob (yyyy-MM-dd in UI) in one batched check
+            home.verify_clients([new_client])
 
-            row = home.client_row_by_first_name(new_client["firstName"])
-            expect(row).to_be_visible(timeout=10000)
-            expect(row).to_contain_text(new_client["lastName"]) 
-            expect(row).to_contain_text(new_client["sex"]) 
-            # dob formatted as yyyy-MM-dd in UI
-            expect(row).to_contain_text(new_client["dob"])
+        with step("Verify dashboard visuals"):
+            home.verify_dashboard_visual()
 
     def test_update_client_via_ui(self, auth_page, new_client, api_context):
         """
@@ -117,10 +98,17 @@ class TestTestProductUI:
         
         with step("Verify Updated Data in List"):
             home.goto()
-            row = home.client_row_by_first_name(client_name)
-            expect(row).to_be_visible()
-            expect(row).to_contain_text(new_last_name)
-            expect(row).to_contain_text(new_sex)
+            home.verify_clients([{**payload, "id": client_id}])
+
+    def test_update_form_visual(self, auth_page, new_client):
+        """Open a client's update form directly and compare it with its visual baseline."""
+        with step("Open Update Form"):
+            form = ClientUpdatePage(auth_page)
+            form.goto(new_client["id"])
+            expect(form.first_name_input).to_have_value(new_client["firstName"])
+
+        with step("Verify form visuals"):
+            form.verify_form_visual()
 
     def test_delete_client_confirm(self, auth_page, new_client, api_context):
         """
@@ -130,18 +118,18 @@ class TestTestProductUI:
             home = HomePage(auth_page)
             home.goto()
         
-        client_name = new_client["firstName"]
+        client_id = new_client["id"]
         with step("Verify Client Present Before Delete"):
-            row = home.client_row_by_first_name(client_name)
+            row = home.client_row_by_id(client_id)
             expect(row).to_be_visible()
         
         with step("Delete Client via API"):
-            delete_response = api_context.delete(f"/clients/{new_client['id']}")
+            delete_response = api_context.delete(f"/clients/{client_id}")
             assert delete_response.ok, f"Delete failed: {delete_response.status} {delete_response.text()}"
         
         with step("Verify Client Disappears"):
             home.goto()
-            row = home.client_row_by_first_name(client_name)
+            row = home.client_row_by_id(client_id)
             expect(row).not_to_be_visible()
 
     def test_delete_client_cancel(self, auth_page, new_client):
@@ -152,21 +140,17 @@ class TestTestProductUI:
             home = HomePage(auth_page)
             home.goto()
         
-        client_name = new_client["firstName"]
+        client_id = new_client["id"]
         with step("Verify Client Still Exists (No Delete Performed)"):
-            row = home.client_row_by_first_name(client_name)
+            row = home.client_row_by_id(client_id)
             expect(row).to_be_visible()
 
-    def test_logged_in_user_display(self, auth_page):
+    @pytest.mark.readonly_ui(check=dashboard_toolbar_visible)
+    def test_logged_in_user_display(self, readonly_check):
         """
         Verify that the dashboard toolbar is visible for a logged-in user.
         """
-        with step("Navigate to Home Page"):
-            home = HomePage(auth_page)
-            home.goto()
-        
-        with step("Verify Dashboard Toolbar Visible"):
-            expect(home.add_client_button).to_be_visible()
+        readonly_check()
 
     @pytest.mark.skip(reason="Direct client detail route not implemented in this demo UI")
     def test_view_client_detail_via_direct_url(self, auth_page, new_client):
@@ -219,10 +203,11 @@ class TestTestProductUI:
 
     @pytest.mark.order("last")
     @pytest.mark.skip(reason="Demo failed test to show failure reporting in HTML report")
-    def test_create_client_fail_fast_mismatch(self, auth_page, api_context):
+    def test_create_client_fail_fast_mismatch(self, auth_page):
         """
         INTENTIONAL FAILURE: Create client with 'AAA' but verify 'BBB'.
         Run last to avoid disrupting other tests.
+        The created 'AAA' client is removed by cleanup_created_entities.
         """
         with step("Navigate to Home Page"):
             home = HomePage(auth_page)
@@ -231,27 +216,13 @@ class TestTestProductUI:
         # 1. Create client 'AAA' (letters-only to satisfy validation)
         first_name_input = "AAAFastFail"
         
-        try:
-            with step(f"Add Client: {first_name_input}"):
-                home.add_client(first_name_input, "User", "01/01/2000", "Male")
-            
-            # 2. Verify 'BBB' (Intentional Fail) with short timeout
-            expected_wrong_name = "BBB_ThisShouldNotExist"
-            with step(f"Verify Client {expected_wrong_name} Appears (Expect Fail)"):
-                print("DEBUG: Checking for wrong name intentionally...")
-                row = home.client_row_by_first_name(expected_wrong_name)
-                # Short timeout to fail fast
-                expect(row).to_be_visible(timeout=2000)
-                
-        finally:
-            # Cleanup 'AAA' if it was created
-            try:
-                resp = api_context.get('/clients?mine=true')
-                if resp.ok:
-                    clients = resp.json()
-                    target = next((c for c in clients if c.get('firstName') == first_name_input), None)
-                    if target:
-                        api_context.delete(f"/clients/{target['id']}")
-            except Exception:
-                # Best-effort cleanup
-                pass
+        with step(f"Add Client: {first_name_input}"):
+            home.add_client(first_name_input, "User", "01/01/2000", "Male")
+        
+        # 2. Verify 'BBB' (Intentional Fail) with short timeout
+        expected_wrong_name = "BBB_ThisShouldNotExist"
+        with step(f"Verify Client {expected_wrong_name} Appears (Expect Fail)"):
+            print("DEBUG: Checking for wrong name intentionally...")
+            row = home.client_row_by_first_name(expected_wrong_name)
+            # Short timeout to fail fast
+            expect(row).to_be_visible(timeout=2000)
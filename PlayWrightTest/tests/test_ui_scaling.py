@@ -0,0 +1,92 @@
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import expect
+
+from config.settings import (
+    API_DATA_FILE,
+    SCALING_LOCATOR_BUDGET_MS,
+    SCALING_RENDER_BUDGET_MS,
+    SCALING_SIZES,
+)
+from pages.home_page import HomePage
+from utils.seed_data import (
+    purge_seeded_clients_api,
+    purge_seeded_clients_file,
+    seed_clients_api,
+    seed_clients_file,
+    seed_first_name,
+)
+from utils.step import step
+
+# Opt-in only (--run-scaling); run without xdist so seeding does not race other tests:
+#   pytest tests/test_ui_scaling.py --run-scaling -p no:xdist
+pytestmark = [pytest.mark.ui, pytest.mark.scaling]
+
+
+@pytest.fixture(params=SCALING_SIZES, ids=lambda n: f"{n}_clients")
+def seeded_clients(request, api_context):
+    """Seed N clients (direct file write when the store is local, else via the API) and purge after."""
+    size = request.param
+    use_file = API_DATA_FILE.exists()
+    if use_file:
+        seeded = seed_clients_file(size)
+    else:
+        seeded = seed_clients_api(api_context, size)
+    try:
+        yield seeded
+    finally:
+        if use_file:
+            purge_seeded_clients_file()
+        else:
+            purge_seeded_clients_api(api_context)
+
+
+def _record(rootpath: Path, result: dict) -> None:
+    out_dir = rootpath / ".scaling"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with (out_dir / "history.jsonl").open("a", encoding="utf8") as fh:
+        fh.write(json.dumps(result) + "\n")
+
+
+def test_client_list_scaling(auth_page, seeded_clients, pytestconfig, request):
+    """Measure dashboard render time, DOM size and row lookup time as the client list grows."""
+    size = len(seeded_clients)
+    home = HomePage(auth_page)
+
+    with step(f"Render dashboard with {size} seeded clients"):
+        start = time.perf_counter()
+        home.goto()
+        auth_page.wait_for_function(
+            "n => document.querySelectorAll('table tr').length - 1 >= n",
+            arg=size,
+            timeout=SCALING_RENDER_BUDGET_MS,
+        )
+        render_ms = (time.perf_counter() - start) * 1000
+
+    with step("Count DOM nodes"):
+        dom_nodes = auth_page.evaluate("document.getElementsByTagName('*').length")
+
+    with step("Resolve the oldest seeded row by first name"):
+        # The oldest seed is rendered last (newest first), i.e. the worst case for a text scan.
+        target = seed_first_name(0)
+        start = time.perf_counter()
+        expect(home.client_row_by_first_name(target)).to_be_visible(timeout=SCALING_LOCATOR_BUDGET_MS)
+        locator_ms = (time.perf_counter() - start) * 1000
+
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "size": size,
+        "render_ms": round(render_ms, 1),
+        "dom_nodes": dom_nodes,
+        "locator_ms": round(locator_ms, 1),
+    }
+    _record(Path(pytestconfig.rootpath), result)
+    request.node.user_properties.append(("scaling", result))
+
+    with step("Verify timings are within budget"):
+        assert render_ms <= SCALING_RENDER_BUDGET_MS, f"Render of {size} rows took {render_ms:.0f}ms"
+        assert locator_ms <= SCALING_LOCATOR_BUDGET_MS, f"Row lookup among {size} rows took {locator_ms:.0f}ms"
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils import browser_matrix
+from utils.browser_matrix import BrowserMatrix
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+
+class _Item:
+    def __init__(self, name, engine=None, order=None):
+        self.name = name
+        self.callspec = SimpleNamespace(params={"browser_name": engine}) if engine else None
+        self._order = order
+
+    def get_closest_marker(self, name):
+        return SimpleNamespace(args=(self._order,)) if name == "order" and self._order else None
+
+
+@pytest.fixture
+def matrix(monkeypatch):
+    monkeypatch.setattr(browser_matrix, "load_engine_weights", lambda: {"chromium": 1.0, "webkit": 2.0})
+    return BrowserMatrix(["chromium", "webkit"])
+
+
+def _names(items):
+    return [item.name for item in items]
+
+
+class TestOrdering:
+    def test_slowest_engine_first_and_api_tests_last(self, matrix):
+        items = [_Item("api"), _Item("c1", "chromium"), _Item("c2", "chromium"), _Item("w1", "webkit")]
+        matrix.pytest_collection_modifyitems(items)
+        assert _names(items) == ["w1", "c1", "c2", "api"]
+
+    def test_ordered_tests_keep_their_place(self, matrix):
+        items = [_Item("c1", "chromium"), _Item("w1", "webkit"), _Item("api"), _Item("c-last", "chromium", "last")]
+        matrix.pytest_collection_modifyitems(items)
+        assert _names(items) == ["w1", "c1", "api", "c-last"]
@@ -0,0 +1,54 @@
+import fastjsonschema
+import pytest
+
+from utils.contract import to_json_schema
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+CLIENT = {
+    "type": "object",
+    "description": "A client",
+    "required": ["id", "firstName"],
+    "properties": {
+        "id": {"type": "integer", "example": 1},
+        "firstName": {"type": "string"},
+        "nickname": {"type": "string", "nullable": True},
+    },
+}
+
+
+def _validate(schema, value, **kwargs):
+    definitions = {"Client": to_json_schema(CLIENT, **kwargs)}
+    fastjsonschema.compile({"definitions": definitions, **to_json_schema(schema, **kwargs)})(value)
+
+
+class TestToJsonSchema:
+    def test_drops_openapi_only_keywords(self):
+        converted = to_json_schema(CLIENT)
+        assert "description" not in converted
+        assert "example" not in converted["properties"]["id"]
+
+    def test_component_refs_point_at_definitions(self):
+        assert to_json_schema({"$ref": "#/components/schemas/Client"}) == {"$ref": "#/definitions/Client"}
+
+    def test_nullable_allows_null(self):
+        assert to_json_schema(CLIENT)["properties"]["nickname"]["type"] == ["string", "null"]
+
+    def test_closed_objects_reject_undocumented_properties(self):
+        assert to_json_schema(CLIENT, closed=True)["additionalProperties"] is False
+        assert "additionalProperties" not in to_json_schema(CLIENT, closed=False)
+
+    def test_explicit_additional_properties_win(self):
+        assert to_json_schema({**CLIENT, "additionalProperties": True}, closed=True)["additionalProperties"] is True
+
+    def test_converts_nested_lists(self):
+        schema = {"oneOf": [{"$ref": "#/components/schemas/Client"}, {"type": "null"}]}
+        assert to_json_schema(schema)["oneOf"][0] == {"$ref": "#/definitions/Client"}
+
+    def test_compiled_schema_accepts_documented_shape(self):
+        clients = {"type": "array", "items": {"$ref": "#/components/schemas/Client"}}
+        _validate(clients, [{"id": 1, "firstName": "A", "nickname": None}], closed=True)
+
+    def test_compiled_schema_reports_drift(self):
+        with pytest.raises(fastjsonschema.JsonSchemaException):
+            _validate({"$ref": "#/components/schemas/Client"}, {"id": 1, "first_name": "A"}, closed=True)
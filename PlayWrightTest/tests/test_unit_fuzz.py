@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from utils.fuzz import CANONICAL, Fuzzer, expected, shrink_candidates, violations
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+TODAY = date(2026, 3, 1)
+
+
+class _BuggyServer(Fuzzer):
+    """Answers like the documented handler, except a non-string firstName crashes it."""
+
+    def _send(self, target, payload):
+        if not isinstance(payload.get("firstName"), str):
+            return 500, {"message": "Internal Server Error"}
+        if violations(payload, self.today):
+            return 400, {"message": "Bad Request"}
+        return 201, {"id": 1, **payload}
+
+
+class TestViolations:
+    def test_canonical_payload_is_valid(self):
+        assert violations(CANONICAL, TODAY) == []
+        assert expected(CANONICAL, TODAY) == (True, "valid")
+
+    @pytest.mark.parametrize(
+        "change, rule",
+        [
+            ({"firstName": "Ann3"}, "firstName: not letters only"),
+            ({"firstName": True}, "firstName: not a string"),
+            ({"lastName": "B" * 21}, "lastName: longer than 20"),
+            ({"sex": "male"}, "sex: not Male/Female"),
+            ({"dob": "01/01/1990"}, "dob: not YYYY-MM-DD"),
+            ({"dob": "1979-02-30"}, "dob: not a calendar date"),
+            ({"dob": "2010-01-01"}, "dob: younger than 18"),
+        ],
+    )
+    def test_each_rule(self, change, rule):
+        assert violations({**CANONICAL, **change}, TODAY) == [rule]
+        assert expected({**CANONICAL, **change}, TODAY) == (False, rule)
+
+    def test_missing_fields_come_first(self):
+        payload = {"firstName": "A1", "dob": 1}
+        assert violations(payload, TODAY) == [
+            "lastName: missing",
+            "sex: missing",
+            "firstName: not letters only",
+            "dob: not a string",
+        ]
+
+    def test_age_boundary_accepts_either_answer(self):
+        assert expected({**CANONICAL, "dob": "2008-03-01"}, TODAY) == (None, "dob: at the age boundary")
+
+    def test_boundary_does_not_hide_other_rules(self):
+        assert expected({**CANONICAL, "dob": "2008-03-01", "sex": "x"}, TODAY) == (False, "sex: not Male/Female")
+
+
+class TestShrinking:
+    def test_candidates_try_canonical_fields_first(self):
+        payload = {**CANONICAL, "lastName": "Smith"}
+        assert next(shrink_candidates(payload)) == CANONICAL
+
+    def test_candidates_shrink_values(self):
+        candidates = list(shrink_candidates({**CANONICAL, "firstName": ["A", "B"]}))
+        assert {**CANONICAL, "firstName": ["B"]} in candidates
+        assert {**CANONICAL, "firstName": "A"} in candidates
+
+    def test_shrinks_to_a_minimal_failure_with_the_same_signature(self):
+        fuzzer = _BuggyServer("token", client_id=1, concurrency=2, max_shrink_steps=200)
+        fuzzer.today = TODAY
+        payload = {"firstName": ["Abc", "Def"], "lastName": "Smith", "dob": "1985-05-05", "sex": "Female"}
+        failure = fuzzer.evaluate("create", payload)
+        assert failure["problem"] == "server error"
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            minimal = fuzzer.shrink(pool, failure)
+        assert minimal["payload"] == {**CANONICAL, "firstName": []}
+        assert fuzzer.signature(minimal) == fuzzer.signature(failure)
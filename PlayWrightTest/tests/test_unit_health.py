@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils import health
+from utils.health import failed_dependencies, probe_environment, required_probes
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+
+@pytest.fixture
+def probed(monkeypatch):
+    """Replace the HTTP probes; returns the names actually probed."""
+    calls = []
+
+    def fake(name):
+        def probe(timeout):
+            calls.append(name)
+            up = name != "ui"
+            return SimpleNamespace(ok=up, status_code=200 if up else 503, text="" if up else "down")
+        return probe
+
+    monkeypatch.setattr(health, "PROBES", {name: fake(name) for name in health.PROBES})
+    return calls
+
+
+class TestRequiredProbes:
+    def test_offline_tests_need_nothing(self):
+        assert required_probes([["tmp_path", "monkeypatch"], []]) == []
+
+    def test_union_over_tests(self):
+        assert required_probes([["api_context"], ["tmp_path"]]) == ["api", "login"]
+        assert required_probes([["api_context"], ["auth_page"]]) == ["api", "login", "ui"]
+
+
+class TestProbeEnvironment:
+    def test_nothing_needed_probes_nothing(self, probed):
+        assert probe_environment([]) == {}
+        assert probed == []
+
+    def test_only_requested_probes_run(self, probed):
+        result = probe_environment(["api"])
+        assert list(result) == ["api"] and probed == ["api"]
+
+    def test_failed_dependencies_follow_the_fixtures(self, probed):
+        result = probe_environment(["api", "login", "ui"])
+        assert failed_dependencies(result, ["auth_page"]) == ["ui"]
+        assert failed_dependencies(result, ["api_context"]) == []
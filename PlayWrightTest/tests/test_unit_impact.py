@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from utils import impact
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+ROOTDIR = Path(__file__).resolve().parents[1]
+ROOT = ROOTDIR.parent
+API = "TestProduct/API"
+TESTS = ROOTDIR.name
+
+IMPACT_MAP = {
+    "tests": {
+        "tests/test_api.py::test_get": {"files": [f"{TESTS}/utils/api_client.py"], "routes": ["GET /clients/:id"], "ui": False},
+        "tests/test_api.py::test_login": {"files": [], "routes": ["POST /login"], "ui": False},
+        "tests/test_ui.py::test_dashboard": {"files": [f"{TESTS}/pages/home_page.py"], "routes": [], "ui": True},
+    },
+    "shared_files": [f"{TESTS}/utils/seed_data.py"],
+}
+NODEIDS = [*IMPACT_MAP["tests"], "tests/test_new.py::test_unrecorded"]
+
+
+@pytest.fixture
+def diff(monkeypatch):
+    """Fake `git diff`: set files (and server.js lines) the way the selection reads them."""
+    changes = {"files": [], "lines": set()}
+    monkeypatch.setattr(impact, "changed_files", lambda root, ref: changes["files"])
+    monkeypatch.setattr(impact, "changed_lines", lambda root, ref, path: changes["lines"])
+    return changes
+
+
+def _select(impact_map=IMPACT_MAP):
+    return impact.affected_tests(NODEIDS, impact_map, ROOT, ROOTDIR, "origin/main")
+
+
+def _route_line(key):
+    return min(next(r for r in impact.load_routes() if r.key == key).lines)
+
+
+class TestAffectedTests:
+    def test_no_map_means_full_run(self, diff):
+        assert _select(None)[0] is None
+
+    def test_only_unrecorded_tests_run_for_docs_changes(self, diff):
+        diff["files"] = ["README.md"]
+        assert _select()[0] == {"tests/test_new.py::test_unrecorded"}
+
+    def test_global_file_forces_full_run(self, diff):
+        diff["files"] = [f"{TESTS}/conftest.py"]
+        selected, reason = _select()
+        assert selected is None and "global" in reason
+
+    def test_shared_fixture_file_forces_full_run(self, diff):
+        diff["files"] = [f"{TESTS}/utils/seed_data.py"]
+        selected, reason = _select()
+        assert selected is None and "shared fixture" in reason
+
+    def test_changed_helper_selects_its_users(self, diff):
+        diff["files"] = [f"{TESTS}/pages/home_page.py"]
+        assert _select()[0] == {"tests/test_ui.py::test_dashboard", "tests/test_new.py::test_unrecorded"}
+
+    def test_changed_route_selects_its_callers_and_routeless_tests(self, diff):
+        diff["files"] = [f"{API}/server.js"]
+        diff["lines"] = {_route_line("GET /clients/:id")}
+        assert _select()[0] == {
+            "tests/test_api.py::test_get",
+            "tests/test_ui.py::test_dashboard",
+            "tests/test_new.py::test_unrecorded",
+        }
+
+    def test_other_api_file_selects_every_api_test(self, diff):
+        diff["files"] = [f"{API}/store.js"]
+        assert _select()[0] == set(NODEIDS)
+
+    def test_ui_change_selects_ui_tests(self, diff):
+        diff["files"] = ["TestProduct/UI/src/app/app.component.ts"]
+        assert _select()[0] == {"tests/test_ui.py::test_dashboard", "tests/test_new.py::test_unrecorded"}
+
+    def test_unmapped_file_forces_full_run(self, diff):
+        diff["files"] = ["Dockerfile"]
+        assert _select()[0] is None
+
+
+class TestMergePartials:
+    def test_shard_maps_merge_unchanged(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(impact, "IMPACT_MAP_DIR", tmp_path)
+        entry = IMPACT_MAP["tests"]["tests/test_api.py::test_get"]
+        # What CI copies from each shard: the map.json that shard recorded.
+        for shard, (nodeid, shared) in enumerate([("tests/a.py::t", "utils/x.py"), ("tests/b.py::t", "utils/y.py")]):
+            shard_map = {"version": 1, "tests": {nodeid: entry}, "shared_files": [shared]}
+            (tmp_path / f"partial-shard-{shard}.json").write_text(json.dumps(shard_map), encoding="utf8")
+        merged = json.loads(impact.merge_partials().read_text(encoding="utf8"))
+        assert sorted(merged["tests"]) == ["tests/a.py::t", "tests/b.py::t"]
+        assert merged["shared_files"] == ["utils/x.py", "utils/y.py"]
+        assert list(tmp_path.glob("partial-*.json")) == []
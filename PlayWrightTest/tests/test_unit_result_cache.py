@@ -0,0 +1,43 @@
+import importlib
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from utils import result_cache
+from utils.result_cache import ResultCache
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A tiny project: test_mod imports helper (directly) which imports deep."""
+    (tmp_path / "deep.py").write_text("def base():\n    return 1\n", encoding="utf8")
+    (tmp_path / "helper.py").write_text("from deep import base\n\ndef value():\n    return base()\n", encoding="utf8")
+    (tmp_path / "test_mod.py").write_text("from helper import value\n\ndef test_value():\n    assert value() == 1\n", encoding="utf8")
+    monkeypatch.setattr(result_cache, "PROJECT_DIR", tmp_path.resolve())
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    for name in ("deep", "helper", "test_mod"):
+        sys.modules.pop(name, None)
+
+
+def _key(project):
+    for name in ("deep", "helper", "test_mod"):
+        sys.modules.pop(name, None)
+    module = importlib.import_module("test_mod")
+    item = SimpleNamespace(nodeid="test_mod.py::test_value", path=project / "test_mod.py", module=module)
+    return ResultCache(config=None).key_for(item)
+
+
+class TestKeyFor:
+    def test_stable_without_changes(self, project):
+        assert _key(project) == _key(project)
+
+    @pytest.mark.parametrize("changed", ["helper.py", "deep.py"])
+    def test_changes_with_imported_project_modules(self, project, changed):
+        before = _key(project)
+        path = project / changed
+        path.write_text(path.read_text(encoding="utf8") + "\n# changed\n", encoding="utf8")
+        assert _key(project) != before
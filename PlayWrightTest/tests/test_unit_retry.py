@@ -0,0 +1,51 @@
+import pytest
+
+from utils.retry import classify_failure
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+
+def _excinfo(exc):
+    with pytest.raises(type(exc)) as excinfo:
+        raise exc
+    return excinfo
+
+
+class TestClassifyFailure:
+    def test_no_exception_is_not_infra(self):
+        assert classify_failure(None) is None
+
+    def test_plain_assertion_is_not_infra(self):
+        assert classify_failure(_excinfo(AssertionError("expected 400, got 200"))) is None
+
+    def test_connection_errors_by_type(self):
+        assert classify_failure(_excinfo(ConnectionResetError())) == "ConnectionResetError"
+
+    @pytest.mark.parametrize(
+        "message, reason",
+        [
+            ("read ECONNRESET", "connection reset"),
+            ("Failed to establish a new connection: [Errno 111]", "connection refused"),
+            ("page.goto: net::ERR_CONNECTION_REFUSED at http://localhost:4200/", "browser network error"),
+            ("Target page, context or browser has been closed", "browser crashed"),
+        ],
+    )
+    def test_infra_messages(self, message, reason):
+        assert classify_failure(_excinfo(RuntimeError(message))) == reason
+
+    def test_transport_5xx_is_infra(self):
+        error = RuntimeError("503 Server Error: Service Unavailable for url: http://localhost:3000/clients")
+        assert classify_failure(_excinfo(error)) == "server 5xx"
+
+    def test_asserted_5xx_is_a_product_failure(self):
+        assert classify_failure(_excinfo(AssertionError("status 500 != 201"))) is None
+
+    def test_navigation_timeout_only_during_warmup(self):
+        error = RuntimeError('Timeout 15000ms exceeded.\nnavigating to "http://localhost:4200/"')
+        assert classify_failure(_excinfo(error)) is None
+        assert classify_failure(_excinfo(error), warmup=True) == "navigation timeout during warmup"
+
+    def test_skip_and_xfail_are_not_infra(self):
+        with pytest.raises(pytest.skip.Exception) as excinfo:
+            pytest.skip("Connection refused")
+        assert classify_failure(excinfo) is None
@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils.run_history import accumulate, connect, flake_scores, new_result, quarantined, record_run
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+
+def _report(when="call", outcome="passed", duration=0.5, user_properties=(), **extra):
+    return SimpleNamespace(
+        when=when,
+        duration=duration,
+        failed=outcome == "failed",
+        skipped=outcome == "skipped",
+        user_properties=list(user_properties),
+        **extra,
+    )
+
+
+def _fold(*reports):
+    entry = new_result()
+    for report in reports:
+        accumulate(entry, report)
+    return entry
+
+
+@pytest.fixture
+def conn(tmp_path):
+    with connect(tmp_path / "history.db") as conn:
+        yield conn
+
+
+def _record(conn, outcomes):
+    """One run per element of `outcomes` ({nodeid: outcome or (outcome, retries)})."""
+    for i, results in enumerate(outcomes):
+        rows = {}
+        for nodeid, outcome in results.items():
+            outcome, retries = outcome if isinstance(outcome, tuple) else (outcome, 0)
+            rows[nodeid] = dict(new_result(), outcome=outcome, retries=retries)
+        record_run(conn, (f"run{i}", float(i), float(i), None, "all", 0), rows, [], {})
+
+
+class TestAccumulate:
+    def test_passing_phases_add_up(self):
+        entry = _fold(_report("setup", duration=0.25), _report("call"), _report("teardown", duration=0.25))
+        assert entry["outcome"] == "passed" and entry["duration"] == 1.0
+
+    def test_any_failed_phase_fails_the_test(self):
+        assert _fold(_report("setup"), _report("call"), _report("teardown", "failed"))["outcome"] == "failed"
+
+    def test_skip_is_kept_unless_something_failed(self):
+        assert _fold(_report("setup", "skipped"), _report("teardown"))["outcome"] == "skipped"
+
+    def test_xfailed_quarantined_call_counts_as_failure(self):
+        xfailed = _report("call", "skipped", wasxfail="quarantined (flake score 0.40)")
+        assert _fold(_report("setup"), xfailed)["outcome"] == "failed"
+        assert _fold(_report("setup"), _report("call", wasxfail="quarantined"))["outcome"] == "passed"
+
+    def test_other_xfails_are_their_own_outcome(self):
+        known_bug = _report("call", "skipped", wasxfail="known server bugs: dob: not a calendar date")
+        assert _fold(_report("setup"), known_bug, _report("teardown"))["outcome"] == "xfailed"
+        assert _fold(_report("setup"), _report("call", wasxfail="known bug"))["outcome"] == "xpassed"
+
+    def test_result_cache_hit_is_neutral(self):
+        hit = _report("setup", "skipped", user_properties=[("result_cache", "hit")])
+        assert _fold(hit)["outcome"] == "cached"
+
+    def test_keeps_the_most_infra_retries(self):
+        entry = _fold(_report(user_properties=[("infra_retries", 2)]), _report("teardown"))
+        assert entry["retries"] == 2
+
+
+class TestFlakeScores:
+    def test_stable_tests_score_zero(self, conn):
+        _record(conn, [{"a": "passed", "b": "failed"}] * 4)
+        assert flake_scores(conn) == {"a": (0.0, 4), "b": (0.0, 4)}
+
+    def test_every_flip_counts(self, conn):
+        _record(conn, [{"a": o} for o in ("passed", "failed", "passed", "failed", "passed")])
+        assert flake_scores(conn)["a"] == (1.0, 5)
+
+    def test_passes_after_retries_count(self, conn):
+        _record(conn, [{"a": "passed"}, {"a": ("passed", 1)}, {"a": "passed"}])
+        assert flake_scores(conn)["a"] == (0.5, 3)
+
+    def test_skipped_and_cached_runs_are_ignored(self, conn):
+        _record(conn, [{"a": o} for o in ("passed", "skipped", "cached", "passed")])
+        assert flake_scores(conn)["a"] == (0.0, 2)
+
+    def test_expected_failures_are_ignored(self, conn):
+        _record(conn, [{"a": o} for o in ("xfailed", "xfailed", "xpassed", "xfailed")])
+        assert "a" not in flake_scores(conn)
+        assert quarantined(conn, threshold=0.1, min_runs=1) == {}
+
+    def test_only_the_window_is_scored(self, conn):
+        _record(conn, [{"a": o} for o in ("failed", "passed", "passed", "passed")])
+        assert flake_scores(conn, window=3)["a"] == (0.0, 3)
+
+    def test_quarantine_needs_enough_runs_and_score(self, conn):
+        _record(conn, [{"a": o, "b": o} for o in ("passed", "failed", "passed")] + [{"a": "failed"}])
+        assert quarantined(conn, threshold=0.5, min_runs=4) == {"a": 1.0}
@@ -0,0 +1,55 @@
+import pytest
+
+from utils.sharding import assign, parse_shard
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+
+def _loads(assignment, durations, count):
+    loads = dict.fromkeys(range(1, count + 1), 0.0)
+    for nodeid, shard in assignment.items():
+        loads[shard] += durations[nodeid]
+    return loads
+
+
+class TestAssign:
+    def test_every_test_gets_exactly_one_shard(self):
+        nodeids = [f"t{i}" for i in range(10)]
+        assignment = assign(nodeids, {}, 3)
+        assert sorted(assignment) == nodeids
+        assert set(assignment.values()) == {1, 2, 3}
+
+    def test_slowest_tests_are_spread_first(self):
+        durations = {"a": 10.0, "b": 9.0, "c": 1.0, "d": 1.0}
+        assignment = assign(list(durations), durations, 2)
+        assert assignment["a"] != assignment["b"]
+        assert _loads(assignment, durations, 2) == {1: 11.0, 2: 10.0}
+
+    def test_balances_skewed_durations(self):
+        durations = {f"t{i}": float(d) for i, d in enumerate([8, 7, 6, 5, 4, 3, 2, 1])}
+        # 36 s over 3 shards: the greedy partition stays within a test of the ideal 12 s each.
+        assert _loads(assign(list(durations), durations, 3), durations, 3) == {1: 13.0, 2: 12.0, 3: 11.0}
+
+    def test_independent_of_collection_order(self):
+        durations = {"a": 3.0, "b": 2.0, "c": 2.0, "d": 1.0, "e": 1.0}
+        nodeids = list(durations)
+        assert assign(nodeids, durations, 2) == assign(nodeids[::-1], durations, 2)
+
+    def test_unknown_tests_weigh_the_median(self):
+        durations = {"a": 1.0, "b": 2.0, "c": 30.0}
+        assignment = assign(["a", "b", "c", "new"], durations, 2)
+        # "new" weighs 2 s, so it goes with the fast tests rather than the 30 s one.
+        assert assignment["new"] != assignment["c"]
+
+    def test_single_shard_takes_everything(self):
+        assert set(assign(["a", "b"], {}, 1).values()) == {1}
+
+
+class TestParseShard:
+    def test_parses_index_and_count(self):
+        assert parse_shard("2/4") == (2, 4)
+
+    @pytest.mark.parametrize("value", ["0/2", "3/2", "1/0", "2", "a/b"])
+    def test_rejects_bad_values(self, value):
+        with pytest.raises(pytest.UsageError):
+            parse_shard(value)
@@ -0,0 +1,75 @@
+import pytest
+
+from utils.soak import analyze, linear_fit
+from utils.stats import percentile
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+
+def _sample(t, p95=100.0, token_kb=4.0, server_mb=80.0, unexpected=(), expiry=()):
+    return {
+        "t": t,
+        "routes": {"GET /clients": {"n": 10, "p50": p95 / 2, "p95": p95, "p99": p95, "errors": 0}},
+        "files": {"token.json": token_kb * 1024, "data.json": None},
+        "rss_mb": {"server": server_mb},
+        "expected_auth": 0,
+        "unexpected_auth": list(unexpected),
+        "expiry_checks": list(expiry),
+    }
+
+
+def _trend(report, series):
+    return next(t for t in report["trends"] if t["series"] == series)
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert [percentile(values, p) for p in (0, 50, 95, 99, 100)] == [1, 50, 95, 99, 100]
+
+    def test_single_value(self):
+        assert percentile([7.5], 99) == 7.5
+
+
+class TestLinearFit:
+    def test_exact_line(self):
+        assert linear_fit([0, 1, 2, 3], [1, 3, 5, 7]) == (2.0, 1.0, 1.0)
+
+    def test_flat_series_has_no_slope(self):
+        assert linear_fit([0, 1, 2], [4, 4, 4]) == (0.0, 4.0, 0.0)
+
+    def test_single_x_is_not_a_trend(self):
+        assert linear_fit([1, 1], [2, 4]) == (0.0, 3.0, 0.0)
+
+    def test_noise_lowers_r2(self):
+        _, _, r2 = linear_fit([0, 1, 2, 3, 4, 5], [1, 5, 2, 6, 3, 7])
+        assert 0 < r2 < 0.8
+
+
+class TestAnalyze:
+    def test_growing_file_is_flagged_and_stable_latency_is_not(self):
+        samples = [_sample(600 * i, token_kb=4 + 2 * i) for i in range(8)]
+        report = analyze(samples, min_windows=6)
+        assert _trend(report, "size token.json")["flagged"]
+        assert not _trend(report, "p95 GET /clients")["flagged"]
+        assert report["flags"] == ["size token.json grows +12.0 KB/h (r² 1.0)"]
+
+    def test_first_window_is_warm_up(self):
+        samples = [_sample(0, p95=900.0)] + [_sample(600 * i) for i in range(1, 8)]
+        trend = _trend(analyze(samples, min_windows=6), "p95 GET /clients")
+        assert trend["windows"] == 7 and trend["per_hour"] == 0.0
+
+    def test_short_series_are_not_fitted(self):
+        assert analyze([_sample(600 * i) for i in range(4)], min_windows=6)["trends"] == []
+
+    def test_missing_files_are_skipped(self):
+        report = analyze([_sample(600 * i) for i in range(8)], min_windows=6)
+        assert all(t["series"] != "size data.json" for t in report["trends"])
+
+    def test_auth_problems_are_flagged(self):
+        samples = [_sample(0), _sample(600, unexpected=[{"route": "GET /clients", "status": 401}])]
+        samples.append(_sample(1200, expiry=[{"idle_s": 1900.0, "status": 200, "ok": False}]))
+        report = analyze(samples, min_windows=6)
+        assert report["unexpected_auth"] == [{"route": "GET /clients", "status": 401, "t": 600}]
+        assert report["flags"][-1] == "token still accepted after 1900 s idle (status 200)"
+        assert report["calls"] == 30 and report["windows"] == 3
@@ -0,0 +1,89 @@
+import pytest
+
+from utils.timeouts import DEFAULT_TIMEOUTS_MS, TimeoutManager
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+
+def _manager(tmp_path, **kwargs):
+    options = dict(enabled=True, safety_factor=2.0, min_samples=5, window=100, floor_ms=1000, max_multiplier=2.0)
+    return TimeoutManager(tmp_path / "latency", **{**options, **kwargs})
+
+
+def _observe(manager, op, samples):
+    for ms in samples:
+        manager.record(op, ms)
+
+
+class TestGet:
+    def test_default_until_enough_samples(self, tmp_path):
+        manager = _manager(tmp_path)
+        _observe(manager, "navigation", [3000] * 4)
+        assert manager.get("navigation") == DEFAULT_TIMEOUTS_MS["navigation"]
+
+    def test_p99_times_safety_factor(self, tmp_path):
+        manager = _manager(tmp_path)
+        _observe(manager, "navigation", list(range(1000, 4000, 30)))
+        assert manager.p99("navigation") == 3940
+        assert manager.get("navigation") == 7880
+
+    def test_clamped_to_floor(self, tmp_path):
+        manager = _manager(tmp_path)
+        _observe(manager, "snackbar", [50] * 10)
+        assert manager.get("snackbar") == 1000
+
+    def test_clamped_to_default_times_max_multiplier(self, tmp_path):
+        manager = _manager(tmp_path)
+        _observe(manager, "snackbar", [60000] * 10)
+        assert manager.get("snackbar") == DEFAULT_TIMEOUTS_MS["snackbar"] * 2
+
+    def test_explicit_default_for_unknown_ops(self, tmp_path):
+        manager = _manager(tmp_path)
+        assert manager.get("custom", default=1234) == 1234
+        assert manager.get("custom") == 10000
+
+    def test_disabled_always_uses_the_default(self, tmp_path):
+        manager = _manager(tmp_path, enabled=False)
+        _observe(manager, "navigation", [100] * 10)
+        assert manager.get("navigation") == DEFAULT_TIMEOUTS_MS["navigation"]
+
+    def test_new_samples_invalidate_the_cached_value(self, tmp_path):
+        manager = _manager(tmp_path)
+        _observe(manager, "navigation", [2000] * 10)
+        first = manager.get("navigation")
+        _observe(manager, "navigation", [5000] * 10)
+        assert manager.get("navigation") > first
+
+    def test_only_the_window_counts(self, tmp_path):
+        manager = _manager(tmp_path, window=10)
+        _observe(manager, "navigation", [9000] * 10 + [2000] * 10)
+        assert manager.p99("navigation") == 2000
+
+
+class TestPersistence:
+    def test_each_worker_writes_its_own_file(self, tmp_path, monkeypatch):
+        for worker, ms in (("gw0", 2000), ("gw1", 3000)):
+            monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+            manager = _manager(tmp_path)
+            _observe(manager, "navigation", [ms] * 3)
+            manager.save()
+        assert sorted(p.name for p in (tmp_path / "latency").iterdir()) == ["latency-gw0.json", "latency-gw1.json"]
+
+    def test_load_merges_every_worker(self, tmp_path, monkeypatch):
+        for worker, ms in (("gw0", 2000), ("gw1", 3000)):
+            monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+            manager = _manager(tmp_path)
+            _observe(manager, "navigation", [ms] * 3)
+            manager.save()
+        merged = _manager(tmp_path)
+        assert merged.p99("navigation") == 3000 and len(merged._samples["navigation"]) == 6
+
+    def test_save_appends_to_earlier_runs_within_the_window(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+        for ms in (1000, 2000):
+            manager = _manager(tmp_path, window=4)
+            _observe(manager, "navigation", [ms] * 3)
+            manager.save()
+        reloaded = _manager(tmp_path, window=4)
+        reloaded.load()
+        assert list(reloaded._samples["navigation"]) == [1000, 2000, 2000, 2000]
@@ -0,0 +1,75 @@
+import io
+import warnings
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils import visual
+from utils.visual import MissingBaselineWarning, VisualChecker, dhash
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+
+def _gradient(width, height):
+    """Grayscale image getting brighter from left to right."""
+    row = np.linspace(0, 255, width, dtype=np.uint8)
+    return Image.fromarray(np.tile(row, (height, 1)), "L").convert("RGB")
+
+
+class _Locator:
+    """Stands in for a Playwright Locator whose screenshot is `image`."""
+
+    def __init__(self, image):
+        self.image = image
+        browser = SimpleNamespace(browser_type=SimpleNamespace(name="chromium"))
+        self.page = SimpleNamespace(context=SimpleNamespace(browser=browser))
+
+    def screenshot(self, **_):
+        out = io.BytesIO()
+        self.image.save(out, format="PNG")
+        return out.getvalue()
+
+
+class TestDhash:
+    def test_is_64_bits(self):
+        assert 0 <= dhash(_gradient(300, 200)) < 2 ** 64
+
+    def test_flat_image_has_no_gradients(self):
+        assert dhash(Image.new("RGB", (120, 80), "white")) == 0
+
+    def test_left_to_right_gradient_sets_every_bit(self):
+        assert dhash(_gradient(300, 200)) == 2 ** 64 - 1
+
+    def test_ignores_scale(self):
+        assert dhash(_gradient(300, 200)) == dhash(_gradient(900, 600))
+
+    def test_same_pixels_same_hash(self):
+        image = _gradient(300, 200)
+        assert dhash(image) == dhash(image.copy())
+
+    def test_content_change_changes_hash(self):
+        image = Image.new("RGB", (160, 160), "white")
+        changed = image.copy()
+        changed.paste((0, 0, 0), (60, 60, 100, 100))
+        assert dhash(image) != dhash(changed)
+
+
+class TestMissingBaseline:
+    def test_recorded_when_allowed(self, tmp_path):
+        checker = VisualChecker(tmp_path / "baselines", record_missing=True)
+        checker.check(_Locator(_gradient(60, 40)), "toolbar")
+        assert len(list((tmp_path / "baselines" / "index").glob("toolbar.chromium.*.json"))) == 1
+
+    def test_saved_for_approval_without_failing(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(visual, "ARTIFACTS_DIR", tmp_path / "artifacts")
+        checker = VisualChecker(tmp_path / "baselines", record_missing=False)
+        with pytest.warns(MissingBaselineWarning):
+            checker.check(_Locator(_gradient(60, 40)), "toolbar")
+        assert not (tmp_path / "baselines").exists()
+        # Approving = copying the pending tree into the baselines; the next check then passes.
+        approved = VisualChecker(tmp_path / "artifacts" / "visual" / "new", record_missing=False)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", MissingBaselineWarning)
+            approved.check(_Locator(_gradient(60, 40)), "toolbar")
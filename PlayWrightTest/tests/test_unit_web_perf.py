@@ -0,0 +1,58 @@
+import pytest
+
+from utils import web_perf
+from utils.web_perf import record_run, summarize
+
+pytestmark = [pytest.mark.unit, pytest.mark.deterministic]
+
+BUDGETS = {"dashboard": {"lcp_ms": 2500, "total_blocking_ms": 300}}
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    monkeypatch.setattr(web_perf, "WEBPERF_WINDOW", 3)
+    monkeypatch.setattr(web_perf, "WEBPERF_REGRESSION_RATIO", 1.25)
+    return tmp_path / "webperf" / "history.jsonl"
+
+
+def _run(history, lcp_ms, **metrics):
+    """Summarise and record one run of three dashboard loads around `lcp_ms`."""
+    loads = {"dashboard": [dict(metrics, lcp_ms=lcp_ms + delta) for delta in (-10, 0, 10)]}
+    summary = summarize(loads, BUDGETS, history)
+    record_run(summary, "abc123", history)
+    return summary["dashboard"]
+
+
+class TestSummarize:
+    def test_medians_per_page(self, history):
+        loads = {
+            "dashboard": [{"lcp_ms": 900, "resources": 20}, {"lcp_ms": 1100, "resources": None}, {"lcp_ms": 1000}],
+            "login": [{"ttfb_ms": 40}],
+        }
+        summary = summarize(loads, BUDGETS, history)
+        assert summary["dashboard"]["medians"] == {"lcp_ms": 1000, "resources": 20}
+        assert summary["dashboard"]["loads"] == 3
+        assert summary["login"] == {"loads": 1, "medians": {"ttfb_ms": 40}, "previous": {}, "regressed": {}}
+
+    def test_first_run_has_nothing_to_compare(self, history):
+        assert _run(history, 1000)["regressed"] == {}
+
+    def test_budgeted_metric_slower_than_previous_runs_regresses(self, history):
+        for lcp in (1000, 1100, 1000):
+            _run(history, lcp)
+        dashboard = _run(history, 1500)
+        assert dashboard["previous"]["lcp_ms"] == 1000
+        assert dashboard["regressed"] == {"lcp_ms": [1000, 1500]}
+
+    def test_small_absolute_changes_are_ignored(self, history):
+        _run(history, 1000, total_blocking_ms=3)
+        assert _run(history, 1000, total_blocking_ms=20)["regressed"] == {}
+
+    def test_unbudgeted_metrics_are_not_compared(self, history):
+        _run(history, 1000, resources=20)
+        assert _run(history, 1000, resources=60)["regressed"] == {}
+
+    def test_only_the_window_of_previous_runs_counts(self, history):
+        for lcp in (3000, 3000, 3000, 1000, 1000, 1000):
+            _run(history, lcp)
+        assert _run(history, 1200)["previous"]["lcp_ms"] == 1000
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Callable, List
+
+from playwright.sync_api import APIRequestContext, APIResponse
+
+# listener(method, url, response, elapsed_ms) is called after every completed request.
+RequestListener = Callable[[str, str, APIResponse, float], None]
+
+
+class BufferedAPIResponse:
+    """APIResponse whose body is fetched from the driver at most once.
+
+    Listeners (contract validation, the entity registry) and the test itself read the
+    same body, so checking every response does not add a round trip per reader.
+    """
+
+    def __init__(self, response: APIResponse) -> None:
+        self._response = response
+        self._body: Any = None
+
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = self._response.body()
+        return self._body
+
+    def text(self) -> str:
+        return self.body().decode("utf8")
+
+    def json(self) -> Any:
+        return json.loads(self.body())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+
+class InstrumentedAPIRequestContext:
+    """Drop-in wrapper around APIRequestContext that notifies listeners after each call.
+
+    Only the request methods are intercepted; everything else (dispose, storage_state, ...)
+    is forwarded untouched. Responses are returned as BufferedAPIResponse. With no
+    listeners registered the overhead is one perf_counter pair per request.
+    """
+
+    def __init__(self, context: APIRequestContext) -> None:
+        self._context = context
+        self.listeners: List[RequestListener] = []
+
+    def _send(self, method: str, send: Callable[..., APIResponse], url: str, **kwargs: Any) -> BufferedAPIResponse:
+        start = time.perf_counter()
+        response = BufferedAPIResponse(send(url, **kwargs))
+        if self.listeners:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for listener in self.listeners:
+                listener(method, response.url, response, elapsed_ms)
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> BufferedAPIResponse:
+        return self._send("GET", self._context.get, url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> BufferedAPIResponse:
+        return self._send("POST", self._context.post, url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> BufferedAPIResponse:
+        return self._send("PUT", self._context.put, url, **kwargs)
+
+    def patch(self, url: str, **kwargs: Any) -> BufferedAPIResponse:
+        return self._send("PATCH", self._context.patch, url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> BufferedAPIResponse:
+        return self._send("DELETE", self._context.delete, url, **kwargs)
+
+    def head(self, url: str, **kwargs: Any) -> BufferedAPIResponse:
+        return self._send("HEAD", self._context.head, url, **kwargs)
+
+    def fetch(self, url_or_request: Any, **kwargs: Any) -> BufferedAPIResponse:
+        method = (kwargs.get("method") or "GET").upper()
+        return self._send(method, self._context.fetch, url_or_request, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._context, name)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from playwright.sync_api import APIResponse
+
+from utils.impact import load_routes, route_for
+from utils.stats import percentile
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class ApiProfiler:
+    """Per-request latency recorder for the instrumented api_context.
+
+    `on_request` is registered as an InstrumentedAPIRequestContext listener. It only
+    resolves the route template (memoised per method/path) and appends a tuple; response
+    size comes from the Content-Length header so the body is never fetched.
+    """
+
+    def __init__(self) -> None:
+        self.routes = load_routes()
+        self._templates: Dict[Tuple[str, str], str] = {}
+        self.current: List[tuple] = []
+        self.samples: List[tuple] = []  # (route, status, bytes, ms) for the whole session
+
+    def start_test(self) -> None:
+        self.current = []
+
+    def route_template(self, method: str, url: str) -> str:
+        path = urlparse(url).path
+        key = (method, path)
+        template = self._templates.get(key)
+        if template is None:
+            template = route_for(method, url, self.routes) or f"{method} {_ID_SEGMENT.sub('/:id', path)}"
+            self._templates[key] = template
+        return template
+
+    def on_request(self, method: str, url: str, response: APIResponse, elapsed_ms: float) -> None:
+        size = int(response.headers.get("content-length") or 0)
+        sample = (self.route_template(method, url), response.status, size, elapsed_ms)
+        self.current.append(sample)
+        self.samples.append(sample)
+
+    # ---------- per-test ----------
+    def test_totals(self) -> Dict[str, float]:
+        return {
+            "api_calls": len(self.current),
+            "api_time_ms": round(sum(s[3] for s in self.current), 1),
+            "api_bytes": sum(s[2] for s in self.current),
+        }
+
+    def test_table_html(self) -> str:
+        rows = "".join(
+            f"<tr><td>{route}</td><td>{status}</td><td>{size}</td><td>{ms:.1f}</td></tr>"
+            for route, status, size, ms in self.current
+        )
+        totals = self.test_totals()
+        return (
+            '<div style="margin: 10px 0;"><h4 style="margin-bottom: 5px;">API Calls '
+            f"({totals['api_calls']} calls, {totals['api_time_ms']} ms)</h4>"
+            '<table style="border-collapse: collapse; font-size: 13px;">'
+            "<tr><th>Route</th><th>Status</th><th>Bytes</th><th>ms</th></tr>"
+            f"{rows}</table></div>"
+        )
+
+    # ---------- session ----------
+    def dump_samples(self, out_dir: Path) -> None:
+        """Write raw samples for this worker; the controller merges them in `summarize`."""
+        if not self.samples:
+            return
+        out_dir.mkdir(parents=True, exist_ok=True)
+        worker = os.getenv("PYTEST_XDIST_WORKER", "master")
+        (out_dir / f"api-samples-{worker}.json").write_text(json.dumps(self.samples), encoding="utf8")
+
+
+def summarize(out_dir: Path) -> Optional[List[dict]]:
+    """Merge per-worker samples into api-latency.json, slowest p95 first."""
+    by_route: Dict[str, List[tuple]] = defaultdict(list)
+    partials = sorted(out_dir.glob("api-samples-*.json")) if out_dir.exists() else []
+    if not partials:
+        return None
+    for partial in partials:
+        for route, status, size, ms in json.loads(partial.read_text(encoding="utf8")):
+            by_route[route].append((status, size, ms))
+        partial.unlink()
+
+    summary = []
+    for route, samples in by_route.items():
+        latencies = [s[2] for s in samples]
+        summary.append({
+            "route": route,
+            "calls": len(samples),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "max_ms": round(max(latencies), 1),
+            "total_ms": round(sum(latencies), 1),
+            "bytes": sum(s[1] for s in samples),
+            "errors": sum(1 for s in samples if s[0] >= 500),
+        })
+    summary.sort(key=lambda r: r["p95_ms"], reverse=True)
+    (out_dir / "api-latency.json").write_text(json.dumps(summary, indent=2), encoding="utf8")
+    return summary
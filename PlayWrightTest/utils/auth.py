@@ -7,7 +7,7 @@ from typing import Optional
 
 from playwright.sync_api import APIRequestContext, Playwright
 
-from config.settings import AUTH_COOKIE_NAME, COOKIE_DOMAIN, API_USERNAME, API_PASSWORD
+from config.settings import AUTH_COOKIE_NAME, COOKIE_DOMAIN, API_USERNAME, API_PASSWORD, BASE_URL, LOGIN_API_PATH
 
 
 def _env_creds() -> tuple[Optional[str], Optional[str]]:
@@ -47,6 +47,23 @@ def _post_json(request_context: APIRequestContext, path: str, payload: dict):
     return request_context.post(path, data=json.dumps(payload), headers={"Content-Type": "application/json"})
 
 
+def fetch_api_token(playwright: Playwright, base_url: Optional[str] = None) -> str:
+    """Log in via `POST /login` and return the JWT. Raises RuntimeError on failure."""
+    request_context = playwright.request.new_context(base_url=base_url or BASE_URL)
+    try:
+        response = _post_json(request_context, LOGIN_API_PATH, {"username": API_USERNAME, "password": API_PASSWORD})
+        if not response.ok:
+            raise RuntimeError(f"Failed to get API token: {response.status} {response.text()}")
+
+        data = response.json()
+        token = data.get("token") or data.get("access_token")
+        if not token:
+            raise RuntimeError("No token found in login response")
+        return token
+    finally:
+        request_context.dispose()
+
+
 def create_authenticated_storage_state(
     *,
     playwright: Playwright,
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Iterable, List, Optional, Pattern
+
+from playwright.sync_api import ConsoleMessage, Page, Request, Response
+
+from config.settings import BROWSER_EVENT_BUFFER_SIZE, BROWSER_EVENT_LEVELS, BROWSER_EVENT_URL_PATTERN
+
+# Playwright console types normalised onto the levels used for filtering.
+_CONSOLE_LEVELS = {"error": "error", "assert": "error", "warning": "warning", "log": "info", "info": "info", "debug": "debug"}
+
+
+class BrowserEventRecorder:
+    """Record console, page-error and network events for one page into a bounded ring buffer.
+
+    Handlers only filter and append a small tuple; nothing is formatted or written until the
+    test fails and `to_records()` is called. Oldest events are dropped once `capacity` is hit.
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        *,
+        capacity: int = BROWSER_EVENT_BUFFER_SIZE,
+        levels: Iterable[str] = BROWSER_EVENT_LEVELS,
+        url_pattern: Optional[str] = BROWSER_EVENT_URL_PATTERN,
+    ) -> None:
+        self.page = page
+        self.levels = frozenset(levels)
+        self.url_re: Optional[Pattern[str]] = re.compile(url_pattern) if url_pattern else None
+        self.events: Deque[tuple] = deque(maxlen=capacity)
+        self.dropped = 0
+        page.on("console", self._on_console)
+        page.on("pageerror", self._on_pageerror)
+        page.on("requestfailed", self._on_requestfailed)
+        page.on("response", self._on_response)
+
+    def _append(self, event: tuple) -> None:
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append(event)
+
+    def _url_ok(self, url: str) -> bool:
+        return self.url_re is None or self.url_re.search(url) is not None
+
+    # ---------- handlers (hot path: keep cheap) ----------
+    def _on_console(self, msg: ConsoleMessage) -> None:
+        level = _CONSOLE_LEVELS.get(msg.type, "info")
+        if level in self.levels:
+            self._append((time.time(), "console", level, msg.text, msg.location.get("url", "")))
+
+    def _on_pageerror(self, error: Exception) -> None:
+        if "error" in self.levels:
+            self._append((time.time(), "pageerror", "error", str(error), self.page.url))
+
+    def _on_requestfailed(self, request: Request) -> None:
+        if "error" in self.levels and self._url_ok(request.url):
+            self._append((time.time(), "requestfailed", "error", f"{request.method} {request.failure}", request.url))
+
+    def _on_response(self, response: Response) -> None:
+        status = response.status
+        level = "error" if status >= 500 else "warning" if status >= 400 else "info"
+        if level in self.levels and self._url_ok(response.url):
+            self._append((time.time(), "response", level, f"{response.request.method} {status}", response.url))
+
+    # ---------- output ----------
+    def to_records(self, **context) -> List[dict]:
+        """Structured records (one dict per event) with any extra context merged in."""
+        return [
+            {"ts": ts, "kind": kind, "level": level, "message": message, "url": url, **context}
+            for ts, kind, level, message, url in self.events
+        ]
+
+    def to_jsonl(self, **context) -> str:
+        return "\n".join(json.dumps(r) for r in self.to_records(**context))
+
+    def append_to(self, path: Path, **context) -> None:
+        """Append the buffer as JSON lines to `path` (shared across runs for searching)."""
+        if not self.events:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf8") as fh:
+            fh.write(self.to_jsonl(**context) + "\n")
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Set
+
+from playwright.sync_api import Browser, BrowserContext
+
+from config.settings import BROWSER_RECYCLE_TESTS, MEMORY_RECYCLE_MB
+from utils.memory import child_pids, psutil, tree_rss
+
+
+class BrowserManager:
+    """Owns the worker's session browser: relaunches it after a crash and recycles it.
+
+    Behaves like a Browser for its callers (`new_context`, `version`, ... are forwarded to
+    the current instance), so fixtures keep calling `session_browser.new_context(...)`.
+
+    - A `disconnected` event (crash, killed process) marks the browser dead; the next access
+      launches a new one instead of failing every remaining test on the worker.
+    - `test_finished()` is called between tests. After `recycle_every` tests, or once the
+      session browser's process tree exceeds `recycle_mb` of RSS, the browser is closed
+      while no context is open and relaunched on next use. The tree is the processes the
+      launch started (and their renderers), so the Playwright driver and other browsers of
+      the worker do not count.
+    - `relaunch_listeners` are called with the new Browser after every relaunch, so
+      anything holding contexts (pools, runners) can re-create them from storageState.
+    """
+
+    def __init__(
+        self,
+        launcher: Callable[[], Browser],
+        *,
+        recycle_every: int = BROWSER_RECYCLE_TESTS,
+        recycle_mb: float = MEMORY_RECYCLE_MB,
+    ) -> None:
+        self._launcher = launcher
+        self.recycle_every = recycle_every
+        self.recycle_mb = recycle_mb if psutil is not None else 0
+        self.relaunch_listeners: List[Callable[[Browser], None]] = []
+        self.stats: Dict[str, int] = {"launches": 0, "crashes": 0, "recycles": 0}
+        self._browser: Optional[Browser] = None
+        self._dead = False
+        self._closing = False
+        self._tests_since_launch = 0
+        self._recycle_reason: Optional[str] = None
+        self._contexts: Set[BrowserContext] = set()
+        self._browser_pids: Set[int] = set()
+
+    # ---------- lifecycle ----------
+    @property
+    def browser(self) -> Browser:
+        if self._browser is None or self._dead or not self._browser.is_connected():
+            self._launch()
+        return self._browser
+
+    def _launch(self) -> None:
+        relaunch = self.stats["launches"] > 0
+        before = child_pids() if self.recycle_mb else set()
+        self._browser = self._launcher()
+        if self.recycle_mb:
+            # Sync Playwright does not expose the browser pid: take what the launch started.
+            self._browser_pids = child_pids() - before
+        self._browser.on("disconnected", self._on_disconnected)
+        self._dead = False
+        self._tests_since_launch = 0
+        self._contexts.clear()
+        self.stats["launches"] += 1
+        if relaunch:
+            for listener in self.relaunch_listeners:
+                listener(self._browser)
+
+    def _on_disconnected(self, browser: Browser) -> None:
+        if browser is self._browser and not self._closing:
+            self._dead = True
+            self.stats["crashes"] += 1
+
+    def _close_browser(self) -> None:
+        if self._browser is None:
+            return
+        self._closing = True
+        try:
+            if self._browser.is_connected():
+                self._browser.close()
+        finally:
+            self._closing = False
+            self._browser = None
+            self._browser_pids = set()
+
+    def new_context(self, **kwargs) -> BrowserContext:
+        context = self.browser.new_context(**kwargs)
+        self._contexts.add(context)
+        context.on("close", lambda ctx: self._contexts.discard(ctx))
+        return context
+
+    # ---------- recycling ----------
+    def request_recycle(self, reason: str) -> None:
+        self._recycle_reason = self._recycle_reason or reason
+
+    def test_finished(self) -> Optional[str]:
+        """Count a finished test and recycle if due. Returns the recycle reason, if any."""
+        if self._browser is None:
+            return None
+        self._tests_since_launch += 1
+        if self.recycle_every and self._tests_since_launch >= self.recycle_every:
+            self.request_recycle(f"{self._tests_since_launch} tests")
+        if self.recycle_mb and self._browser_pids:
+            browser_mb = tree_rss(self._browser_pids)
+            if browser_mb > self.recycle_mb:
+                self.request_recycle(f"{browser_mb:.0f} MB")
+        reason = self._recycle_reason
+        if reason is None or self._contexts:
+            return None  # contexts still open (e.g. a module-scoped one): try after the next test
+        self._recycle_reason = None
+        self._close_browser()
+        self.stats["recycles"] += 1
+        return reason
+
+    def close(self) -> None:
+        self._close_browser()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.browser, name)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import pytest
+
+from config.settings import ARTIFACTS_DIR
+
+# Relative per-test cost used until a run has recorded real numbers.
+DEFAULT_ENGINE_WEIGHTS = {"chromium": 1.0, "firefox": 1.3, "webkit": 1.5}
+TIMINGS_FILE = ARTIFACTS_DIR / "engine-timings.json"
+
+
+def engine_of(item: pytest.Item) -> Optional[str]:
+    """Engine a test is parametrized with (pytest-playwright's `browser_name`), if any."""
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("browser_name") if callspec is not None else None
+
+
+def load_engine_weights() -> Dict[str, float]:
+    """Recorded mean seconds per test; engines without a record get a scaled default."""
+    recorded: Dict[str, float] = {}
+    if TIMINGS_FILE.exists():
+        try:
+            recorded = json.loads(TIMINGS_FILE.read_text(encoding="utf8"))
+        except ValueError:
+            pass
+    known = [e for e in recorded if e in DEFAULT_ENGINE_WEIGHTS]
+    scale = sum(recorded[e] for e in known) / sum(DEFAULT_ENGINE_WEIGHTS[e] for e in known) if known else 1.0
+    weights = {e: w * scale for e, w in DEFAULT_ENGINE_WEIGHTS.items()}
+    weights.update(recorded)
+    return weights
+
+
+class BrowserMatrix:
+    """pytest plugin for runs with several `--browser` engines.
+
+    UI tests are parametrized per engine by pytest-playwright (session_browser requests
+    `browser_name`); auth storageState and API fixtures do not depend on the engine, so
+    all engines share them. This plugin:
+
+    - orders the engine groups slowest first (mean test duration from the previous run), so
+      under xdist the slow engine starts early and faster engines fill in at the end; tests
+      with a pytest-order `order` marker keep their place,
+    - tags every report with its engine and adds an Engine column to the HTML report,
+    - prints per-engine outcomes and timings, and persists the means for the next run.
+    """
+
+    def __init__(self, engines: List[str]) -> None:
+        self.engines = engines
+        self.weights = load_engine_weights()
+        self.results: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.durations: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items: list) -> None:
+        # trylast: after pytest has grouped tests by the session-scoped engine parameter.
+        # A stable sort keeps that grouping; engine-less (API) tests go last. Tests placed by
+        # pytest-order (`order` marker) keep their positions; only the others are regrouped
+        # into the remaining slots.
+        order = {e: -self.weights.get(e, 1.0) for e in self.engines}
+        free = [i for i, item in enumerate(items) if item.get_closest_marker("order") is None]
+        regrouped = sorted((items[i] for i in free), key=lambda item: order.get(engine_of(item), 0.0))
+        for i, item in zip(free, regrouped):
+            items[i] = item
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call):
+        outcome = yield
+        engine = engine_of(item)
+        if engine is not None:
+            outcome.get_result().user_properties.append(("browser_engine", engine))
+
+    def pytest_runtest_logreport(self, report) -> None:
+        engine = dict(report.user_properties).get("browser_engine")
+        if engine is None:
+            return
+        self.durations[engine][report.nodeid] += report.duration
+        if report.when == "call" or (report.when == "setup" and not report.passed):
+            self.results[engine][report.outcome] += 1
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_table_header(self, cells: list) -> None:
+        cells.insert(2, "<th>Engine</th>")
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_table_row(self, report, cells: list) -> None:
+        cells.insert(2, f"<td>{dict(report.user_properties).get('browser_engine', '')}</td>")
+
+    def _means(self) -> Dict[str, float]:
+        return {e: sum(d.values()) / len(d) for e, d in self.durations.items() if d}
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        # The controller sees every worker's reports, so only it persists the means.
+        if os.getenv("PYTEST_XDIST_WORKER") is None and self.durations:
+            TIMINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            TIMINGS_FILE.write_text(json.dumps({e: round(m, 3) for e, m in self._means().items()}), encoding="utf8")
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        means = self._means()
+        if not means:
+            return
+        fastest = min(means.values()) or 1e-9
+        terminalreporter.section("browser matrix")
+        terminalreporter.write_line(
+            f"{'engine':<10}{'passed':>8}{'failed':>8}{'skipped':>9}{'total s':>10}{'mean s':>9}{'vs fastest':>12}"
+        )
+        for engine in sorted(means, key=means.get):
+            r = self.results[engine]
+            total = sum(self.durations[engine].values())
+            terminalreporter.write_line(
+                f"{engine:<10}{r['passed']:>8}{r['failed']:>8}{r['skipped']:>9}{total:>10.1f}"
+                f"{means[engine]:>9.2f}{means[engine] / fastest:>11.2f}x"
+            )
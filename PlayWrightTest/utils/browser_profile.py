@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, List, Optional
+
+from config.settings import LEAN_BLOCKED_RESOURCE_TYPES, LEAN_BLOCKED_URL_PATTERNS
+
+PROFILES = ("default", "lean")
+
+# Chromium features the UI tests never use. Each one costs startup time, background
+# network traffic or renderer memory.
+LEAN_CHROMIUM_ARGS = [
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-domain-reliability",
+    "--disable-client-side-phishing-detection",
+    "--disable-breakpad",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--mute-audio",
+    "--disable-dev-shm-usage",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication,InterestFeedContentSuggestions",
+]
+
+
+def launch_options(browser_name: str, profile: str) -> dict:
+    """Extra `launch()` kwargs for the profile (Chromium only; other engines launch as-is)."""
+    if profile == "lean" and browser_name == "chromium":
+        return {"args": list(LEAN_CHROMIUM_ARGS)}
+    return {}
+
+
+def _glob_to_regex(glob: str) -> re.Pattern:
+    # Same semantics as Playwright URL globs: "**" spans path separators, "*" does not.
+    parts = re.split(r"(\*\*|\*|\?)", glob)
+    tokens = {"**": ".*", "*": "[^/]*", "?": "."}
+    return re.compile("^" + "".join(tokens.get(p, re.escape(p)) for p in parts) + "$")
+
+
+class ResourceBlocker:
+    """Abort non-essential requests of a browser context through a single catch-all route.
+
+    A request is blocked when its resource type is in `resource_types` or its URL matches one
+    of `url_patterns`. `allow` lists resource types or URL patterns to let through for this
+    context (from the test's `allow_resources` marker).
+    """
+
+    def __init__(
+        self,
+        *,
+        resource_types: Iterable[str] = LEAN_BLOCKED_RESOURCE_TYPES,
+        url_patterns: Iterable[str] = LEAN_BLOCKED_URL_PATTERNS,
+        allow: Iterable[str] = (),
+    ) -> None:
+        allowed = set(allow)
+        self.resource_types = {t for t in resource_types if t not in allowed}
+        self.url_patterns: List[re.Pattern] = [_glob_to_regex(p) for p in url_patterns if p not in allowed]
+        self.blocked = 0
+
+    @classmethod
+    def for_marker(cls, marker) -> Optional["ResourceBlocker"]:
+        """Blocker honouring `@pytest.mark.allow_resources(...)`; None when the test allows all."""
+        if marker is None:
+            return cls()
+        if not marker.args:
+            return None
+        return cls(allow=marker.args)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.resource_types or self.url_patterns)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.resource_types:
+            return True
+        return any(p.match(url) for p in self.url_patterns)
+
+    def handle(self, route) -> None:
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked += 1
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    async def handle_async(self, route) -> None:
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked += 1
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import socket
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from playwright._impl._driver import compute_driver_executable, get_driver_env
+
+from config.settings import BROWSER_SERVER_POOL_SIZE, BROWSER_SERVER_START_TIMEOUT_S
+
+# launchServer is only exposed by the Node API, so the server runs on the Node runtime that
+# ships with the Python package. It prints its ws endpoint and exits when stdin closes, so it
+# never outlives the pytest controller.
+_SERVER_JS = """
+const pw = require(process.argv[1]);
+(async () => {
+  const server = await pw[process.argv[2]].launchServer(JSON.parse(process.argv[3]));
+  console.log(server.wsEndpoint());
+  const stop = () => server.close().then(() => process.exit(0));
+  process.on('SIGTERM', stop);
+  process.stdin.on('end', stop);
+  process.stdin.resume();
+})().catch(err => { console.error(err); process.exit(1); });
+"""
+
+
+class BrowserServer:
+    """One browser started with `launchServer`; clients attach with `browser_type.connect()`."""
+
+    def __init__(self, browser_name: str, *, headless: bool = True, launch_options: Optional[dict] = None) -> None:
+        self.browser_name = browser_name
+        self.options = {"headless": headless, **(launch_options or {})}
+        self.ws_endpoint: Optional[str] = None
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self, timeout: float = BROWSER_SERVER_START_TIMEOUT_S) -> str:
+        node, cli = compute_driver_executable()
+        package = str(Path(cli).parent)
+        self._process = subprocess.Popen(
+            [node, "-e", _SERVER_JS, "--", package, self.browser_name, json.dumps(self.options)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=get_driver_env(),
+            text=True,
+        )
+        line: List[str] = []
+        reader = threading.Thread(target=lambda: line.append(self._process.stdout.readline()), daemon=True)
+        reader.start()
+        reader.join(timeout)
+        endpoint = line[0].strip() if line else ""
+        if not endpoint.startswith("ws"):
+            self.stop()
+            raise RuntimeError(f"{self.browser_name} browser server reported no endpoint (timeout {timeout}s): {endpoint!r}")
+        self.ws_endpoint = endpoint
+        return endpoint
+
+    def stop(self) -> None:
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+        self._process = None
+
+
+def endpoint_healthy(ws_endpoint: str, timeout: float = 2.0) -> bool:
+    """Cheap liveness check: the server's port accepts TCP connections."""
+    url = urlparse(ws_endpoint)
+    try:
+        with socket.create_connection((url.hostname, url.port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class BrowserServerPool:
+    """A small pool of browser servers per engine, started by the xdist controller."""
+
+    def __init__(
+        self,
+        launch_options: Dict[str, dict],
+        *,
+        size: int = BROWSER_SERVER_POOL_SIZE,
+        headless: bool = True,
+    ) -> None:
+        # launch_options: engine name -> extra launch() kwargs for that engine
+        self.servers: Dict[str, List[BrowserServer]] = {
+            engine: [BrowserServer(engine, headless=headless, launch_options=options) for _ in range(max(1, size))]
+            for engine, options in launch_options.items()
+        }
+        self.endpoints: Dict[str, List[str]] = {}
+
+    def start(self) -> Dict[str, List[str]]:
+        try:
+            for engine, servers in self.servers.items():
+                self.endpoints[engine] = [server.start() for server in servers]
+        except Exception:
+            self.stop()
+            raise
+        return self.endpoints
+
+    def endpoints_for(self, worker_id: str) -> Dict[str, str]:
+        """One endpoint per engine, assigned round-robin by xdist worker id ("gw0", "gw1", ...)."""
+        index = int(worker_id[2:]) if worker_id.startswith("gw") and worker_id[2:].isdigit() else 0
+        return {engine: endpoints[index % len(endpoints)] for engine, endpoints in self.endpoints.items() if endpoints}
+
+    def stop(self) -> None:
+        for servers in self.servers.values():
+            for server in servers:
+                server.stop()
+        self.endpoints = {}
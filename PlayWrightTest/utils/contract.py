@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import fastjsonschema
+import pytest
+import requests
+
+from config.settings import (
+    ARTIFACTS_DIR,
+    BASE_URL,
+    CONTRACT_CLOSED_OBJECTS,
+    CONTRACT_MAX_ARRAY_ITEMS,
+    CONTRACT_SPEC_FILE,
+    HEALTH_PROBE_TIMEOUT_S,
+)
+
+MODES = ("off", "warn", "strict")
+
+# OpenAPI-only keywords that are not JSON Schema (or only add noise to the compiled code).
+_DROP_KEYS = ("example", "examples", "description", "xml", "externalDocs", "deprecated", "readOnly", "writeOnly")
+_API_PREFIX = re.compile(r"^/api(?=/)")
+_INDEX = re.compile(r"\[\d+\]")
+_SET = re.compile(r"\{([^{}]*)\}")
+
+
+class ContractViolation(AssertionError):
+    """Raised from api_context calls in strict mode when a response does not match the spec."""
+
+
+def fetch_spec(base_url: str = BASE_URL, timeout: float = HEALTH_PROBE_TIMEOUT_S) -> dict:
+    """The server's OpenAPI document.
+
+    swagger-ui-express embeds it as JSON in /api-docs/swagger-ui-init.js
+    (`var options = {"swaggerDoc": {...}, ...}`); CONTRACT_SPEC_FILE overrides.
+    """
+    if CONTRACT_SPEC_FILE:
+        return json.loads(Path(CONTRACT_SPEC_FILE).read_text(encoding="utf8"))
+    resp = requests.get(f"{base_url.rstrip('/')}/api-docs/swagger-ui-init.js", timeout=timeout)
+    resp.raise_for_status()
+    text = resp.text
+    start = text.index("{", text.index("var options"))
+    options, _ = json.JSONDecoder().raw_decode(text, start)
+    return options["swaggerDoc"]
+
+
+def to_json_schema(schema: Any, *, closed: bool = CONTRACT_CLOSED_OBJECTS) -> Any:
+    """OpenAPI 3.0 schema object -> JSON Schema (refs point at #/definitions).
+
+    With `closed`, objects that list `properties` reject undocumented ones unless the spec
+    says otherwise; that is what turns a renamed or added field into a reported drift.
+    """
+    if isinstance(schema, list):
+        return [to_json_schema(s, closed=closed) for s in schema]
+    if not isinstance(schema, dict):
+        return schema
+    out = {k: to_json_schema(v, closed=closed) for k, v in schema.items() if k not in _DROP_KEYS}
+    ref = out.get("$ref")
+    if isinstance(ref, str) and ref.startswith("#/components/schemas/"):
+        out["$ref"] = "#/definitions/" + ref.rsplit("/", 1)[1]
+    if out.pop("nullable", False) and isinstance(out.get("type"), str):
+        out["type"] = [out["type"], "null"]
+    if closed and "properties" in out and "additionalProperties" not in out:
+        out["additionalProperties"] = False
+    return out
+
+
+def _path_pattern(path: str) -> re.Pattern:
+    return re.compile("^" + re.sub(r"\\\{[^/]+?\\\}", r"[^/]+", re.escape(_API_PREFIX.sub("", path))) + "/?$")
+
+
+def _normalize(message: str) -> str:
+    """One message per kind of drift: drop array indices and sort property sets."""
+    message = _INDEX.sub("[]", message)
+    return _SET.sub(lambda m: "{" + ", ".join(sorted(p.strip() for p in m.group(1).split(","))) + "}", message)
+
+
+class ContractValidator:
+    """Validates every api_context response against the server's OpenAPI response schemas.
+
+    Registered as an InstrumentedAPIRequestContext listener and as a pytest plugin. The spec
+    is fetched on the first response (so the xdist controller never loads it). Lookups are
+    memoised per (method, path) and validators compiled with fastjsonschema once per
+    (route, status), so a response costs two dict lookups plus the generated check. Routes
+    or statuses without a documented JSON schema are skipped; arrays are checked on their
+    first CONTRACT_MAX_ARRAY_ITEMS items.
+
+    `warn` records violations on the test (`contract_violations`) and in the end-of-run
+    "API contract" section; `strict` also raises ContractViolation from the API call.
+    """
+
+    def __init__(self, mode: str = "warn", *, spec: Optional[dict] = None, max_items: int = CONTRACT_MAX_ARRAY_ITEMS) -> None:
+        self.mode = mode
+        self.max_items = max_items
+        self._spec = spec
+        self._routes: Optional[List[Tuple[str, re.Pattern, str, dict]]] = None
+        self._route_cache: Dict[Tuple[str, str], Optional[int]] = {}
+        self._validators: Dict[Tuple[int, int], Optional[Callable[[Any], Any]]] = {}
+        self.current: List[str] = []
+        self.checked = 0
+        self.elapsed_s = 0.0
+        self.spec_error: Optional[str] = None
+        self._spec_error_reported = False
+        self._checked_at_start = 0
+        self._elapsed_at_start = 0.0
+        # Controller-side aggregation (from report user properties, so it works under xdist).
+        self.drift: Counter = Counter()
+        self.first_seen: Dict[str, str] = {}
+        self.totals = {"checked": 0, "ms": 0.0}
+
+    # ---------- compilation ----------
+    def _load(self) -> None:
+        if self._spec is None:
+            try:
+                self._spec = fetch_spec()
+            except (requests.RequestException, ValueError, KeyError, OSError) as exc:
+                self.spec_error = f"{type(exc).__name__}: {exc}"
+                self._spec = {}
+        self._definitions = to_json_schema(self._spec.get("components", {}).get("schemas", {}))
+        self._routes = [
+            (method.upper(), _path_pattern(path), f"{method.upper()} {path}", operation.get("responses", {}))
+            for path, item in self._spec.get("paths", {}).items()
+            for method, operation in item.items()
+            if isinstance(operation, dict)
+        ]
+
+    def _route(self, method: str, path: str) -> Optional[int]:
+        key = (method, path)
+        if key not in self._route_cache:
+            bare = _API_PREFIX.sub("", path)
+            self._route_cache[key] = next(
+                (i for i, (m, pattern, _, _) in enumerate(self._routes) if m == method and pattern.match(bare)), None
+            )
+        return self._route_cache[key]
+
+    def _validator(self, route: int, status: int) -> Optional[Callable[[Any], Any]]:
+        key = (route, status)
+        if key not in self._validators:
+            responses = self._routes[route][3]
+            documented = responses.get(str(status)) or responses.get(status) or responses.get("default") or {}
+            schema = documented.get("content", {}).get("application/json", {}).get("schema")
+            self._validators[key] = (
+                fastjsonschema.compile({"definitions": self._definitions, **to_json_schema(schema)})
+                if schema is not None
+                else None
+            )
+        return self._validators[key]
+
+    # ---------- listener ----------
+    def on_request(self, method: str, url: str, response, elapsed_ms: float) -> None:
+        if self._routes is None:
+            self._load()
+        start = time.perf_counter()
+        try:
+            route = self._route(method, urlparse(url).path)
+            if route is None:
+                return
+            validate = self._validator(route, response.status)
+            if validate is None:
+                return
+            self.checked += 1
+            try:
+                body = response.json()
+            except ValueError:
+                message = f"{self._routes[route][2]} {response.status}: body is not JSON"
+            else:
+                if isinstance(body, list) and len(body) > self.max_items:
+                    body = body[: self.max_items]
+                try:
+                    validate(body)
+                    return
+                except fastjsonschema.JsonSchemaValueException as exc:
+                    message = f"{self._routes[route][2]} {response.status}: {_normalize(exc.message)}"
+        finally:
+            self.elapsed_s += time.perf_counter() - start
+        self.current.append(message)
+        if self.mode == "strict":
+            raise ContractViolation(f"Response does not match the OpenAPI contract: {message}")
+
+    # ---------- plugin ----------
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        self.current = []
+        self._checked_at_start, self._elapsed_at_start = self.checked, self.elapsed_s
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call):
+        outcome = yield
+        if call.when != "teardown":
+            return
+        report = outcome.get_result()
+        checked = self.checked - self._checked_at_start
+        if checked:
+            ms = (self.elapsed_s - self._elapsed_at_start) * 1000
+            report.user_properties.append(("contract_checked", [checked, round(ms, 2)]))
+        if self.current:
+            report.user_properties.append(("contract_violations", sorted(set(self.current))))
+        if self.spec_error and not self._spec_error_reported:
+            self._spec_error_reported = True
+            report.user_properties.append(("contract_spec_error", self.spec_error))
+
+    def pytest_runtest_logreport(self, report) -> None:
+        props = dict(report.user_properties)
+        self.spec_error = props.get("contract_spec_error", self.spec_error)
+        checked = props.get("contract_checked")
+        if checked:
+            self.totals["checked"] += checked[0]
+            self.totals["ms"] += checked[1]
+        for message in props.get("contract_violations", ()):
+            self.drift[message] += 1
+            self.first_seen.setdefault(message, report.nodeid)
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if self.drift:
+            ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+            (ARTIFACTS_DIR / "contract-drift.json").write_text(
+                json.dumps(
+                    [{"violation": m, "tests": n, "first_test": self.first_seen[m]} for m, n in self.drift.most_common()],
+                    indent=1,
+                ),
+                encoding="utf8",
+            )
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if self.spec_error:
+            terminalreporter.write_line(f"API contract: spec unavailable, responses not validated ({self.spec_error})")
+        if not self.totals["checked"]:
+            return
+        per_call = self.totals["ms"] * 1000 / self.totals["checked"]
+        terminalreporter.section("API contract")
+        terminalreporter.write_line(
+            f"{self.totals['checked']} response(s) validated in {self.totals['ms']:.1f} ms ({per_call:.0f} us each), "
+            f"{len(self.drift)} distinct violation(s)"
+        )
+        for message, count in self.drift.most_common(10):
+            terminalreporter.write_line(f"{count:>5} test(s)  {message}  (first: {self.first_seen[message]})")
+        if self.drift:
+            terminalreporter.write_line(f"full list: {ARTIFACTS_DIR / 'contract-drift.json'}")
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from config.settings import BASE_URL, TEARDOWN_CONCURRENCY, TEARDOWN_ROUNDS, TEARDOWN_TIMEOUT_S
+
+# Entity kind -> collection path. Creates are `POST <path>` answering with the new entity
+# (its `id`); deletes are `DELETE <path>/<id>`. Both the bare and the /api-prefixed routes count.
+ENTITY_COLLECTIONS: Dict[str, str] = {"client": "/clients"}
+
+_ROUTES = [
+    (kind, re.compile(rf"^(?:/api)?{re.escape(path)}/?$"), re.compile(rf"^(?:/api)?{re.escape(path)}/(\d+)$"))
+    for kind, path in ENTITY_COLLECTIONS.items()
+]
+
+Entity = Tuple[str, int]
+
+
+class EntityRegistry:
+    """Entities created during the current test, recorded from their create responses.
+
+    `on_request` is an InstrumentedAPIRequestContext listener and `on_page_response` a
+    BrowserContext "response" listener, so API calls and UI flows (e.g. HomePage.add_client)
+    are both covered without the test doing anything. A successful delete seen on either
+    path removes the entity again, so fixtures that clean up after themselves are not
+    deleted twice.
+
+    `teardown()` deletes what is left by id, in parallel. The API store rewrites data.json
+    with an unlocked read-modify-write, so a concurrent delete can be undone by another one:
+    every delete is confirmed with `GET <path>/<id>` and survivors are retried. 404 counts as
+    deleted, which makes teardown idempotent. A 401/403 means the token can no longer clean
+    up (expired, invalidated, not the owner), so teardown stops instead of retrying.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        *,
+        concurrency: int = TEARDOWN_CONCURRENCY,
+        rounds: int = TEARDOWN_ROUNDS,
+        timeout: float = TEARDOWN_TIMEOUT_S,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = max(1, concurrency)
+        self.rounds = max(1, rounds)
+        self.timeout = timeout
+        self.token: Optional[str] = None
+        self._entities: Dict[Entity, None] = {}  # insertion-ordered set
+
+    # ---------- recording ----------
+    def start_test(self) -> None:
+        self._entities = {}
+
+    @property
+    def entities(self) -> List[Entity]:
+        return list(self._entities)
+
+    def record(self, kind: str, entity_id: int) -> None:
+        self._entities[(kind, int(entity_id))] = None
+
+    def forget(self, kind: str, entity_id: int) -> None:
+        self._entities.pop((kind, int(entity_id)), None)
+
+    def _observe(self, method: str, url: str, status: int, body: Callable[[], object]) -> None:
+        path = urlparse(url).path
+        for kind, create, item in _ROUTES:
+            if method == "POST" and status in (200, 201) and create.match(path):
+                try:
+                    entity_id = body().get("id")
+                except Exception:
+                    return  # not JSON / body no longer available: nothing to record
+                if entity_id is not None:
+                    self.record(kind, entity_id)
+                return
+            if method == "DELETE" and status in (200, 204, 404):
+                match = item.match(path)
+                if match:
+                    self.forget(kind, int(match.group(1)))
+                    return
+
+    def on_request(self, method: str, url: str, response, elapsed_ms: float) -> None:
+        self._observe(method, url, response.status, response.json)
+
+    def on_page_response(self, response) -> None:
+        request = response.request
+        if request.method not in ("POST", "DELETE"):
+            return
+        self._observe(request.method, response.url, response.status, response.json)
+
+    # ---------- teardown ----------
+    def _url(self, entity: Entity) -> str:
+        kind, entity_id = entity
+        return f"{self.base_url}{ENTITY_COLLECTIONS[kind]}/{entity_id}"
+
+    def _call(self, method: str, entity: Entity) -> Optional[int]:
+        try:
+            resp = requests.request(
+                method,
+                self._url(entity),
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=self.timeout,
+            )
+            return resp.status_code
+        except requests.RequestException:
+            return None
+
+    def teardown(self) -> Dict[str, object]:
+        """Delete every recorded entity.
+
+        Returns {"deleted": n, "failed": [(kind, id), ...], "error": reason or None}.
+        """
+        pending = self.entities
+        self._entities = {}
+        if not pending or not self.token:
+            return {"deleted": 0, "failed": pending, "error": None if not pending else "no API token"}
+        total = len(pending)
+        error = None
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, total)) as pool:
+            for _ in range(self.rounds):
+                statuses = list(pool.map(lambda e: self._call("DELETE", e), pending))
+                denied = next((status for status in statuses if status in (401, 403)), None)
+                if denied is not None:
+                    # Retrying cannot help; report every unconfirmed entity as left behind.
+                    error = f"DELETE answered {denied}"
+                    break
+                # Confirm by id; anything still there (lost write, transient error) goes again.
+                statuses = list(pool.map(lambda e: self._call("GET", e), pending))
+                pending = [e for e, status in zip(pending, statuses) if status != 404]
+                if not pending:
+                    break
+        return {"deleted": total - len(pending), "failed": pending, "error": error}
+
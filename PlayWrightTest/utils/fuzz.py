@@ -0,0 +1,439 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from config.settings import (
+    ARTIFACTS_DIR,
+    BASE_URL,
+    FUZZ_CONCURRENCY,
+    FUZZ_CORPUS_DIR,
+    FUZZ_MAX_SHRINK_STEPS,
+    TEARDOWN_TIMEOUT_S,
+)
+
+# Documented rules of createClientHandler / updateClientHandler (and the OpenAPI request
+# body): all four fields required, names letters-only strings up to 25/20 characters,
+# dob a YYYY-MM-DD calendar date at least 18 years ago, sex exactly Male or Female.
+FIELDS = ("firstName", "lastName", "dob", "sex")
+NAME_LIMITS = {"firstName": 25, "lastName": 20}
+SEXES = ("Male", "Female")
+MIN_AGE = 18
+TARGETS = {"create": ("POST", 201), "update": ("PUT", 200)}
+CANONICAL = {"firstName": "A", "lastName": "B", "dob": "1990-01-01", "sex": "Male"}
+
+_LETTERS = re.compile(r"[A-Za-z]+")
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def parse_budget(value: str) -> float:
+    """--fuzz value: seconds of generation, or 'replay' (corpus only, i.e. 0)."""
+    if value == "replay":
+        return 0.0
+    seconds = float(value)
+    if seconds < 0:
+        raise ValueError(value)
+    return seconds
+
+
+def _years_before(day: date, years: int) -> date:
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:  # Feb 29
+        return day.replace(year=day.year - years, day=28)
+
+
+def violations(payload: dict, today: date) -> List[str]:
+    """Every documented rule `payload` breaks, in handler order.
+
+    A dob within a day of the 18th birthday is reported as "dob: at the age boundary": the
+    server's answer there legitimately depends on its timezone.
+    """
+    found = [f"{field}: missing" for field in FIELDS if field not in payload]
+    for field, limit in NAME_LIMITS.items():
+        value = payload.get(field)
+        if field not in payload:
+            continue
+        if not isinstance(value, str):
+            found.append(f"{field}: not a string")
+        elif not _LETTERS.fullmatch(value):
+            found.append(f"{field}: not letters only")
+        elif len(value) > limit:
+            found.append(f"{field}: longer than {limit}")
+    if "sex" in payload and (not isinstance(payload["sex"], str) or payload["sex"] not in SEXES):
+        found.append("sex: not Male/Female")
+    if "dob" not in payload:
+        return found
+    dob = payload["dob"]
+    if not isinstance(dob, str):
+        found.append("dob: not a string")
+    elif not _ISO_DATE.fullmatch(dob):
+        found.append("dob: not YYYY-MM-DD")
+    else:
+        try:
+            born = date.fromisoformat(dob)
+        except ValueError:
+            found.append("dob: not a calendar date")
+        else:
+            cutoff = _years_before(today, MIN_AGE)
+            if abs((born - cutoff).days) <= 1:
+                found.append("dob: at the age boundary")
+            elif born > cutoff:
+                found.append(f"dob: younger than {MIN_AGE}")
+    return found
+
+
+def expected(payload: dict, today: date) -> Tuple[Optional[bool], str]:
+    """(accepted?, first broken rule or "valid") according to the documented rules.
+
+    `accepted` is None when either answer is legitimate (only the age boundary applies).
+    """
+    broken = violations(payload, today)
+    if not broken:
+        return True, "valid"
+    if broken == ["dob: at the age boundary"]:
+        return None, broken[0]
+    return False, next(r for r in broken if r != "dob: at the age boundary")
+
+
+# -----------------------------
+# Generation
+# -----------------------------
+class PayloadGenerator:
+    """Random payloads around the documented rules: mostly valid fields, with boundary
+    values, wrong characters, wrong JSON types and missing fields mixed in per field."""
+
+    def __init__(self, rng: random.Random, today: date, p_valid: float = 0.7) -> None:
+        self.rng = rng
+        self.today = today
+        self.p_valid = p_valid
+
+    def _letters(self, n: int) -> str:
+        return "".join(self.rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz") for _ in range(n))
+
+    def _wrong_type(self) -> Any:
+        return self.rng.choice([
+            None, True, False, 0, 1, self.rng.randint(2, 10**6), -1.5, [], [self._letters(3)],
+            {"value": self._letters(3)}, {},
+        ])
+
+    def name(self, limit: int) -> Any:
+        rng = self.rng
+        if rng.random() < self.p_valid:
+            return self._letters(rng.choice([1, limit, rng.randint(1, limit)]))
+        base = self._letters(rng.randint(1, limit))
+        i = rng.randint(0, len(base))
+        return rng.choice([
+            "", self._letters(limit + 1), self._letters(rng.randint(limit + 2, 4 * limit)),
+            base[:i] + rng.choice("0123456789$@-' _.") + base[i:],
+            f" {base}", f"{base} ", f"{base}\n", base[:i] + rng.choice("éÅßñ漢") + base[i:],
+            self._wrong_type(),
+        ])
+
+    def dob(self) -> Any:
+        rng = self.rng
+        cutoff = _years_before(self.today, MIN_AGE)
+        if rng.random() < self.p_valid:
+            return (cutoff - timedelta(days=rng.choice([rng.randint(2, 30000), 2, 3]))).isoformat()
+        day = date(rng.randint(1900, self.today.year), rng.randint(1, 12), rng.randint(1, 28))
+        return rng.choice([
+            (cutoff + timedelta(days=rng.randint(-1, 5))).isoformat(),  # boundary and just too young
+            (self.today + timedelta(days=rng.randint(1, 3650))).isoformat(),
+            f"{day.year}-02-{rng.choice([29, 30, 31])}", f"{day.year}-{rng.choice([0, 13])}-10", f"{day.year}-04-31",
+            day.strftime("%m/%d/%Y"), day.strftime("%Y/%m/%d"), day.strftime("%d %b %Y"), f"{day.year}-{day.month}-{day.day}",
+            f"{day.isoformat()}T00:00:00Z", str(day.year), "", "not-a-date", self._wrong_type(),
+        ])
+
+    def sex(self) -> Any:
+        rng = self.rng
+        if rng.random() < self.p_valid:
+            return rng.choice(SEXES)
+        return rng.choice(["male", "FEMALE", " Male", "Male ", "M", "F", "N/A", "Other", "", self._wrong_type()])
+
+    def payload(self) -> dict:
+        values = {
+            "firstName": self.name(NAME_LIMITS["firstName"]),
+            "lastName": self.name(NAME_LIMITS["lastName"]),
+            "dob": self.dob(),
+            "sex": self.sex(),
+        }
+        return {k: v for k, v in values.items() if self.rng.random() > 0.03}  # occasionally missing
+
+    def case(self) -> Tuple[str, dict]:
+        return self.rng.choice(tuple(TARGETS)), self.payload()
+
+
+# -----------------------------
+# Shrinking
+# -----------------------------
+def _smaller(value: Any) -> Iterator[Any]:
+    if isinstance(value, bool) or value is None:
+        return
+    if isinstance(value, str):
+        n = len(value)
+        if n > 1:
+            yield value[: n // 2]
+            yield value[n // 2:]
+        for i in range(min(n, 25)):
+            yield value[:i] + value[i + 1:]
+    elif isinstance(value, (int, float)):
+        if value != 0:
+            yield 0
+        if abs(value) > 1:
+            yield int(value / 2)
+    elif isinstance(value, list):
+        for i in range(len(value)):
+            yield value[:i] + value[i + 1:]
+        for i, item in enumerate(value):
+            for smaller in _smaller(item):
+                yield value[:i] + [smaller] + value[i + 1:]
+    elif isinstance(value, dict):
+        for key in value:
+            yield {k: v for k, v in value.items() if k != key}
+
+
+def shrink_candidates(payload: dict) -> Iterator[dict]:
+    """Simpler payloads, most aggressive first: canonical valid fields, then smaller values."""
+    for field in FIELDS:
+        if field in payload and payload[field] != CANONICAL[field]:
+            yield {**payload, field: CANONICAL[field]}
+    for field, value in payload.items():
+        for smaller in _smaller(value):
+            yield {**payload, field: smaller}
+
+
+def _case_id(target: str, payload: dict) -> str:
+    return hashlib.sha1(json.dumps([target, payload], sort_keys=True).encode()).hexdigest()[:16]
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+class Fuzzer:
+    """Time-budgeted property-based fuzzing of POST /clients and PUT /clients/<id>.
+
+    The property: a payload is accepted (201/200 echoing the fields) exactly when the
+    documented rules accept it, rejected with 400 otherwise, and never answered with a 5xx.
+    Cases run FUZZ_CONCURRENCY at a time over plain HTTP (requests), like the health probes.
+
+    A run first replays the corpus (FUZZ_CORPUS_DIR), then generates cases until the budget
+    is spent. Each distinct failure (target, rule, status) is shrunk to a minimal payload,
+    evaluating shrink candidates in parallel. Minimal failures and the first case for each
+    new server answer (status + message) are saved to the corpus for replay in later runs.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        client_id: int,
+        base_url: str = BASE_URL,
+        seed: Optional[int] = None,
+        concurrency: int = FUZZ_CONCURRENCY,
+        corpus_dir: Path = FUZZ_CORPUS_DIR,
+        max_shrink_steps: int = FUZZ_MAX_SHRINK_STEPS,
+        on_created: Callable[[int], None] = lambda client_id: None,
+    ) -> None:
+        self.token = token
+        self.client_id = client_id
+        self.base_url = base_url.rstrip("/")
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.concurrency = max(1, concurrency)
+        self.corpus_dir = Path(corpus_dir)
+        self.max_shrink_steps = max_shrink_steps
+        self.on_created = on_created
+        self.today = date.today()
+        self.generator = PayloadGenerator(random.Random(self.seed), self.today)
+        self.cases = 0
+        self.failures: Dict[tuple, dict] = {}  # signature -> first failing case
+        self.answers: Dict[tuple, str] = {}  # (target, status, message) -> corpus case id
+        self._local = threading.local()
+
+    # ---------- HTTP ----------
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers["Authorization"] = f"Bearer {self.token}"
+        return session
+
+    def _send(self, target: str, payload: dict) -> Tuple[int, Any]:
+        method, _ = TARGETS[target]
+        path = "/clients" if target == "create" else f"/clients/{self.client_id}"
+        resp = self._session().request(method, f"{self.base_url}{path}", json=payload, timeout=TEARDOWN_TIMEOUT_S)
+        try:
+            body = resp.json()
+        except ValueError:
+            body = resp.text[:200]
+        return resp.status_code, body
+
+    # ---------- property ----------
+    def evaluate(self, target: str, payload: dict) -> dict:
+        status, body = self._send(target, payload)
+        accept, reason = expected(payload, self.today)
+        ok_status = TARGETS[target][1]
+        problem = None
+        if status >= 500:
+            problem = "server error"
+        elif accept is True and status != ok_status:
+            problem = f"valid payload answered {status}"
+        elif accept is False and status != 400:
+            problem = f"invalid payload answered {status}"
+        elif status == ok_status and isinstance(body, dict):
+            echoed = {k: body.get(k) for k in FIELDS}
+            if accept and echoed != {k: payload[k] for k in FIELDS}:
+                problem = f"accepted payload echoed as {echoed}"
+        message = body.get("message") if isinstance(body, dict) else None
+        created = body.get("id") if target == "create" and status == ok_status and isinstance(body, dict) else None
+        return {
+            "target": target,
+            "payload": payload,
+            "status": status,
+            "message": message,
+            "reason": reason,
+            "violations": violations(payload, self.today),
+            "problem": problem,
+            "created": created,
+        }
+
+    @staticmethod
+    def signature(result: dict) -> tuple:
+        return (result["target"], result["reason"], result["status"] >= 500 or result["status"])
+
+    # ---------- bookkeeping ----------
+    def _record(self, result: dict, *, from_corpus: bool = False) -> None:
+        self.cases += 1
+        if result["created"] is not None:
+            self.on_created(result["created"])
+        if result["problem"]:
+            sig = self.signature(result)
+            if sig not in self.failures:
+                self.failures[sig] = {**result, "count": 0, "from_corpus": from_corpus}
+            self.failures[sig]["count"] += 1
+            return
+        answer = (result["target"], result["status"], result["message"])
+        if answer not in self.answers and not from_corpus:
+            self.answers[answer] = self._save(result, "coverage")
+
+    def _save(self, result: dict, kind: str) -> str:
+        case_id = _case_id(result["target"], result["payload"])
+        entry = {k: result[k] for k in ("target", "payload", "status", "message", "reason", "problem")}
+        self.corpus_dir.mkdir(parents=True, exist_ok=True)
+        (self.corpus_dir / f"{case_id}.json").write_text(
+            json.dumps({"kind": kind, **entry, "found": self.today.isoformat()}, indent=1, sort_keys=True), encoding="utf8"
+        )
+        return case_id
+
+    def load_corpus(self) -> List[dict]:
+        if not self.corpus_dir.exists():
+            return []
+        return [json.loads(p.read_text(encoding="utf8")) for p in sorted(self.corpus_dir.glob("*.json"))]
+
+    # ---------- phases ----------
+    def replay(self, pool: ThreadPoolExecutor) -> int:
+        corpus = self.load_corpus()
+        for entry in corpus:
+            self.answers.setdefault((entry["target"], entry["status"], entry.get("message")), "corpus")
+        for result in pool.map(lambda e: self.evaluate(e["target"], e["payload"]), corpus):
+            self._record(result, from_corpus=True)
+        return len(corpus)
+
+    def generate(self, pool: ThreadPoolExecutor, budget_s: float) -> None:
+        deadline = time.monotonic() + budget_s
+        pending = set()
+        while pending or time.monotonic() < deadline:
+            while len(pending) < 2 * self.concurrency and time.monotonic() < deadline:
+                pending.add(pool.submit(self.evaluate, *self.generator.case()))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._record(future.result())
+
+    def shrink(self, pool: ThreadPoolExecutor, failure: dict) -> dict:
+        """Greedy shrink: take the first candidate (in order) that fails the same way without
+        breaking a rule the failing case did not already break."""
+        sig = self.signature(failure)
+        allowed = set(failure["violations"])
+        best, steps = failure, 0
+        seen = {_case_id(failure["target"], failure["payload"])}  # no cycles (e.g. via CANONICAL)
+        while steps < self.max_shrink_steps:
+            candidates = []
+            for payload in shrink_candidates(best["payload"]):
+                case_id = _case_id(best["target"], payload)
+                if case_id not in seen:
+                    seen.add(case_id)
+                    candidates.append(payload)
+            candidates = candidates[: self.max_shrink_steps - steps]
+            if not candidates:
+                break
+            improved = None
+            for i in range(0, len(candidates), self.concurrency):
+                batch = candidates[i:i + self.concurrency]
+                steps += len(batch)
+                for result in pool.map(lambda p: self.evaluate(best["target"], p), batch):
+                    if result["created"] is not None:
+                        self.on_created(result["created"])
+                    if (
+                        improved is None
+                        and result["problem"]
+                        and self.signature(result) == sig
+                        and allowed.issuperset(result["violations"])
+                    ):
+                        improved = result
+                if improved is not None or steps >= self.max_shrink_steps:
+                    break
+            if improved is None:
+                break
+            best = improved
+        return best
+
+    def run(self, budget_s: float) -> dict:
+        """Replay the corpus, fuzz for `budget_s` seconds, shrink new failures. Returns a report."""
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            replayed = self.replay(pool)
+            if budget_s > 0:
+                self.generate(pool, budget_s)
+            fuzz_s = time.monotonic() - started
+            for sig, failure in list(self.failures.items()):
+                if not failure["from_corpus"]:
+                    minimal = self.shrink(pool, failure)
+                    self.failures[sig] = {**minimal, "count": failure["count"], "from_corpus": False}
+                    self._save(minimal, "failure")
+        report = {
+            "seed": self.seed,
+            "replayed": replayed,
+            "cases": self.cases,
+            "fuzz_s": round(fuzz_s, 1),
+            "cases_per_s": round(self.cases / fuzz_s, 1) if fuzz_s else 0.0,
+            "corpus": len(self.load_corpus()),
+            "failures": [
+                {k: f[k] for k in ("target", "reason", "status", "problem", "payload", "message", "count", "from_corpus")}
+                for f in self.failures.values()
+            ],
+        }
+        ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+        (ARTIFACTS_DIR / "fuzz-report.json").write_text(json.dumps(report, indent=1), encoding="utf8")
+        return report
+
+
+def describe_failures(report: dict) -> str:
+    lines = [f"{len(report['failures'])} property failure(s) (seed {report['seed']}):"]
+    for f in report["failures"]:
+        source = "corpus" if f["from_corpus"] else f"{f['count']}x"
+        lines.append(
+            f"  [{source}] {f['target']} {json.dumps(f['payload'])} -> {f['status']} {f['message'] or ''}"
+            f" ({f['problem']}; rule: {f['reason']})"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List
+
+import requests
+
+from config.settings import (
+    API_PASSWORD,
+    API_USERNAME,
+    BASE_URL,
+    HEALTH_PROBE_TIMEOUT_S,
+    LOGIN_API_PATH,
+    UI_BASE_URL,
+)
+
+# Which probes a test depends on, derived from the fixtures it (transitively) requests.
+# Fixture names map onto the dependency they would otherwise discover the slow way.
+FIXTURE_DEPENDENCIES: Dict[str, tuple] = {
+    "api_token": ("api", "login"),
+    "api_context": ("api", "login"),
+    "new_client": ("api", "login"),
+    "auth_storage_path": ("api", "login"),
+    "auth_context": ("api", "login", "ui"),
+    "auth_page": ("api", "login", "ui"),
+    "readonly_runner": ("api", "login", "ui"),
+    "readonly_check": ("api", "login", "ui"),
+}
+
+
+def _probe_api(timeout: float) -> requests.Response:
+    return requests.get(f"{BASE_URL.rstrip('/')}/api/health", timeout=timeout)
+
+
+def _probe_login(timeout: float) -> requests.Response:
+    return requests.post(
+        f"{BASE_URL.rstrip('/')}{LOGIN_API_PATH}",
+        json={"username": API_USERNAME, "password": API_PASSWORD},
+        timeout=timeout,
+    )
+
+
+def _probe_ui(timeout: float) -> requests.Response:
+    return requests.get(UI_BASE_URL, timeout=timeout)
+
+
+PROBES: Dict[str, Callable[[float], requests.Response]] = {
+    "api": _probe_api,
+    "login": _probe_login,
+    "ui": _probe_ui,
+}
+
+
+def _run_probe(name: str, timeout: float) -> dict:
+    start = time.perf_counter()
+    try:
+        resp = PROBES[name](timeout)
+        ok = resp.ok
+        detail = f"HTTP {resp.status_code}" if ok else f"HTTP {resp.status_code}: {resp.text[:200]}"
+    except requests.RequestException as exc:
+        ok = False
+        detail = f"{type(exc).__name__}: {exc}"
+    return {"ok": ok, "detail": detail, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+def required_probes(fixturenames: Iterable[Iterable[str]]) -> List[str]:
+    """The probes any of the given tests (each a list of fixture names) depends on."""
+    needed = set()
+    for names in fixturenames:
+        for fixture in names:
+            needed.update(FIXTURE_DEPENDENCIES.get(fixture, ()))
+    return sorted(needed)
+
+
+def probe_environment(names: Iterable[str] = tuple(PROBES), timeout: float = HEALTH_PROBE_TIMEOUT_S) -> Dict[str, dict]:
+    """Probe `names` (by default the API health endpoint, login and the UI origin) in parallel.
+
+    Returns a JSON-serializable dict {probe_name: {"ok", "detail", "elapsed_ms"}} so the
+    result can be shipped to xdist workers unchanged. The login probe issues a real token,
+    so callers only ask for the probes their tests need.
+    """
+    names = [name for name in PROBES if name in set(names)]
+    if not names:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        futures = {name: pool.submit(_run_probe, name, timeout) for name in names}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def failed_dependencies(health: Dict[str, dict], fixturenames: Iterable[str]) -> List[str]:
+    """Return the failed probes that a test using `fixturenames` depends on."""
+    return [name for name in required_probes([fixturenames]) if name in health and not health[name]["ok"]]
+
+
+def describe(health: Dict[str, dict], names: Iterable[str]) -> str:
+    return "; ".join(f"{name} ({health[name]['detail']})" for name in names)
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import pytest
+
+from config.settings import API_SOURCE_DIR, IMPACT_MAP_DIR, UI_BASE_URL
+
+# Changes to these files (relative to the pytest rootdir) can affect any test, so they
+# force a full run.
+GLOBAL_FILES = {"conftest.py", "pytest.ini", "requirements.txt", "config/settings.py"}
+# Changes that can never affect a test outcome.
+IGNORED_PATTERNS = [
+    re.compile(r".*\.(md|log)$"),
+    re.compile(r"^\.vscode/"),
+    re.compile(r"^\.gitignore$"),
+    re.compile(r"^TestProduct/API/(tests/|data\.json$|token\.json$)"),
+]
+
+_ROUTE_RE = re.compile(r"^app\.(get|post|put|patch|delete)\(\s*\[([^\]]+)\]")
+_FUNCTION_RE = re.compile(r"^(?:async\s+)?function\s+(\w+)\s*\(")
+
+
+# -----------------------------
+# server.js route model
+# -----------------------------
+@dataclass
+class Route:
+    key: str  # e.g. "GET /clients/:id"
+    method: str
+    patterns: List[re.Pattern] = field(default_factory=list)
+    lines: Set[int] = field(default_factory=set)  # 1-based source lines of the handler
+
+
+def parse_server_routes(source: str) -> List[Route]:
+    """Extract route registrations and the source lines of their handlers from server.js."""
+    lines = source.splitlines()
+    functions: Dict[str, Tuple[int, int]] = {}
+    for i, line in enumerate(lines):
+        m = _FUNCTION_RE.match(line)
+        if m:
+            end = next((j for j in range(i + 1, len(lines)) if lines[j] == "}"), len(lines) - 1)
+            functions[m.group(1)] = (i + 1, end + 1)
+
+    routes: List[Route] = []
+    for i, line in enumerate(lines):
+        m = _ROUTE_RE.match(line)
+        if not m:
+            continue
+        method = m.group(1).upper()
+        paths = [p.strip().strip("'\"") for p in m.group(2).split(",") if p.strip()]
+        route = Route(key=f"{method} {paths[-1]}", method=method)
+        route.patterns = [re.compile("^" + re.sub(r":\w+", r"[^/]+", p) + "/?$") for p in paths]
+        route.lines.add(i + 1)
+        handler = re.search(r",\s*(\w+)\);\s*$", line)
+        if handler and handler.group(1) in functions:
+            start, end = functions[handler.group(1)]
+            route.lines.update(range(start, end + 1))
+        elif not line.rstrip().endswith(");"):
+            # Multi-line inline handler: runs until the closing "});"
+            end = next((j for j in range(i, len(lines)) if lines[j].startswith("});")), i)
+            route.lines.update(range(i + 1, end + 2))
+        routes.append(route)
+    return routes
+
+
+def route_for(method: str, url: str, routes: Iterable[Route]) -> Optional[str]:
+    path = urlparse(url).path
+    for route in routes:
+        if route.method == method.upper() and any(p.match(path) for p in route.patterns):
+            return route.key
+    return None
+
+
+def load_routes() -> List[Route]:
+    server_js = Path(API_SOURCE_DIR) / "server.js"
+    if not server_js.exists():
+        return []
+    return parse_server_routes(server_js.read_text(encoding="utf8"))
+
+
+# -----------------------------
+# git helpers
+# -----------------------------
+def _relative_to(path: Path, root: Path) -> str:
+    try:
+        return Path(path).resolve().relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return Path(path).name
+
+
+def repo_root(start: Path) -> Path:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"], cwd=start, capture_output=True, text=True, check=True
+        )
+        return Path(out.stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return start.parent
+
+
+def changed_files(root: Path, ref: str) -> List[str]:
+    """Files changed between `ref` and the working tree, plus untracked files."""
+    diff = subprocess.run(["git", "diff", "--name-only", ref], cwd=root, capture_output=True, text=True, check=True)
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard"], cwd=root, capture_output=True, text=True, check=True
+    )
+    return sorted({f for f in (diff.stdout + untracked.stdout).splitlines() if f})
+
+
+def changed_lines(root: Path, ref: str, path: str) -> Set[int]:
+    """New-side line numbers touched in `path` (deleted lines map to the line after them)."""
+    out = subprocess.run(["git", "diff", "-U0", ref, "--", path], cwd=root, capture_output=True, text=True, check=True)
+    touched: Set[int] = set()
+    for m in re.finditer(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", out.stdout, re.M):
+        start, count = int(m.group(1)), int(m.group(2) or "1")
+        touched.update(range(start, start + max(count, 1)))
+    return touched
+
+
+# -----------------------------
+# Recording
+# -----------------------------
+class ImpactRecorder:
+    """pytest plugin that records, per test, the Python files executed and API routes hit.
+
+    Python files come from a call-only trace function (no line events), API routes from
+    the URLs of requests made through the instrumented api_context and browser pages.
+    Files executed while setting up a fixture of wider than function scope are recorded
+    as `shared_files` instead: only the first test that needs such a fixture runs its
+    setup, yet every later test depends on it.
+    """
+
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        self.root = repo_root(Path(config.rootpath))
+        self.routes = load_routes()
+        self.ui_origin = urlparse(UI_BASE_URL).netloc
+        self.tests: Dict[str, dict] = {}
+        self._current: Optional[dict] = None
+        self._files: Set[str] = set()
+        self._shared_depth = 0
+        self._shared_files: Set[str] = set()
+
+    def _trace(self, frame, event, arg):
+        if event == "call":
+            self._files.add(frame.f_code.co_filename)
+            if self._shared_depth:
+                self._shared_files.add(frame.f_code.co_filename)
+        return None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        shared = fixturedef.scope != "function"
+        self._shared_depth += shared
+        try:
+            yield
+        finally:
+            self._shared_depth -= shared
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item: pytest.Item, nextitem):
+        self._current = {"routes": set(), "ui": False}
+        self._files = set()
+        sys.settrace(self._trace)
+        threading.settrace(self._trace)
+        try:
+            yield
+        finally:
+            sys.settrace(None)
+            threading.settrace(None)
+            self.tests[item.nodeid] = {
+                "files": sorted(self._relative(self._files)),
+                "routes": sorted(self._current["routes"]),
+                "ui": self._current["ui"],
+            }
+            self._current = None
+
+    def _relative(self, filenames: Iterable[str]) -> Set[str]:
+        rel = set()
+        for name in filenames:
+            if "site-packages" in name or name.startswith("<"):
+                continue
+            try:
+                rel.add(Path(name).resolve().relative_to(self.root).as_posix())
+            except ValueError:
+                continue  # stdlib
+        return rel
+
+    def on_request(self, method: str, url: str, *_: object) -> None:
+        """Listener for api_context and page requests made during the current test."""
+        if self._current is None:
+            return
+        if urlparse(url).netloc == self.ui_origin:
+            self._current["ui"] = True
+        key = route_for(method, url, self.routes)
+        if key:
+            self._current["routes"].add(key)
+
+    def on_page_request(self, request) -> None:
+        self.on_request(request.method, request.url)
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        if self.tests:
+            IMPACT_MAP_DIR.mkdir(parents=True, exist_ok=True)
+            partial = IMPACT_MAP_DIR / f"partial-{worker or 'master'}.json"
+            shared = sorted(self._relative(self._shared_files))
+            partial.write_text(json.dumps({"tests": self.tests, "shared_files": shared}), encoding="utf8")
+        if worker is None:
+            # Controller (or a non-xdist run): workers have finished, fold their partials in.
+            merge_partials()
+
+
+def merge_partials() -> Optional[Path]:
+    """Fold per-worker partial recordings into the persistent map.json."""
+    partials = sorted(IMPACT_MAP_DIR.glob("partial-*.json")) if IMPACT_MAP_DIR.exists() else []
+    if not partials:
+        return None
+    map_path = IMPACT_MAP_DIR / "map.json"
+    data = load_map() or {"version": 1, "tests": {}}
+    shared = set(data.get("shared_files", ()))
+    for partial in partials:
+        recorded = json.loads(partial.read_text(encoding="utf8"))
+        data["tests"].update(recorded["tests"])
+        shared.update(recorded.get("shared_files", ()))  # absent in maps recorded before it existed
+        partial.unlink()
+    data["shared_files"] = sorted(shared)
+    map_path.write_text(json.dumps(data, indent=1, sort_keys=True), encoding="utf8")
+    return map_path
+
+
+def load_map() -> Optional[dict]:
+    map_path = IMPACT_MAP_DIR / "map.json"
+    if not map_path.exists():
+        return None
+    try:
+        return json.loads(map_path.read_text(encoding="utf8"))
+    except ValueError:
+        return None
+
+
+# -----------------------------
+# Selection
+# -----------------------------
+def affected_tests(
+    nodeids: Iterable[str], impact_map: Optional[dict], root: Path, rootdir: Path, ref: str
+) -> Tuple[Optional[Set[str]], str]:
+    """Decide which tests a diff against `ref` affects.
+
+    Returns (selected nodeids, reason), or (None, reason) when a full run is required.
+    Tests missing from the map (new or never recorded) are always selected, and so are tests
+    with no recorded routes when the API sources change.
+    """
+    if not impact_map:
+        return None, "no impact map recorded yet (run with --record-impact)"
+    try:
+        files = changed_files(root, ref)
+    except (OSError, subprocess.CalledProcessError) as exc:
+        return None, f"git diff against {ref!r} failed: {exc}"
+
+    api_rel = _relative_to(Path(API_SOURCE_DIR), root)
+    tests_rel = _relative_to(rootdir, root)
+    global_files = {f"{tests_rel}/{f}" for f in GLOBAL_FILES}
+    shared_files = set(impact_map.get("shared_files", ()))
+    server_lines = set().union(*(r.lines for r in load_routes()))
+
+    changed_py: Set[str] = set()
+    changed_routes: Set[str] = set()
+    all_routes = False
+    api_changed = False
+    ui_changed = False
+    for f in files:
+        if any(p.match(f) for p in IGNORED_PATTERNS):
+            continue
+        if f in global_files:
+            return None, f"global file changed: {f}"
+        if f in shared_files:
+            return None, f"file used by a shared fixture changed: {f}"
+        if f.startswith(f"{api_rel}/"):
+            api_changed = True
+        if f == f"{api_rel}/server.js":
+            lines = changed_lines(root, ref, f)
+            changed_routes |= {r.key for r in load_routes() if r.lines & lines}
+            if lines - server_lines:
+                all_routes = True  # shared middleware, helpers or the OpenAPI spec changed
+        elif f.startswith(f"{api_rel}/"):
+            all_routes = True
+        elif f.startswith("TestProduct/UI/"):
+            ui_changed = True
+        elif f.startswith(f"{tests_rel}/") and f.endswith(".py"):
+            changed_py.add(f)
+        else:
+            return None, f"unmapped file changed: {f}"
+
+    recorded = impact_map.get("tests", {})
+    selected = set()
+    for nodeid in nodeids:
+        entry = recorded.get(nodeid)
+        test_file = f"{tests_rel}/" + nodeid.split("::", 1)[0]
+        if entry is None or test_file in changed_py:
+            selected.add(nodeid)
+            continue
+        if changed_py & set(entry["files"]):
+            selected.add(nodeid)
+        elif entry["routes"] and (all_routes or changed_routes & set(entry["routes"])):
+            selected.add(nodeid)
+        elif api_changed and not entry["routes"]:
+            # Requests outside the instrumented clients are not recorded, so no routes can
+            # also mean "unknown".
+            selected.add(nodeid)
+        elif ui_changed and entry["ui"]:
+            selected.add(nodeid)
+    return selected, f"{len(files)} changed file(s) since {ref}"
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple
+
+import pytest
+
+from config.settings import ARTIFACTS_DIR, MEMORY_HEADROOM
+
+try:
+    import psutil
+except ImportError:  # optional: the monitor is disabled without it
+    psutil = None
+
+_MB = 1024 * 1024
+
+
+def footprint(pid: Optional[int] = None) -> Tuple[float, float, int]:
+    """RSS in MB of the process and of all its descendants (Playwright driver + browsers)."""
+    proc = psutil.Process(pid or os.getpid())
+    own = proc.memory_info().rss / _MB
+    children = 0.0
+    count = 0
+    for child in proc.children(recursive=True):
+        try:
+            children += child.memory_info().rss / _MB
+            count += 1
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue  # exited between listing and sampling
+    return own, children, count
+
+
+def child_pids(pid: Optional[int] = None) -> Set[int]:
+    """PIDs of all descendants of the process (default: this one)."""
+    return {child.pid for child in psutil.Process(pid or os.getpid()).children(recursive=True)}
+
+
+def tree_rss(pids: Iterable[int]) -> float:
+    """RSS in MB of the given processes and their descendants; exited ones count as 0."""
+    procs = {}
+    for pid in pids:
+        try:
+            proc = psutil.Process(pid)
+            procs[pid] = proc
+            procs.update((child.pid, child) for child in proc.children(recursive=True))
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    total = 0.0
+    for proc in procs.values():
+        try:
+            total += proc.memory_info().rss / _MB
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total
+
+
+def recommended_workers(peak_worker_mb: float, available_mb: float, headroom: float = MEMORY_HEADROOM) -> int:
+    if peak_worker_mb <= 0:
+        return 1
+    return max(1, math.floor(available_mb * headroom / peak_worker_mb))
+
+
+class MemoryMonitor:
+    """pytest plugin sampling worker and browser RSS at test boundaries.
+
+    A sample is taken before setup and after teardown of every test; the difference is the
+    test's growth (a steadily positive value points at leaked pages or contexts). Recycling
+    a bloated browser is left to the BrowserManager behind session_browser.
+    """
+
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        self.tests: List[list] = []  # [nodeid, worker_mb_after, browser_mb_after, growth_mb]
+        self.peak_mb = 0.0
+        self._before = 0.0
+        self.summary: Optional[dict] = None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        own, children, _ = footprint()
+        self._before = own + children
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_runtest_teardown(self, item: pytest.Item, nextitem: Optional[pytest.Item]) -> None:
+        # trylast: runs after the item's fixtures have been torn down.
+        own, children, _ = footprint()
+        total = own + children
+        growth = total - self._before
+        self.peak_mb = max(self.peak_mb, total)
+        self.tests.append([item.nodeid, round(own, 1), round(children, 1), round(growth, 1)])
+        item.user_properties.append(("rss_growth_mb", round(growth, 1)))
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        if self.tests:
+            ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+            partial = ARTIFACTS_DIR / f"memory-{worker or 'master'}.json"
+            partial.write_text(
+                json.dumps({"peak_mb": round(self.peak_mb, 1), "tests": self.tests}),
+                encoding="utf8",
+            )
+        if worker is None:
+            self.summary = merge_partials(ARTIFACTS_DIR)
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.summary:
+            return
+        s = self.summary
+        terminalreporter.section("memory")
+        terminalreporter.write_line(
+            f"peak per worker: {s['peak_worker_mb']:.0f} MB over {s['workers']} worker(s), "
+            f"available RAM: {s['available_mb']:.0f} MB"
+        )
+        terminalreporter.write_line(f"recommended workers: -n {s['recommended_workers']}")
+        growers = [t for t in s["top_growth"] if t[3] > 0]
+        if growers:
+            terminalreporter.write_line("largest growth per test:")
+            for nodeid, _, _, growth in growers:
+                terminalreporter.write_line(f"  +{growth:.1f} MB  {nodeid}")
+        terminalreporter.write_line(f"full report: {ARTIFACTS_DIR / 'memory.json'}")
+
+
+def merge_partials(out_dir: Path, top: int = 10) -> Optional[dict]:
+    """Fold per-worker samples into memory.json and compute the worker recommendation."""
+    partials = sorted(out_dir.glob("memory-*.json")) if out_dir.exists() else []
+    if not partials:
+        return None
+    peaks, tests = [], []
+    for partial in partials:
+        data = json.loads(partial.read_text(encoding="utf8"))
+        peaks.append(data["peak_mb"])
+        tests.extend(data["tests"])
+        partial.unlink()
+    # Workers have exited by now, so "available" is what the next run can hand out.
+    available_mb = psutil.virtual_memory().available / _MB
+    summary = {
+        "workers": len(peaks),
+        "peak_worker_mb": max(peaks),
+        "available_mb": round(available_mb, 1),
+        "recommended_workers": recommended_workers(max(peaks), available_mb),
+        "top_growth": sorted(tests, key=lambda t: t[3], reverse=True)[:top],
+        "tests": tests,
+    }
+    (out_dir / "memory.json").write_text(json.dumps(summary, indent=1), encoding="utf8")
+    return summary
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from playwright.async_api import BrowserContext, async_playwright
+from playwright.sync_api import Page as SyncPage
+
+from config.settings import BASE_URL, READONLY_BATCH_CONCURRENCY
+from pages.async_home_page import AsyncHomePage
+from pages.home_page import HomePage
+from utils.browser_profile import ResourceBlocker
+
+# A read-only check receives the dashboard page object of a fresh, authenticated page and
+# raises on failure. It only awaits page object methods, so it also runs on a sync page.
+ReadOnlyCheck = Callable[[AsyncHomePage], Awaitable[None]]
+# (exception or None, elapsed ms)
+CheckResult = Tuple[Optional[BaseException], float]
+
+
+class ReadOnlyRunner:
+    """Drive read-only UI checks as concurrent pages through Playwright's async API.
+
+    The async browser lives on a private event loop in a background thread, so it does not
+    interfere with the sync Playwright instance used by the other fixtures. `run_batch` opens
+    one authenticated context and runs every check in its own page concurrently (bounded by
+    `concurrency`); `run_single` gives a check a context of its own, like auth_page does.
+    """
+
+    def __init__(
+        self,
+        *,
+        browser_name: str,
+        headless: bool,
+        storage_state: str,
+        token: str,
+        concurrency: int = READONLY_BATCH_CONCURRENCY,
+        launch_options: Optional[dict] = None,
+        blocker: Optional[ResourceBlocker] = None,
+    ) -> None:
+        self.browser_name = browser_name
+        self.headless = headless
+        self.storage_state = storage_state
+        self.token = token
+        self.concurrency = max(1, concurrency)
+        self.launch_options = launch_options or {}
+        self.blocker = blocker
+        self.results: Dict[str, CheckResult] = {}
+        self._batched: Set[str] = set()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="readonly-ui", daemon=True)
+        self._thread.start()
+        self._playwright = None
+        self._browser = None
+        self._call(self._start())
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _start(self) -> None:
+        self._playwright = await async_playwright().start()
+        self._browser = await getattr(self._playwright, self.browser_name).launch(
+            headless=self.headless, **self.launch_options
+        )
+
+    async def _new_context(self) -> BrowserContext:
+        context = await self._browser.new_context(storage_state=self.storage_state, base_url=BASE_URL)
+        # Same token injection as auth_page, applied before any app script runs.
+        await context.add_init_script("window.localStorage.setItem('token', '" + self.token + "')")
+        if self.blocker is not None and self.blocker.active:
+            await context.route("**/*", self.blocker.handle_async)
+        return context
+
+    async def _run_check(self, context: BrowserContext, check: ReadOnlyCheck) -> CheckResult:
+        page = await context.new_page()
+        start = time.perf_counter()
+        try:
+            await check(AsyncHomePage(page))
+            error = None
+        except BaseException as exc:  # reported on the owning test, not here
+            error = exc
+        finally:
+            await page.close()
+        return error, (time.perf_counter() - start) * 1000
+
+    async def _batch(self, checks: Dict[str, ReadOnlyCheck]) -> None:
+        context = await self._new_context()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(nodeid: str, check: ReadOnlyCheck) -> None:
+            async with semaphore:
+                self.results[nodeid] = await self._run_check(context, check)
+
+        try:
+            await asyncio.gather(*(run(nodeid, check) for nodeid, check in checks.items()))
+        finally:
+            await context.close()
+
+    async def _single(self, check: ReadOnlyCheck) -> CheckResult:
+        context = await self._new_context()
+        try:
+            return await self._run_check(context, check)
+        finally:
+            await context.close()
+
+    def run_batch(self, checks: Dict[str, ReadOnlyCheck]) -> None:
+        """Run all pending `checks` (nodeid -> check) concurrently; results land in `results`."""
+        pending = {nodeid: check for nodeid, check in checks.items() if nodeid not in self._batched}
+        if pending:
+            self._batched.update(pending)
+            self._call(self._batch(pending))
+
+    def take(self, nodeid: str) -> Optional[CheckResult]:
+        """Pop the batched result for `nodeid`; None once taken (a retry then runs it alone)."""
+        return self.results.pop(nodeid, None)
+
+    def run_single(self, check: ReadOnlyCheck) -> CheckResult:
+        return self._call(self._single(check))
+
+    def close(self) -> None:
+        try:
+            if self._browser is not None:
+                self._call(self._browser.close())
+            if self._playwright is not None:
+                self._call(self._playwright.stop())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+
+
+class _Ready:
+    """An awaitable that is already done (the sync call has returned)."""
+
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def __await__(self):
+        return self.value
+        yield  # makes __await__ a generator
+
+
+class _SyncHome:
+    """HomePage whose methods are awaitable, so an async check can drive it."""
+
+    def __init__(self, page: SyncPage) -> None:
+        self._home = HomePage(page)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._home, name)
+        if not callable(attr):
+            return attr
+        return lambda *args, **kwargs: _Ready(attr(*args, **kwargs))
+
+
+def run_on_sync_page(check: ReadOnlyCheck, page: SyncPage) -> CheckResult:
+    """Run `check` on a sync page (no --readonly-batch), without a second browser.
+
+    Every await in a check resolves immediately against the sync HomePage, so the coroutine
+    completes in a single step.
+    """
+    start = time.perf_counter()
+    coro = check(_SyncHome(page))
+    try:
+        coro.send(None)
+    except StopIteration:
+        error = None
+    except BaseException as exc:  # reported on the owning test, like the batch
+        error = exc
+    else:
+        coro.close()
+        error = RuntimeError(f"{check.__name__} awaited something other than a page object method")
+    return error, (time.perf_counter() - start) * 1000
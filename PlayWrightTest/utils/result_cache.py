@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import inspect
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Set
+
+import pytest
+from _pytest.reports import TestReport
+
+from config.settings import API_SOURCE_DIR, RESULT_CACHE_DIR
+
+# Server code whose behaviour the cached API tests depend on.
+API_SOURCE_FILES = ("server.js", "store.js")
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+SETTINGS_FILE = PROJECT_DIR / "config" / "settings.py"
+
+
+def _sha(*parts: bytes) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def api_source_hash(api_dir: Path = API_SOURCE_DIR) -> str:
+    parts = []
+    for name in API_SOURCE_FILES:
+        path = Path(api_dir) / name
+        parts.append(path.read_bytes() if path.exists() else b"")
+    return _sha(*parts)
+
+
+class ResultCache:
+    """pytest plugin that skips unchanged, previously-passing deterministic tests.
+
+    Only tests marked `deterministic` are eligible. The key combines the test module source,
+    the project modules it imports (transitively, e.g. the utils/ code a unit test covers),
+    the source of every fixture in the test's closure, config/settings.py and the TestProduct
+    API sources, plus the node id (so parametrized cases are distinct). A hit is reported
+    as a passing test with the "cached" status; a miss runs normally and stores the key when
+    its call phase passed and no phase failed (a skipped test is never cached).
+
+    A dry run marks would-be hits on the setup report, so the controller lists them under
+    xdist as well.
+    """
+
+    def __init__(self, config: pytest.Config, *, dry_run: bool = False) -> None:
+        self.config = config
+        self.dry_run = dry_run
+        self.cache_dir = Path(RESULT_CACHE_DIR)
+        self.keys: Dict[str, str] = {}
+        self.hits: List[str] = []
+        self.would_hit: List[str] = []
+        self._would_hit: set = set()
+        self._passed: set = set()
+        self._failed: set = set()
+        self._file_hashes: Dict[str, str] = {}
+        self._func_hashes: Dict[object, str] = {}
+        self._import_hashes: Dict[str, str] = {}
+        self._shared = _sha(api_source_hash().encode(), self._file_hash(SETTINGS_FILE).encode())
+
+    # ---------- key computation ----------
+    def _file_hash(self, path: Path) -> str:
+        key = str(path)
+        if key not in self._file_hashes:
+            self._file_hashes[key] = _sha(Path(path).read_bytes()) if Path(path).exists() else ""
+        return self._file_hashes[key]
+
+    def _func_hash(self, func) -> str:
+        if func not in self._func_hashes:
+            try:
+                source = inspect.getsource(func)
+            except (OSError, TypeError):
+                source = repr(func)
+            self._func_hashes[func] = _sha(source.encode())
+        return self._func_hashes[func]
+
+    @staticmethod
+    def _project_file(module: ModuleType) -> Optional[Path]:
+        path = getattr(module, "__file__", None)
+        if not path:
+            return None
+        path = Path(path).resolve()
+        if PROJECT_DIR not in path.parents or "site-packages" in path.parts:
+            return None
+        return path
+
+    def _imports_hash(self, module: ModuleType) -> str:
+        """Hash of every project module reachable from `module`'s globals (imported modules,
+        and the modules of imported classes and functions)."""
+        if module.__name__ not in self._import_hashes:
+            seen: Set[str] = {module.__name__}
+            pending = [module]
+            files: Set[Path] = set()
+            while pending:
+                for value in vars(pending.pop()).values():
+                    name = value.__name__ if isinstance(value, ModuleType) else getattr(value, "__module__", None)
+                    dep = sys.modules.get(name) if isinstance(name, str) else None
+                    if dep is None or dep.__name__ in seen:
+                        continue
+                    seen.add(dep.__name__)
+                    path = self._project_file(dep)
+                    if path is not None:
+                        files.add(path)
+                        pending.append(dep)
+            self._import_hashes[module.__name__] = _sha(*(f"{p}:{self._file_hash(p)}".encode() for p in sorted(files)))
+        return self._import_hashes[module.__name__]
+
+    def key_for(self, item: pytest.Item) -> str:
+        parts = [item.nodeid.encode(), self._shared.encode(), self._file_hash(Path(item.path)).encode()]
+        module = getattr(item, "module", None)
+        if module is not None:
+            parts.append(self._imports_hash(module).encode())
+        fixtureinfo = getattr(item, "_fixtureinfo", None)
+        for name in sorted(getattr(fixtureinfo, "name2fixturedefs", {})):
+            for fixturedef in fixtureinfo.name2fixturedefs[name]:
+                parts.append(f"{name}:{self._func_hash(fixturedef.func)}".encode())
+        return _sha(*parts)
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    # ---------- hooks ----------
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config: pytest.Config, items: list) -> None:
+        for item in items:
+            if item.get_closest_marker("deterministic") and not item.get_closest_marker("skip"):
+                self.keys[item.nodeid] = self.key_for(item)
+        if self.dry_run:
+            self._would_hit = {nodeid for nodeid, key in self.keys.items() if self._entry(key).exists()}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item: pytest.Item, nextitem) -> Optional[bool]:
+        key = self.keys.get(item.nodeid)
+        if self.dry_run or key is None or not self._entry(key).exists():
+            return None
+        self.hits.append(item.nodeid)
+        ihook = item.ihook
+        ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for when in ("setup", "call", "teardown"):
+            report = TestReport(
+                item.nodeid, item.location, {k: 1 for k in item.keywords}, "passed", None, when,
+                user_properties=[("result_cache", "hit")],
+            )
+            ihook.pytest_runtest_logreport(report=report)
+        ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call):
+        outcome = yield
+        if call.when == "setup" and item.nodeid in self._would_hit:
+            outcome.get_result().user_properties.append(("result_cache", "would-hit"))
+
+    def pytest_runtest_logreport(self, report: TestReport) -> None:
+        # Controller side (also without xdist): collect the dry run's would-be hits.
+        if ("result_cache", "would-hit") in report.user_properties:
+            self.would_hit.append(report.nodeid)
+        key = self.keys.get(report.nodeid)
+        if key is None or ("result_cache", "hit") in report.user_properties:
+            return
+        if report.failed:
+            self._failed.add(report.nodeid)
+        elif report.when == "call" and report.passed:
+            self._passed.add(report.nodeid)
+        if (
+            report.when == "teardown"
+            and report.passed
+            and report.nodeid in self._passed
+            and report.nodeid not in self._failed
+        ):
+            entry = self._entry(key)
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            entry.write_text(json.dumps({"nodeid": report.nodeid, "outcome": "passed", "ts": time.time()}), encoding="utf8")
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.dry_run:
+            return
+        terminalreporter.section("Result cache (dry run)")
+        terminalreporter.write_line(f"{len(self.would_hit)} test(s) would be skipped as cached passes")
+        for nodeid in sorted(self.would_hit):
+            terminalreporter.write_line(f"  cached-pass: {nodeid}")
+
+    def pytest_report_teststatus(self, report: TestReport, config: pytest.Config):
+        if report.when == "call" and ("result_cache", "hit") in report.user_properties:
+            return "cached", "c", "CACHED PASS"
+        return None
+
+
+def clear(cache_dir: Path = RESULT_CACHE_DIR) -> int:
+    """Invalidate the whole cache. Returns the number of entries removed."""
+    cache_dir = Path(cache_dir)
+    if not cache_dir.exists():
+        return 0
+    removed = sum(1 for _ in cache_dir.rglob("*.json"))
+    shutil.rmtree(cache_dir)
+    return removed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the persistent test result cache.")
+    parser.add_argument("command", choices=("clear", "stats"))
+    args = parser.parse_args(argv)
+    if args.command == "clear":
+        print(f"Removed {clear()} cached result(s) from {RESULT_CACHE_DIR}")
+    else:
+        count = sum(1 for _ in Path(RESULT_CACHE_DIR).rglob("*.json")) if Path(RESULT_CACHE_DIR).exists() else 0
+        print(f"{count} cached result(s) in {RESULT_CACHE_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+import pytest
+
+# Messages that point at the environment rather than the product behaviour under test.
+_INFRA_PATTERNS = [
+    (re.compile(r"ECONNRESET|socket hang up|Connection reset", re.I), "connection reset"),
+    (re.compile(r"ECONNREFUSED|Connection refused|Failed to establish a new connection", re.I), "connection refused"),
+    (re.compile(r"net::ERR_(CONNECTION|EMPTY_RESPONSE|NETWORK|INTERNET|ABORTED|TIMED_OUT)\w*"), "browser network error"),
+    (re.compile(r"Target (page, context or browser|closed) has been closed|Browser has been closed|browser has disconnected", re.I), "browser crashed"),
+]
+
+# A 5xx is only infra when a transport layer raised it (e.g. requests' raise_for_status).
+# Assertion messages quoting a status are product failures: the API answered 500 to a test.
+_TRANSPORT_5XX = re.compile(r"\b(HTTP|status)\s*:?\s*5\d\d\b|\b(502|503|504)\b.*(Bad Gateway|Service Unavailable|Gateway Time-?out)", re.I)
+
+# Navigation timeouts are only treated as infra while the worker is warming up (first loads
+# of the Angular dev server compile bundles on demand and can be very slow).
+_NAVIGATION_TIMEOUT = re.compile(r"Timeout \d+ms exceeded.*(navigat|goto|load state)", re.I | re.S)
+
+_INFRA_EXCEPTIONS = ("ConnectionError", "ConnectionResetError", "ConnectionRefusedError", "RemoteDisconnected")
+
+# FixtureDef.cached_result is private: (value, cache_key, error or None) from pytest 7.4 to
+# 9.x (the error is an exc_info triple before 8.0, (exc, tb) since). Outside that range
+# failed fixtures stay cached, so a retry fails the same way rather than misread the tuple.
+_CACHED_RESULT_LAYOUT_KNOWN = (7, 4) <= tuple(pytest.version_tuple[:2]) < (10, 0)
+
+
+def classify_failure(excinfo: Optional[pytest.ExceptionInfo], *, warmup: bool = False) -> Optional[str]:
+    """Return a short infra reason if the failure looks environmental, else None.
+
+    None means a real failure (assertion, product bug) that must not be retried.
+    """
+    if excinfo is None:
+        return None
+    if excinfo.errisinstance((pytest.skip.Exception, pytest.xfail.Exception)):
+        return None
+    if type(excinfo.value).__name__ in _INFRA_EXCEPTIONS:
+        return type(excinfo.value).__name__
+    message = str(excinfo.value)
+    for pattern, reason in _INFRA_PATTERNS:
+        if pattern.search(message):
+            return reason
+    if not excinfo.errisinstance(AssertionError) and _TRANSPORT_5XX.search(message):
+        return "server 5xx"
+    if warmup and _NAVIGATION_TIMEOUT.search(message):
+        return "navigation timeout during warmup"
+    return None
+
+
+def remove_failed_fixture_results(item: pytest.Item) -> None:
+    """Drop cached errors of failed fixtures so a retry sets them up again.
+
+    Successful (warm) fixtures such as the session browser and API context keep their
+    cached values and are reused as-is.
+    """
+    if not _CACHED_RESULT_LAYOUT_KNOWN:
+        return
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    for fixturedefs in getattr(fixtureinfo, "name2fixturedefs", {}).values():
+        for fixturedef in fixturedefs:
+            cached = getattr(fixturedef, "cached_result", None)
+            if isinstance(cached, tuple) and len(cached) == 3 and cached[2] is not None:
+                fixturedef.cached_result = None
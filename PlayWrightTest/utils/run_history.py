@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import subprocess
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from config.settings import FLAKE_MIN_RUNS, FLAKE_THRESHOLD, FLAKE_WINDOW, RUN_HISTORY_DB
+
+LANES = ("all", "main", "quarantine")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY, started REAL, finished REAL, git_sha TEXT, lane TEXT, exitstatus INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT, nodeid TEXT, outcome TEXT, duration REAL, worker TEXT, retries INTEGER,
+    quarantined INTEGER, PRIMARY KEY (run_id, nodeid)
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id TEXT, nodeid TEXT, idx INTEGER, name TEXT, status TEXT, duration_ms REAL
+);
+CREATE INDEX IF NOT EXISTS results_nodeid ON results (nodeid);
+"""
+
+# Outcomes that say nothing about flakiness (expected failures are known, not flaky).
+_NEUTRAL = ("skipped", "cached", "xfailed", "xpassed")
+
+# xfail reason of auto-/marker-quarantined tests in the "all" lane; those xfails are
+# recorded with their real outcome so the test can leave quarantine again.
+QUARANTINE_REASON = "quarantined"
+
+
+def connect(db_path: Path = RUN_HISTORY_DB) -> sqlite3.Connection:
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def git_sha(cwd: Path) -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def new_result(worker: str = "master") -> dict:
+    return {"outcome": "passed", "duration": 0.0, "worker": worker, "retries": 0}
+
+
+def accumulate(entry: dict, report) -> None:
+    """Fold one phase report (setup/call/teardown, possibly retried) into a test's result."""
+    props = dict(report.user_properties)
+    entry["duration"] += report.duration
+    entry["retries"] = max(entry["retries"], props.get("infra_retries", 0))
+    if ("result_cache", "hit") in report.user_properties:
+        entry["outcome"] = "cached"
+    elif report.failed:
+        entry["outcome"] = "failed"
+    elif hasattr(report, "wasxfail") and entry["outcome"] == "passed":
+        if report.wasxfail.startswith(QUARANTINE_REASON):
+            # Quarantined tests run as xfail; keep their real outcome for scoring.
+            entry["outcome"] = "failed" if report.skipped else "passed"
+        else:
+            entry["outcome"] = "xfailed" if report.skipped else "xpassed"
+    elif report.skipped and entry["outcome"] == "passed":
+        entry["outcome"] = "skipped"
+
+
+def record_run(
+    conn: sqlite3.Connection,
+    run: tuple,
+    results: Dict[str, dict],
+    steps: List[tuple],
+    quarantine: Dict[str, float],
+) -> None:
+    """Insert one run: `run` is (id, started, finished, git_sha, lane, exitstatus)."""
+    run_id = run[0]
+    conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)", run)
+    conn.executemany(
+        "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (run_id, nodeid, r["outcome"], round(r["duration"], 3), r["worker"], r["retries"],
+             int(nodeid in quarantine))
+            for nodeid, r in results.items()
+        ],
+    )
+    conn.executemany("INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?)", steps)
+
+
+# -----------------------------
+# Queries
+# -----------------------------
+def _recent_outcomes(conn: sqlite3.Connection, window: int) -> Dict[str, List[Tuple[str, int]]]:
+    """nodeid -> [(outcome, retries)] over the last `window` runs, oldest first."""
+    rows = conn.execute(
+        """
+        SELECT r.nodeid, r.outcome, r.retries FROM results r
+        JOIN (SELECT id, started FROM runs ORDER BY started DESC LIMIT ?) recent ON recent.id = r.run_id
+        ORDER BY recent.started
+        """,
+        (window,),
+    )
+    history: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+    for nodeid, outcome, retries in rows:
+        if outcome not in _NEUTRAL:
+            history[nodeid].append((outcome, retries or 0))
+    return history
+
+
+def flake_scores(conn: sqlite3.Connection, window: int = FLAKE_WINDOW) -> Dict[str, Tuple[float, int]]:
+    """nodeid -> (score, runs). Score = (pass/fail flips + passes that needed retries) / (runs - 1)."""
+    scores = {}
+    for nodeid, outcomes in _recent_outcomes(conn, window).items():
+        runs = len(outcomes)
+        if runs < 2:
+            scores[nodeid] = (0.0, runs)
+            continue
+        flips = sum(1 for a, b in zip(outcomes, outcomes[1:]) if (a[0] == "passed") != (b[0] == "passed"))
+        retried = sum(1 for outcome, retries in outcomes if outcome == "passed" and retries)
+        scores[nodeid] = (min(1.0, (flips + retried) / (runs - 1)), runs)
+    return scores
+
+
+def quarantined(
+    conn: sqlite3.Connection,
+    threshold: float = FLAKE_THRESHOLD,
+    min_runs: int = FLAKE_MIN_RUNS,
+    window: int = FLAKE_WINDOW,
+) -> Dict[str, float]:
+    return {n: s for n, (s, runs) in flake_scores(conn, window).items() if runs >= min_runs and s >= threshold}
+
+
+def mean_durations(conn: sqlite3.Connection, window: int = FLAKE_WINDOW) -> Dict[str, float]:
+    """nodeid -> mean duration (seconds) over the last `window` runs."""
+    return {t["nodeid"]: t["mean_s"] for t in duration_trends(conn, window)}
+
+
+def duration_trends(conn: sqlite3.Connection, window: int = FLAKE_WINDOW) -> List[dict]:
+    """Per-test mean duration and least-squares slope (seconds per run) over recent runs."""
+    rows = conn.execute(
+        """
+        SELECT r.nodeid, r.duration FROM results r
+        JOIN (SELECT id, started FROM runs ORDER BY started DESC LIMIT ?) recent ON recent.id = r.run_id
+        WHERE r.outcome NOT IN ('skipped', 'cached')
+        ORDER BY recent.started
+        """,
+        (window,),
+    )
+    series: Dict[str, List[float]] = defaultdict(list)
+    for nodeid, duration in rows:
+        series[nodeid].append(duration)
+    trends = []
+    for nodeid, ys in series.items():
+        n = len(ys)
+        mean_y = sum(ys) / n
+        slope = 0.0
+        if n > 1:
+            mean_x = (n - 1) / 2
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(ys)) / sum((x - mean_x) ** 2 for x in range(n))
+        trends.append({"nodeid": nodeid, "runs": n, "mean_s": round(mean_y, 3), "slope_s_per_run": round(slope, 4)})
+    trends.sort(key=lambda t: t["slope_s_per_run"], reverse=True)
+    return trends
+
+
+# -----------------------------
+# Plugin
+# -----------------------------
+class RunHistory:
+    """pytest plugin that stores every run in the SQLite history and applies quarantine.
+
+    Workers only tag reports (step timings travel as a user property); the controller, which
+    receives every report, writes the run in a single transaction at session end. Sharded
+    runs (--shard) are not written here: `python -m utils.sharding merge --history` imports
+    all shards as one run instead.
+
+    Lanes (--lane):
+      all        quarantined tests run as non-strict xfail, so they cannot fail the gate
+      main       quarantined tests are deselected
+      quarantine only quarantined tests run, and the exit status is always 0
+    """
+
+    def __init__(
+        self, config: pytest.Config, *, lane: str = "all", db_path: Path = RUN_HISTORY_DB, record: bool = True
+    ) -> None:
+        self.config = config
+        self.lane = lane
+        self.db_path = Path(db_path)
+        self.is_controller = not hasattr(config, "workerinput")
+        self.record = record
+        self.run_id = uuid.uuid4().hex
+        self.started = time.time()
+        self.quarantine: Dict[str, float] = {}
+        if self.db_path.exists():
+            with connect(self.db_path) as conn:
+                self.quarantine = quarantined(conn)
+        self._results: Dict[str, dict] = {}
+        self._steps: List[tuple] = []
+
+    def _is_quarantined(self, item: pytest.Item) -> bool:
+        return item.nodeid in self.quarantine or item.get_closest_marker("quarantine") is not None
+
+    def pytest_collection_modifyitems(self, config: pytest.Config, items: list) -> None:
+        if self.lane == "all":
+            for item in items:
+                if self._is_quarantined(item):
+                    score = self.quarantine.get(item.nodeid)
+                    reason = f"{QUARANTINE_REASON} (flake score {score:.2f})" if score is not None else QUARANTINE_REASON
+                    item.add_marker(pytest.mark.xfail(reason=reason, strict=False))
+            return
+        keep_quarantined = self.lane == "quarantine"
+        selected = [item for item in items if self._is_quarantined(item) == keep_quarantined]
+        deselected = [item for item in items if self._is_quarantined(item) != keep_quarantined]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    def pytest_runtest_logreport(self, report) -> None:
+        if not self.is_controller or not self.record:
+            return
+        node = getattr(report, "node", None)
+        entry = self._results.get(report.nodeid)
+        if entry is None:
+            entry = self._results[report.nodeid] = new_result(node.gateway.id if node is not None else "master")
+        accumulate(entry, report)
+        props = dict(report.user_properties)
+        for idx, (name, status, duration_ms) in enumerate(props.get("step_timings", ())):
+            self._steps.append((self.run_id, report.nodeid, idx, name, status, duration_ms))
+
+    def pytest_sessionfinish(self, session: pytest.Session, exitstatus: int) -> None:
+        if self.lane == "quarantine" and exitstatus == pytest.ExitCode.TESTS_FAILED:
+            session.exitstatus = pytest.ExitCode.OK  # non-blocking lane
+        if not self.is_controller or not self._results:
+            return
+        with connect(self.db_path) as conn:
+            run = (self.run_id, self.started, time.time(), git_sha(Path(self.config.rootpath)), self.lane, int(exitstatus))
+            record_run(conn, run, self._results, self._steps, self.quarantine)
+
+    def pytest_report_header(self, config: pytest.Config) -> Optional[str]:
+        if self.quarantine or self.lane != "all":
+            return f"run history: lane={self.lane}, {len(self.quarantine)} test(s) auto-quarantined"
+        return None
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the local test run history.")
+    parser.add_argument("command", choices=("flaky", "quarantine", "trends"))
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--db", type=Path, default=RUN_HISTORY_DB)
+    args = parser.parse_args(argv)
+    if not args.db.exists():
+        print(f"No run history at {args.db}")
+        return 1
+    with connect(args.db) as conn:
+        if args.command == "flaky":
+            scores = sorted(flake_scores(conn).items(), key=lambda kv: kv[1][0], reverse=True)
+            for nodeid, (score, runs) in scores[: args.limit]:
+                if score > 0:
+                    print(f"{score:5.2f}  {runs:>3} runs  {nodeid}")
+        elif args.command == "quarantine":
+            for nodeid, score in sorted(quarantined(conn).items(), key=lambda kv: kv[1], reverse=True):
+                print(f"{score:5.2f}  {nodeid}")
+        else:
+            for t in duration_trends(conn)[: args.limit]:
+                print(f"{t['slope_s_per_run']:+8.4f} s/run  mean {t['mean_s']:7.3f}s  {t['runs']:>3} runs  {t['nodeid']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from playwright.sync_api import APIRequestContext
+
+from config.settings import API_DATA_FILE, SEED_LAST_NAME
+
+_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def seed_first_name(index: int, prefix: str = "Seed") -> str:
+    """Return a letters-only first name for the given index (the API rejects digits)."""
+    # Fixed-width base-26 ('a' == 0) keeps names unique and sorted in creation order.
+    letters = ""
+    n = index
+    while n or len(letters) < 4:
+        n, rem = divmod(n, 26)
+        letters = _ALPHABET[rem] + letters
+    return f"{prefix}{letters.lower()}"
+
+
+def iter_seed_clients(count: int, prefix: str = "Seed", owner_id: int = 1) -> Iterator[dict]:
+    """Yield `count` valid client payloads (letters-only names, 18+ DOB, Male/Female).
+
+    Seeded clients are tagged by SEED_LAST_NAME so they can be bulk-removed later without
+    touching fixtures created by regular tests.
+    """
+    for i in range(count):
+        yield {
+            "firstName": seed_first_name(i, prefix),
+            "lastName": SEED_LAST_NAME,
+            "dob": f"19{50 + i % 50:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "sex": "Male" if i % 2 == 0 else "Female",
+            "createdByUserId": owner_id,
+        }
+
+
+def seed_clients_file(
+    count: int,
+    *,
+    data_file: Path = API_DATA_FILE,
+    prefix: str = "Seed",
+    owner_id: int = 1,
+) -> List[dict]:
+    """Bulk-load clients by writing straight into the API's JSON store.
+
+    The Node store re-reads `data.json` on every request, so the new rows are visible
+    immediately without a restart. This is the only practical way to reach 100k rows:
+    the HTTP path rewrites the whole file per POST (O(n^2) overall).
+    Do not run this while other tests are writing to the same store.
+    """
+    data_file = Path(data_file)
+    data = json.loads(data_file.read_text(encoding="utf8"))
+    clients = data.get("clients") or []
+    next_id = max((c.get("id") or 0 for c in clients), default=0) + 1
+
+    seeded = []
+    for offset, payload in enumerate(iter_seed_clients(count, prefix, owner_id)):
+        seeded.append({"id": next_id + offset, **payload})
+
+    # The API lists newest first (createClient uses unshift); keep that ordering.
+    data["clients"] = list(reversed(seeded)) + clients
+    _atomic_write_json(data_file, data)
+    return seeded
+
+
+def seed_clients_api(
+    api_context: APIRequestContext,
+    count: int,
+    *,
+    prefix: str = "Seed",
+) -> List[dict]:
+    """Create clients through `POST /clients`.
+
+    Requests are sent sequentially on purpose: the store does an unlocked read-modify-write
+    of `data.json`, so concurrent POSTs lose writes and can reuse ids.
+    """
+    created = []
+    for payload in iter_seed_clients(count, prefix):
+        payload.pop("createdByUserId")
+        resp = api_context.post(
+            "/clients",
+            data=json.dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
+        if not resp.ok:
+            raise RuntimeError(f"Seeding failed at {payload['firstName']}: {resp.status} {resp.text()}")
+        created.append(resp.json())
+    return created
+
+
+def purge_seeded_clients_file(data_file: Path = API_DATA_FILE) -> int:
+    """Remove every seeded client from the JSON store. Returns the number removed."""
+    data_file = Path(data_file)
+    data = json.loads(data_file.read_text(encoding="utf8"))
+    clients = data.get("clients") or []
+    kept = [c for c in clients if c.get("lastName") != SEED_LAST_NAME]
+    removed = len(clients) - len(kept)
+    if removed:
+        data["clients"] = kept
+        _atomic_write_json(data_file, data)
+    return removed
+
+
+def purge_seeded_clients_api(api_context: APIRequestContext) -> int:
+    """Delete every seeded client visible to the current user through the API."""
+    resp = api_context.get("/clients")
+    if not resp.ok:
+        raise RuntimeError(f"Failed to list clients: {resp.status} {resp.text()}")
+    removed = 0
+    for client in resp.json():
+        if client.get("lastName") == SEED_LAST_NAME:
+            if api_context.delete(f"/clients/{client['id']}").ok:
+                removed += 1
+    return removed
+
+
+def _atomic_write_json(path: Path, data: dict) -> None:
+    # Write-then-rename so the API never reads a half-written file.
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf8")
+    os.replace(tmp, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-load or purge seeded TestProduct clients.")
+    parser.add_argument("count", nargs="?", type=int, default=1000, help="Number of clients to seed (e.g. 1000, 10000, 100000)")
+    parser.add_argument("--via", choices=("file", "api"), default="file", help="Write data.json directly (fast) or POST via the API")
+    parser.add_argument("--data-file", type=Path, default=API_DATA_FILE, help="Path to the API data.json (file mode)")
+    parser.add_argument("--prefix", default="Seed", help="Letters-only first-name prefix")
+    parser.add_argument("--purge", action="store_true", help="Remove previously seeded clients instead of adding")
+    args = parser.parse_args(argv)
+
+    if args.via == "file":
+        if not Path(args.data_file).exists():
+            parser.error(
+                f"{args.data_file} does not exist: start the API with DATA_FILE=.data/data.json, "
+                "pass --data-file or use --via api"
+            )
+        if args.purge:
+            print(f"Removed {purge_seeded_clients_file(args.data_file)} seeded clients")
+        else:
+            print(f"Seeded {len(seed_clients_file(args.count, data_file=args.data_file, prefix=args.prefix))} clients")
+        return 0
+
+    from playwright.sync_api import sync_playwright
+
+    from config.settings import BASE_URL
+    from utils.auth import fetch_api_token
+
+    with sync_playwright() as p:
+        token = fetch_api_token(p)
+        api = p.request.new_context(base_url=BASE_URL, extra_http_headers={"Authorization": f"Bearer {token}"})
+        try:
+            if args.purge:
+                print(f"Removed {purge_seeded_clients_api(api)} seeded clients")
+            else:
+                print(f"Seeded {len(seed_clients_api(api, args.count, prefix=args.prefix))} clients")
+        finally:
+            api.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import html
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+import pytest
+
+from config.settings import RUN_HISTORY_DB, SHARD_RESULTS_DIR
+from utils.run_history import accumulate, connect, git_sha, mean_durations, new_result, quarantined, record_run
+from utils.web_perf import record_run as record_web_perf_run, summarize as summarize_web_perf
+
+# Used for tests without recorded history when nothing else is known.
+DEFAULT_TEST_SECONDS = 1.0
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """'2/4' -> (2, 4). Shards are numbered from 1."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise pytest.UsageError(f"--shard expects i/N (e.g. 2/4), got {value!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise pytest.UsageError(f"--shard {value}: index must be between 1 and {max(count, 1)}")
+    return index, count
+
+
+def load_durations(db_path: Path = RUN_HISTORY_DB) -> Dict[str, float]:
+    if not Path(db_path).exists():
+        return {}
+    with connect(db_path) as conn:
+        return mean_durations(conn)
+
+
+def weights_digest(durations: Dict[str, float]) -> str:
+    """Identifies the timing input; shards balanced from different inputs may overlap."""
+    return hashlib.sha1(json.dumps(durations, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def assign(nodeids: Sequence[str], durations: Dict[str, float], count: int) -> Dict[str, int]:
+    """Longest-processing-time partition: slowest test first onto the least loaded shard.
+
+    Deterministic for the same nodeids and durations (ties broken by nodeid and shard
+    number), so every shard computes the same partition independently. Tests without
+    history are weighted with the median recorded duration.
+    """
+    known = sorted(durations[n] for n in nodeids if n in durations)
+    default = known[len(known) // 2] if known else DEFAULT_TEST_SECONDS
+    ordered = sorted(nodeids, key=lambda n: (-durations.get(n, default), n))
+    loads = [(0.0, shard) for shard in range(1, count + 1)]
+    assignment = {}
+    for nodeid in ordered:
+        load, shard = heapq.heappop(loads)
+        assignment[nodeid] = shard
+        heapq.heappush(loads, (load + durations.get(nodeid, default), shard))
+    return assignment
+
+
+def _display_result(current: str, report) -> str:
+    """Outcome as pytest reports it (the history's `outcome` counts quarantine xfails as failures)."""
+    if report.failed:
+        return "failed" if report.when == "call" else "error"
+    if hasattr(report, "wasxfail"):
+        return "xfailed" if report.skipped else "xpassed"
+    if report.skipped and current == "passed":
+        return "skipped"
+    return current
+
+
+class ShardPlugin:
+    """pytest plugin for `--shard=i/N`: runs one timing-balanced slice of the suite.
+
+    Every process (controller and xdist workers alike) computes the same partition from the
+    run history's mean durations. The controller streams one JSON line per finished test
+    (outcome, per-phase durations, user properties, pytest-html extras, failure text) to
+    SHARD_RESULTS_DIR/shard-<i>-of-<N>.jsonl (shard-<i>-of-<N>-quarantine.jsonl for the
+    quarantine lane); `python -m utils.sharding merge` combines the shards into one HTML
+    report and, with --history, one run-history entry per lane.
+    """
+
+    def __init__(self, config: pytest.Config, index: int, count: int, *, results_dir: Path = SHARD_RESULTS_DIR) -> None:
+        self.config = config
+        self.index = index
+        self.count = count
+        self.durations = load_durations()
+        self.is_controller = not hasattr(config, "workerinput")
+        self.lane = config.getoption("--lane", "all")
+        suffix = "-quarantine" if self.lane == "quarantine" else ""
+        self.path = Path(results_dir) / f"shard-{index}-of-{count}{suffix}.jsonl"
+        self.written = 0
+        self._out: Optional[TextIO] = None
+        self._pending: Dict[str, dict] = {}
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config: pytest.Config, items: list) -> None:
+        # trylast: shard what is left after impact selection, lanes and other deselection.
+        assignment = assign([item.nodeid for item in items], self.durations, self.count)
+        selected = [item for item in items if assignment[item.nodeid] == self.index]
+        deselected = [item for item in items if assignment[item.nodeid] != self.index]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    def pytest_report_header(self, config: pytest.Config) -> str:
+        source = f"{len(self.durations)} recorded durations" if self.durations else "no recorded durations"
+        return f"shard {self.index}/{self.count} (balanced from {source})"
+
+    # ---------- results (controller) ----------
+    def pytest_sessionstart(self, session: pytest.Session) -> None:
+        if not self.is_controller:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._out = self.path.open("w", encoding="utf8")
+        self._write({
+            "type": "shard",
+            "shard": self.index,
+            "count": self.count,
+            "digest": weights_digest(self.durations),
+            "started": time.time(),
+            "git_sha": git_sha(Path(self.config.rootpath)),
+            "lane": self.lane,
+        })
+
+    def _write(self, record: dict) -> None:
+        self._out.write(json.dumps(record, default=str) + "\n")
+        self._out.flush()
+        self.written += record["type"] == "test"
+
+    def pytest_runtest_logreport(self, report) -> None:
+        if self._out is None:
+            return
+        node = getattr(report, "node", None)
+        entry = self._pending.get(report.nodeid)
+        if entry is None:
+            entry = self._pending[report.nodeid] = {
+                **new_result(node.gateway.id if node is not None else "master"),
+                "result": "passed",
+                "phases": {},
+                "longrepr": None,
+                "user_properties": [],
+                "extras": [],
+            }
+        accumulate(entry, report)
+        entry["result"] = _display_result(entry["result"], report)
+        entry["phases"][report.when] = round(entry["phases"].get(report.when, 0.0) + report.duration, 3)
+        if report.failed and entry["longrepr"] is None:
+            entry["longrepr"] = report.longreprtext
+        for prop in report.user_properties:  # phases repeat item properties and add their own
+            if list(prop) not in entry["user_properties"]:
+                entry["user_properties"].append(list(prop))
+        entry["extras"].extend(getattr(report, "extras", None) or ())
+        if report.when == "teardown":
+            # Tests finish one at a time per worker, so only in-flight tests are held in memory.
+            self._write({"type": "test", "nodeid": report.nodeid, **self._pending.pop(report.nodeid)})
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        # trylast: record the final exit status (the quarantine lane may have reset it).
+        if self._out is None:
+            return
+        for nodeid, entry in self._pending.items():  # interrupted before teardown
+            self._write({"type": "test", "nodeid": nodeid, **entry})
+        self._write({"type": "end", "exitstatus": int(session.exitstatus), "finished": time.time()})
+        self._out.close()
+        self._out = None
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if self.is_controller:
+            terminalreporter.write_line(f"shard {self.index}/{self.count}: {self.written} test(s), results in {self.path}")
+
+
+# -----------------------------
+# Merge
+# -----------------------------
+def _records(paths: Sequence[Path]) -> Iterator[Tuple[Path, dict]]:
+    for path in paths:
+        with path.open(encoding="utf8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield path, json.loads(line)
+
+
+def _scan(paths: Sequence[Path]) -> dict:
+    """First pass: shard headers and totals only (no per-test data is kept).
+
+    Shards are checked against the other shards of their lane: the quarantine lane is a
+    separate run with its own partition.
+    """
+    shards: Dict[str, dict] = {}
+    totals: Dict[str, int] = {}
+    seen, duplicates = set(), []
+    for path, record in _records(paths):
+        kind = record["type"]
+        if kind == "shard":
+            shards[str(path)] = {**record, "tests": 0, "test_seconds": 0.0, "finished": None, "exitstatus": None}
+        elif kind == "end":
+            shards[str(path)].update(finished=record["finished"], exitstatus=record["exitstatus"])
+        else:
+            totals[record["result"]] = totals.get(record["result"], 0) + 1
+            shards[str(path)]["tests"] += 1
+            shards[str(path)]["test_seconds"] += record["duration"]
+            key = (shards[str(path)]["lane"], record["nodeid"])
+            if key in seen:
+                duplicates.append(record["nodeid"])
+            seen.add(key)
+    warnings = []
+    for lane, lane_shards in _by_lane(shards).items():
+        if len({s["digest"] for s in lane_shards}) > 1:
+            warnings.append(f"{lane} shards were balanced from different timing data; tests may be missing or run twice")
+        if len({s["count"] for s in lane_shards}) > 1:
+            warnings.append(f"{lane} shards disagree on the shard count")
+    if duplicates:
+        warnings.append(f"{len(duplicates)} test(s) ran on more than one shard, e.g. {duplicates[0]}")
+    return {"shards": shards, "totals": totals, "warnings": warnings}
+
+
+def _by_lane(shards: Dict[str, dict]) -> Dict[str, List[dict]]:
+    lanes: Dict[str, List[dict]] = {}
+    for shard in shards.values():
+        lanes.setdefault(shard["lane"], []).append(shard)
+    return lanes
+
+
+_CSS = """
+body{font-family:sans-serif;font-size:14px;margin:20px}table{border-collapse:collapse;width:100%}
+td,th{border:1px solid #ddd;padding:6px;text-align:left;vertical-align:top}th{background:#f2f2f2}
+.passed,.xpassed{color:green}.failed,.error{color:red}.skipped,.xfailed{color:#b58900}pre{white-space:pre-wrap;margin:0}
+.warn{background:#fff3cd;padding:8px;margin:8px 0}details{margin:4px 0}img{max-width:800px}
+"""
+
+
+def _render_extra(extra: dict) -> str:
+    kind = extra.get("format_type")
+    name = html.escape(extra.get("name") or kind or "")
+    content = extra.get("content") or ""
+    if kind == "html":
+        return content  # step tables and similar are already HTML
+    if kind == "image":
+        mime = extra.get("mime_type") or "image/png"
+        src = content if content.startswith(("http", "data:")) else f"data:{mime};base64,{content}"
+        return f'<div>{name}<br><img src="{html.escape(src)}"></div>'
+    if kind == "url":
+        return f'<div><a href="{html.escape(content)}">{name or html.escape(content)}</a></div>'
+    if kind == "json" and not isinstance(content, str):
+        content = json.dumps(content, indent=2)
+    return f"<details><summary>{name}</summary><pre>{html.escape(str(content))}</pre></details>"
+
+
+def write_html(paths: Sequence[Path], out: Path, scan: dict) -> None:
+    """Second pass: stream every test straight from the shard files into the report."""
+    totals = scan["totals"]
+    with out.open("w", encoding="utf8") as fh:
+        fh.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{out.name}</title><style>{_CSS}</style></head><body>")
+        fh.write(f"<h1>{html.escape(out.name)}</h1><p>")
+        fh.write(", ".join(f"<span class='{k}'>{v} {k}</span>" for k, v in sorted(totals.items())) or "no tests")
+        fh.write("</p>")
+        for warning in scan["warnings"]:
+            fh.write(f"<div class='warn'>{html.escape(warning)}</div>")
+        fh.write("<h2>Shards</h2><table><tr><th>Shard</th><th>Tests</th><th>Test time (s)</th><th>Wall time (s)</th><th>Exit status</th></tr>")
+        for shard in sorted(scan["shards"].values(), key=lambda s: s["shard"]):
+            wall = f"{shard['finished'] - shard['started']:.1f}" if shard["finished"] else "incomplete"
+            lane = " (quarantine)" if shard["lane"] == "quarantine" else ""
+            fh.write(
+                f"<tr><td>{shard['shard']}/{shard['count']}{lane}</td><td>{shard['tests']}</td>"
+                f"<td>{shard['test_seconds']:.1f}</td><td>{wall}</td><td>{shard['exitstatus']}</td></tr>"
+            )
+        fh.write("</table><h2>Tests</h2><table><tr><th>Result</th><th>Test</th><th>Shard</th><th>Duration (s)</th></tr>")
+        for path, record in _records(paths):
+            if record["type"] != "test":
+                continue
+            shard = scan["shards"][str(path)]["shard"]
+            result = record["result"]
+            fh.write(
+                f"<tr><td class='{result}'>{result}</td><td>{html.escape(record['nodeid'])}</td>"
+                f"<td>{shard}</td><td>{record['duration']:.2f}</td></tr>"
+            )
+            details = "".join(_render_extra(extra) for extra in record["extras"])
+            if record["longrepr"]:
+                details += f"<details open><summary>failure</summary><pre>{html.escape(record['longrepr'])}</pre></details>"
+            if record["user_properties"]:
+                props = html.escape(json.dumps(dict((p[0], p[1]) for p in record["user_properties"]), default=str))
+                details += f"<details><summary>properties</summary><pre>{props}</pre></details>"
+            if details:
+                fh.write(f"<tr><td></td><td colspan='3'>{details}</td></tr>")
+        fh.write("</table></body></html>")
+
+
+def import_history(paths: Sequence[Path], scan: dict, db_path: Path = RUN_HISTORY_DB) -> List[str]:
+    """Record the shards of each lane as a single run in the run history (feeds the next
+    balancing and the flake scores) and their page loads in the web performance history."""
+    run_ids = []
+    for lane, shards in _by_lane(scan["shards"]).items():
+        lane_paths = [path for path in paths if scan["shards"][str(path)]["lane"] == lane]
+        run_ids.append(_import_run(lane_paths, shards, db_path))
+    return run_ids
+
+
+def _import_run(paths: Sequence[Path], shards: List[dict], db_path: Path) -> str:
+    results: Dict[str, dict] = {}
+    steps: List[tuple] = []
+    loads: Dict[str, List[dict]] = {}
+    run_id = uuid.uuid4().hex
+    for _, record in _records(paths):
+        if record["type"] != "test":
+            continue
+        results[record["nodeid"]] = {k: record[k] for k in ("outcome", "duration", "worker", "retries")}
+        props = dict((p[0], p[1]) for p in record["user_properties"])
+        timings = props.get("step_timings", ())
+        steps.extend((run_id, record["nodeid"], idx, *timing) for idx, timing in enumerate(timings))
+        for load in props.get("web_perf", ()):
+            loads.setdefault(load["page"], []).append(load)
+    exitstatuses = [s["exitstatus"] for s in shards if s["exitstatus"] is not None]
+    run = (
+        run_id,
+        min(s["started"] for s in shards),
+        max((s["finished"] for s in shards if s["finished"]), default=time.time()),
+        shards[0]["git_sha"],
+        shards[0]["lane"],
+        max(exitstatuses, default=int(pytest.ExitCode.INTERRUPTED)),
+    )
+    with connect(db_path) as conn:
+        record_run(conn, run, results, steps, quarantined(conn))
+    if loads:
+        record_web_perf_run(summarize_web_perf(loads), shards[0]["git_sha"])
+    return run_id
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Merge --shard result files into one report.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    merge = sub.add_parser("merge", help="Combine shard-*.jsonl files")
+    merge.add_argument("results", nargs="*", type=Path, help=f"Shard result files (default: {SHARD_RESULTS_DIR}/shard-*.jsonl)")
+    merge.add_argument("--html", type=Path, default=Path("report.html"), help="Merged HTML report")
+    merge.add_argument("--history", action="store_true", help="Also record the merged run in the run history")
+    merge.add_argument("--db", type=Path, default=RUN_HISTORY_DB)
+    args = parser.parse_args(argv)
+
+    paths = args.results or sorted(SHARD_RESULTS_DIR.glob("shard-*.jsonl"))
+    if not paths:
+        print("No shard results found")
+        return 1
+    scan = _scan(paths)
+    write_html(paths, args.html, scan)
+    for warning in scan["warnings"]:
+        print(f"warning: {warning}")
+    summary = ", ".join(f"{v} {k}" for k, v in sorted(scan["totals"].items()))
+    print(f"merged {len(scan['shards'])} shard(s): {summary} -> {args.html}")
+    if args.history:
+        for run_id in import_history(paths, scan, args.db):
+            print(f"run history: recorded run {run_id} in {args.db}")
+    # Same gate as the shards themselves: any failing (or unfinished) shard fails the merge.
+    ok = all(s["exitstatus"] in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED) for s in scan["shards"].values())
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,529 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from config.settings import (
+    API_DATA_FILE,
+    API_PASSWORD,
+    API_SOURCE_DIR,
+    API_USERNAME,
+    ARTIFACTS_DIR,
+    AUTH_COOKIE_NAME,
+    BASE_URL,
+    COOKIE_DOMAIN,
+    LOGIN_API_PATH,
+    SOAK_CONCURRENCY,
+    SOAK_DURATION_S,
+    SOAK_MIN_WINDOWS,
+    SOAK_SAMPLE_INTERVAL_S,
+    SOAK_THINK_TIME_S,
+    SOAK_TOKEN_INACTIVITY_S,
+    SOAK_TOKEN_LIFETIME_S,
+    SOAK_TREND_MIN_GROWTH,
+    SOAK_TREND_MIN_R2,
+    SOAK_UI_WORKERS,
+    TEARDOWN_TIMEOUT_S,
+)
+from utils.stats import percentile
+from utils.entity_registry import EntityRegistry
+from utils.memory import footprint, psutil
+
+# API user scenario mix (name -> weight): mostly reads, some full client lifecycles, the
+# occasional token check and fresh login (every login adds a record to token.json).
+API_SCENARIOS = {"list": 4, "view": 3, "lifecycle": 2, "token_status": 1, "login": 1}
+SOAK_LAST_NAME = "Soak"
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+_EXPIRED_JWT = "Invalid or expired token"  # the API's 403 for a JWT past its expiresIn
+_RELOGIN_MARGIN_S = 300
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)([smh]?)$")
+
+
+def parse_duration(value: str) -> float:
+    """'90', '90s', '30m' or '4h' -> seconds."""
+    match = _DURATION.match(value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"not a duration: {value!r}")
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def _letters(n: int) -> str:
+    return "".join(random.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(n))
+
+
+def find_server_pid() -> Optional[int]:
+    """PID of the local `node server.js` serving the API (not its nodemon parent), if any."""
+    if psutil is None:
+        return None
+    for proc in psutil.process_iter(["pid", "cmdline"]):
+        cmdline = proc.info.get("cmdline") or []
+        if any(arg.endswith("server.js") for arg in cmdline) and not any("nodemon" in arg for arg in cmdline):
+            return proc.info["pid"]
+    return None
+
+
+class _ApiUser:
+    """One virtual API user with its own HTTP session and token.
+
+    Like a real user it logs in again before the JWT expires, and after an auth failure.
+    """
+
+    def __init__(self, run: "SoakRun") -> None:
+        self.run = run
+        self.session = requests.Session()
+        self.token: Optional[str] = None
+        self.last_used = self.issued = time.monotonic()
+        self.client_ids: List[int] = []
+
+    def login(self) -> None:
+        resp = self._timed("POST", LOGIN_API_PATH, "POST /login", json={"username": API_USERNAME, "password": API_PASSWORD})
+        resp.raise_for_status()
+        body = resp.json()
+        self.token = body.get("token") or body.get("access_token")
+        self.session.headers["Authorization"] = f"Bearer {self.token}"
+        self.last_used = self.issued = time.monotonic()
+
+    def _timed(self, method: str, path: str, route: str, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            resp = self.session.request(method, f"{self.run.base_url}{path}", timeout=TEARDOWN_TIMEOUT_S, **kwargs)
+        except requests.RequestException:
+            self.run.record(route, 0, (time.perf_counter() - start) * 1000)
+            raise
+        self.run.record(route, resp.status_code, (time.perf_counter() - start) * 1000)
+        return resp
+
+    def call(self, method: str, path: str, **kwargs) -> requests.Response:
+        if self.token is None or time.monotonic() - self.issued > self.run.token_lifetime_s - _RELOGIN_MARGIN_S:
+            self.login()
+        idle_s = time.monotonic() - self.last_used
+        route = f"{method} {_ID_SEGMENT.sub('/:id', path)}"
+        resp = self._timed(method, path, route, **kwargs)
+        if resp.status_code == 401 or (resp.status_code == 403 and _EXPIRED_JWT in resp.text):
+            self.run.auth_failure(route, resp.status_code, idle_s, resp.text[:200])
+            self.token = None
+        else:
+            self.last_used = time.monotonic()
+        return resp
+
+
+class SoakRun:
+    """Loops an API + UI scenario mix for hours and samples how the system ages.
+
+    SOAK_CONCURRENCY API users and SOAK_UI_WORKERS browser users (each with its own
+    Playwright instance) run in threads, pausing SOAK_THINK_TIME_S between scenarios. Every
+    sample interval the main thread writes one JSON line with per-route p50/p95/p99,
+    error and auth-failure counts, token.json/data.json sizes and the RSS of the API server
+    and of this process tree. Lines are flushed as they are written, so an interrupted soak
+    can still be analysed.
+
+    An auth failure (401, or 403 for an expired JWT) counts as expected only when the
+    user's token was idle for longer than the server's inactivity window. Users log in again
+    before the JWT lifetime runs out. Soaks longer than the inactivity window also run an
+    idle probe. It logs in, stays idle past the window and checks the token is refused.
+    Clients created by the run are recorded in an EntityRegistry and deleted at the end.
+    """
+
+    def __init__(
+        self,
+        *,
+        duration_s: float = SOAK_DURATION_S,
+        concurrency: int = SOAK_CONCURRENCY,
+        ui_workers: int = SOAK_UI_WORKERS,
+        interval_s: float = SOAK_SAMPLE_INTERVAL_S,
+        think_s: float = SOAK_THINK_TIME_S,
+        inactivity_s: float = SOAK_TOKEN_INACTIVITY_S,
+        token_lifetime_s: float = SOAK_TOKEN_LIFETIME_S,
+        base_url: str = BASE_URL,
+        server_pid: Optional[int] = None,
+        out: Optional[Path] = None,
+    ) -> None:
+        self.duration_s = duration_s
+        self.concurrency = max(0, concurrency)
+        self.ui_workers = max(0, ui_workers)
+        self.interval_s = interval_s
+        self.think_s = think_s
+        self.inactivity_s = inactivity_s
+        self.token_lifetime_s = token_lifetime_s
+        self.base_url = base_url.rstrip("/")
+        self.server_pid = server_pid or find_server_pid()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.out = out or ARTIFACTS_DIR / "soak" / f"samples-{stamp}.jsonl"
+        self.files = {"token.json": API_SOURCE_DIR / "token.json", "data.json": API_DATA_FILE}
+        self.registry = EntityRegistry(base_url)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._window = self._new_window()
+
+    @staticmethod
+    def _new_window() -> dict:
+        return {"samples": defaultdict(list), "errors": defaultdict(int), "unexpected_auth": [], "expected_auth": 0, "expiry_checks": []}
+
+    # ---------- recording (any thread) ----------
+    def record(self, route: str, status: int, ms: float) -> None:
+        with self._lock:
+            self._window["samples"][route].append(ms)
+            if status == 0 or status >= 500:
+                self._window["errors"][route] += 1
+
+    def auth_failure(self, route: str, status: int, idle_s: float, detail: str) -> None:
+        with self._lock:
+            if idle_s > self.inactivity_s:
+                self._window["expected_auth"] += 1
+            else:
+                self._window["unexpected_auth"].append(
+                    {"route": route, "status": status, "idle_s": round(idle_s, 1), "detail": detail}
+                )
+
+    # ---------- API users ----------
+    def _scenario(self, name: str, user: _ApiUser) -> None:
+        if name == "login":
+            user.login()
+        elif name == "token_status":
+            user.call("GET", "/tokens/status")
+        elif name == "list":
+            resp = user.call("GET", "/clients")
+            if resp.ok:
+                user.client_ids = [c["id"] for c in resp.json()[-50:] if isinstance(c, dict) and "id" in c]
+        elif name == "view":
+            if user.client_ids:
+                user.call("GET", f"/clients/{random.choice(user.client_ids)}")
+            else:
+                self._scenario("list", user)
+        elif name == "lifecycle":
+            payload = {"firstName": f"Soak{_letters(6)}", "lastName": SOAK_LAST_NAME, "dob": "1990-01-15", "sex": "Female"}
+            resp = user.call("POST", "/clients", json=payload)
+            if resp.status_code != 201:
+                return
+            client_id = resp.json()["id"]
+            self.registry.record("client", client_id)
+            user.call("PUT", f"/clients/{client_id}", json={**payload, "sex": "Male"})
+            if user.call("DELETE", f"/clients/{client_id}").status_code in (200, 204, 404):
+                self.registry.forget("client", client_id)
+
+    def _api_user(self) -> None:
+        user = _ApiUser(self)
+        names, weights = list(API_SCENARIOS), list(API_SCENARIOS.values())
+        while not self._stop.is_set():
+            try:
+                self._scenario(random.choices(names, weights)[0], user)
+            except (requests.RequestException, ValueError, KeyError):
+                pass  # already recorded as an error sample, or a malformed body
+            self._stop.wait(self.think_s)
+
+    # ---------- UI users ----------
+    def _on_page_response(self, response) -> None:
+        if response.status == 401:  # the dashboard is in continuous use: never idle
+            route = f"UI {response.request.method} {_ID_SEGMENT.sub('/:id', urlparse(response.url).path)}"
+            self.auth_failure(route, response.status, 0.0, response.status_text)
+
+    def _ui_user(self, index: int) -> None:
+        from playwright.sync_api import sync_playwright
+
+        from pages.home_page import HomePage
+        from utils.auth import create_authenticated_storage_state
+        from utils.web_perf import web_perf
+
+        # HomePage.goto measures every load into web_perf.current, which only a pytest
+        # session resets: an hours-long run would grow it without bound.
+        web_perf.mode = "off"
+
+        storage = self.out.parent / f"storage-ui{index}.json"
+        api = _ApiUser(self)
+        with sync_playwright() as playwright:
+            try:
+                browser = playwright.chromium.launch(headless=True)
+            except Exception as exc:
+                print(f"warning: UI user {index} could not launch a browser, continuing API-only: {exc}")
+                return
+            while not self._stop.is_set():
+                context = None
+                try:
+                    if not create_authenticated_storage_state(
+                        playwright=playwright,
+                        storage_path=storage,
+                        base_url=self.base_url,
+                        login_api_path=LOGIN_API_PATH,
+                        auth_cookie_name=AUTH_COOKIE_NAME,
+                        cookie_domain=COOKIE_DOMAIN,
+                    ):
+                        raise RuntimeError("login for the UI user failed")
+                    context = browser.new_context(storage_state=str(storage))
+                    context.on("response", self._on_page_response)
+                    home = HomePage(context.new_page())
+                    # A fresh context (and login) before the dashboard's JWT expires.
+                    renew_at = time.monotonic() + self.token_lifetime_s - _RELOGIN_MARGIN_S
+                    while not self._stop.is_set() and time.monotonic() < renew_at:
+                        start = time.perf_counter()
+                        home.goto()
+                        self.record("UI dashboard", 200, (time.perf_counter() - start) * 1000)
+                        start = time.perf_counter()
+                        created = home.add_client(f"Soak{_letters(6)}", SOAK_LAST_NAME, "01/15/1990", "Female")
+                        self.record("UI add client", 200, (time.perf_counter() - start) * 1000)
+                        if created and "id" in created:
+                            self.registry.record("client", created["id"])
+                            if api.call("DELETE", f"/clients/{created['id']}").status_code in (200, 204, 404):
+                                self.registry.forget("client", created["id"])
+                        self._stop.wait(self.think_s)
+                except Exception:
+                    self.record("UI scenario", 0, 0.0)  # fresh context (and login) next round
+                    self._stop.wait(max(self.think_s, 5.0))
+                finally:
+                    if context is not None:
+                        context.close()
+            browser.close()
+
+    # ---------- token expiry ----------
+    def _idle_probe(self, deadline: float) -> None:
+        wait_s = self.inactivity_s * 1.05 + 5  # clearly past the window
+        while time.monotonic() + wait_s < deadline:
+            user = _ApiUser(self)
+            try:
+                user.login()
+            except (requests.RequestException, ValueError):
+                return
+            if self._stop.wait(wait_s):
+                return
+            try:
+                status = user.session.get(f"{self.base_url}/tokens/status", timeout=TEARDOWN_TIMEOUT_S).status_code
+            except requests.RequestException:
+                continue
+            with self._lock:
+                self._window["expiry_checks"].append({"idle_s": wait_s, "status": status, "ok": status == 401})
+
+    # ---------- sampling ----------
+    def _sample(self, elapsed_s: float) -> dict:
+        with self._lock:
+            window, self._window = self._window, self._new_window()
+        routes = {
+            route: {
+                "n": len(ms),
+                "p50": round(percentile(ms, 50), 1),
+                "p95": round(percentile(ms, 95), 1),
+                "p99": round(percentile(ms, 99), 1),
+                "errors": window["errors"].get(route, 0),
+            }
+            for route, ms in sorted(window["samples"].items())
+        }
+        files = {name: (path.stat().st_size if path.exists() else None) for name, path in self.files.items()}
+        rss = {}
+        if psutil is not None:
+            own, children, _ = footprint()
+            rss["runner"] = round(own + children, 1)
+            if self.server_pid:
+                try:
+                    rss["server"] = round(psutil.Process(self.server_pid).memory_info().rss / 1024 / 1024, 1)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+        return {
+            "t": round(elapsed_s, 1),
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "routes": routes,
+            "expected_auth": window["expected_auth"],
+            "unexpected_auth": window["unexpected_auth"],
+            "expiry_checks": window["expiry_checks"],
+            "files": files,
+            "rss_mb": rss,
+        }
+
+    def run(self) -> Path:
+        """Soak until the duration is over (or Ctrl-C); returns the samples file."""
+        self.out.parent.mkdir(parents=True, exist_ok=True)
+        admin = _ApiUser(self)
+        admin.login()
+        self.registry.token = admin.token
+        started = time.monotonic()
+        deadline = started + self.duration_s
+        threads = [threading.Thread(target=self._api_user, daemon=True) for _ in range(self.concurrency)]
+        threads += [threading.Thread(target=self._ui_user, args=(i,), daemon=True) for i in range(self.ui_workers)]
+        threads.append(threading.Thread(target=self._idle_probe, args=(deadline,), daemon=True))
+        for thread in threads:
+            thread.start()
+        try:
+            with self.out.open("w", encoding="utf8") as fh:
+                tick = started
+                while tick < deadline:
+                    tick = min(tick + self.interval_s, deadline)
+                    time.sleep(max(0.0, tick - time.monotonic()))
+                    sample = self._sample(time.monotonic() - started)
+                    fh.write(json.dumps(sample) + "\n")
+                    fh.flush()
+                    print(_progress_line(sample))
+        except KeyboardInterrupt:
+            print("soak interrupted; analysing what was recorded")
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join(timeout=TEARDOWN_TIMEOUT_S * 3)
+            cleanup = self.registry.teardown()
+            if cleanup["failed"]:
+                print(f"warning: could not delete soak clients {cleanup['failed']}")
+        return self.out
+
+
+def _progress_line(sample: dict) -> str:
+    calls = sum(r["n"] for r in sample["routes"].values())
+    worst = max(sample["routes"].items(), key=lambda kv: kv[1]["p95"], default=None)
+    files = ", ".join(f"{k} {v / 1024:.0f} KB" for k, v in sample["files"].items() if v is not None)
+    rss = ", ".join(f"{k} {v:.0f} MB" for k, v in sample["rss_mb"].items())
+    slowest = f"slowest p95 {worst[0]} {worst[1]['p95']:.0f} ms" if worst else "no calls"
+    return (
+        f"[{sample['t'] / 60:6.1f} min] {calls} calls, {slowest}, "
+        f"auth failures {len(sample['unexpected_auth'])} unexpected/{sample['expected_auth']} expected; {files}; {rss}"
+    )
+
+
+# -----------------------------
+# Trend analysis
+# -----------------------------
+def linear_fit(xs: List[float], ys: List[float]) -> Tuple[float, float, float]:
+    """Least-squares (slope, intercept, r²) of ys over xs."""
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    if sxx == 0:
+        return 0.0, mean_y, 0.0
+    slope = sxy / sxx
+    r2 = (sxy * sxy) / (sxx * syy) if syy else 0.0
+    return slope, mean_y - slope * mean_x, r2
+
+
+def _series(samples: List[dict]) -> Dict[str, Tuple[str, List[Tuple[float, float]]]]:
+    """name -> (unit, [(hours, value)]) for every latency, file-size and RSS series."""
+    series: Dict[str, Tuple[str, List[Tuple[float, float]]]] = {}
+
+    def add(name: str, unit: str, x: float, y: Optional[float]) -> None:
+        if y is not None:
+            series.setdefault(name, (unit, []))[1].append((x, float(y)))
+
+    for sample in samples:
+        hours = sample["t"] / 3600
+        for route, stats in sample["routes"].items():
+            add(f"p95 {route}", "ms", hours, stats["p95"])
+        for name, size in sample["files"].items():
+            add(f"size {name}", "KB", hours, None if size is None else size / 1024)
+        for name, mb in sample["rss_mb"].items():
+            add(f"rss {name}", "MB", hours, mb)
+    return series
+
+
+def analyze(
+    samples: List[dict],
+    *,
+    min_windows: int = SOAK_MIN_WINDOWS,
+    min_growth: float = SOAK_TREND_MIN_GROWTH,
+    min_r2: float = SOAK_TREND_MIN_R2,
+) -> dict:
+    """Fit every series over time (the first window is warm-up and skipped) and flag growth."""
+    trends = []
+    for name, (unit, points) in sorted(_series(samples[1:]).items()):
+        if len(points) < min_windows:
+            continue
+        xs, ys = [p[0] for p in points], [p[1] for p in points]
+        slope, intercept, r2 = linear_fit(xs, ys)
+        start, end = intercept + slope * xs[0], intercept + slope * xs[-1]
+        growth = (end - start) / abs(start) if start else (math.inf if end > start else 0.0)
+        trends.append({
+            "series": name,
+            "unit": unit,
+            "windows": len(points),
+            "start": round(start, 1),
+            "end": round(end, 1),
+            "per_hour": round(slope, 2),
+            "growth": round(growth, 3) if math.isfinite(growth) else None,
+            "r2": round(r2, 3),
+            "flagged": slope > 0 and growth >= min_growth and r2 >= min_r2,
+        })
+    unexpected = [dict(e, t=s["t"]) for s in samples for e in s["unexpected_auth"]]
+    expiry = [dict(c, t=s["t"]) for s in samples for c in s["expiry_checks"]]
+    errors = sum(r["errors"] for s in samples for r in s["routes"].values())
+    flags = [f"{t['series']} grows {t['per_hour']:+} {t['unit']}/h (r² {t['r2']})" for t in trends if t["flagged"]]
+    if unexpected:
+        flags.append(f"{len(unexpected)} unexpected auth failure(s), first: {unexpected[0]}")
+    flags += [f"token still accepted after {c['idle_s']:.0f} s idle (status {c['status']})" for c in expiry if not c["ok"]]
+    return {
+        "windows": len(samples),
+        "hours": round(samples[-1]["t"] / 3600, 2) if samples else 0.0,
+        "calls": sum(r["n"] for s in samples for r in s["routes"].values()),
+        "errors": errors,
+        "expected_auth": sum(s["expected_auth"] for s in samples),
+        "unexpected_auth": unexpected,
+        "expiry_checks": expiry,
+        "trends": trends,
+        "flags": flags,
+    }
+
+
+def load_samples(path: Path) -> List[dict]:
+    with path.open(encoding="utf8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"soak: {report['hours']} h, {report['windows']} window(s), {report['calls']} calls, "
+        f"{report['errors']} error(s), {report['expected_auth']} expected auth failure(s)"
+    )
+    for t in report["trends"]:
+        growth = "n/a" if t["growth"] is None else f"{t['growth']:+.0%}"
+        mark = "!!" if t["flagged"] else "  "
+        print(f" {mark} {t['series']:<32} {t['start']:>10} -> {t['end']:<10} {t['unit']:<3} {t['per_hour']:+10} /h  {growth:>6}  r² {t['r2']}")
+    for flag in report["flags"]:
+        print(f"flag: {flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Long-running soak of the TestProduct API and UI.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Loop the scenario mix and sample latency, file sizes and RSS")
+    run.add_argument("--duration", type=parse_duration, default=SOAK_DURATION_S, help="e.g. 4h, 30m (default: TESTPRODUCT_SOAK_DURATION_S)")
+    run.add_argument("--concurrency", type=int, default=SOAK_CONCURRENCY, help="Concurrent API users")
+    run.add_argument("--ui-workers", type=int, default=SOAK_UI_WORKERS, help="Concurrent browser users (0: API only)")
+    run.add_argument("--interval", type=parse_duration, default=SOAK_SAMPLE_INTERVAL_S, help="Sampling interval")
+    run.add_argument("--server-pid", type=int, default=None, help="API server PID for RSS (default: found by its server.js command line)")
+    analyze_cmd = sub.add_parser("analyze", help="Re-analyse a samples file (e.g. with other thresholds)")
+    analyze_cmd.add_argument("samples", type=Path)
+    for cmd in (run, analyze_cmd):
+        cmd.add_argument("--min-growth", type=float, default=SOAK_TREND_MIN_GROWTH)
+        cmd.add_argument("--min-r2", type=float, default=SOAK_TREND_MIN_R2)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        path = SoakRun(
+            duration_s=args.duration,
+            concurrency=args.concurrency,
+            ui_workers=args.ui_workers,
+            interval_s=args.interval,
+            server_pid=args.server_pid,
+        ).run()
+    else:
+        path = args.samples
+    samples = load_samples(path)
+    if not samples:
+        print(f"No samples in {path}")
+        return 1
+    report = analyze(samples, min_growth=args.min_growth, min_r2=args.min_r2)
+    out = path.with_name(path.stem.replace("samples", "report") + ".json")
+    out.write_text(json.dumps(report, indent=1), encoding="utf8")
+    print_report(report)
+    print(f"samples: {path}\nreport: {out}")
+    return 1 if report["flags"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
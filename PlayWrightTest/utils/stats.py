@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable
+
+
+def percentile(values: Iterable[float], pct: float) -> float:
+    """Nearest-rank percentile (`pct` in 0-100) of a non-empty sample.
+
+    No interpolation: the result is always an observed value, which is what timeouts and
+    latency reports want, and is exact enough for a few hundred samples.
+    """
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
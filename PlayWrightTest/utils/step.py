@@ -1,26 +1,46 @@
 import logging
+import time
 from contextlib import contextmanager
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List
 
 # Global list to store steps for the current test
 # This is reset by the `reset_step_history` fixture in conftest.py
 current_steps: List[Dict[str, Any]] = []
 
+# Callbacks invoked as listener(event, step_info) with event "start" or "end".
+# Fixtures register here to hook into step boundaries (e.g. per-step trace chunks).
+step_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+
+
+def _notify(event: str, step_info: Dict[str, Any]) -> None:
+    for listener in list(step_listeners):
+        try:
+            listener(event, step_info)
+        except Exception as e:
+            # A broken listener must never change the outcome of the step itself.
+            logging.warning(f"Step listener failed on {event} of '{step_info['name']}': {e}")
+
 @contextmanager
 def step(name: str):
     """
     Context manager to log a test step and track its status (passed/failed).
     """
-    step_info = {"name": name, "status": "running", "error": None}
+    step_info = {"name": name, "status": "running", "error": None, "duration_ms": None}
     # Add to history immediately
     current_steps.append(step_info)
     logging.info(f"STEP START: {name}")
+    _notify("start", step_info)
+    start = time.perf_counter()
     try:
         yield
+        step_info["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
         step_info["status"] = "passed"
         logging.info(f"STEP PASS: {name}")
+        _notify("end", step_info)
     except Exception as e:
+        step_info["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
         step_info["status"] = "failed"
         step_info["error"] = str(e)
         logging.error(f"STEP FAIL: {name} - {e}")
+        _notify("end", step_info)
         raise
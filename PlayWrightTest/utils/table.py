@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Mapping, Optional, Sequence
+
+from playwright.sync_api import Error as PlaywrightError, Page
+
+# Collects every mismatch between the expected spec and the rendered table. Rows are keyed
+# either by the `data-client-id` attribute ("id") or by the exact text of a column; cells
+# are addressed by their mat-table column class (td.mat-column-<name>).
+_TABLE_MISMATCHES_JS = """
+(spec) => {
+  const norm = (s) => (s || '').replace(/\\s+/g, ' ').trim();
+  const table = document.querySelector(spec.selector);
+  if (!table) return [`table '${spec.selector}' not found`];
+
+  const mismatches = [];
+  const headers = Array.from(table.querySelectorAll('th')).map(th => norm(th.textContent));
+  for (const h of spec.headers) {
+    if (!headers.includes(h)) mismatches.push(`header '${h}' missing (found: ${JSON.stringify(headers)})`);
+  }
+
+  const cell = (row, col) => {
+    const td = row.querySelector(`td.mat-column-${col}`);
+    return td ? norm(td.textContent) : null;
+  };
+  const rows = Array.from(table.querySelectorAll('tr')).filter(r => r.querySelector('td'));
+  for (const exp of spec.rows) {
+    const keyValue = String(exp[spec.key]);
+    const row = rows.find(r => spec.key === 'id'
+      ? r.getAttribute('data-client-id') === keyValue
+      : cell(r, spec.key) === keyValue);
+    if (!row) {
+      mismatches.push(`row ${spec.key}=${keyValue} not found`);
+      continue;
+    }
+    for (const [col, want] of Object.entries(exp)) {
+      if (col === spec.key && spec.key === 'id') continue;
+      const got = cell(row, col);
+      if (got !== norm(String(want))) {
+        mismatches.push(`row ${spec.key}=${keyValue}: ${col} expected '${want}', got '${got}'`);
+      }
+    }
+  }
+  return mismatches;
+}
+"""
+
+
+class TableMismatchError(AssertionError):
+    """Raised by verify_table with every mismatch found on the final attempt."""
+
+    def __init__(self, mismatches: List[str]) -> None:
+        self.mismatches = mismatches
+        super().__init__(
+            f"Table verification failed ({len(mismatches)} mismatch(es)):\n  - " + "\n  - ".join(mismatches)
+        )
+
+
+def verify_table(
+    page: Page,
+    *,
+    headers: Iterable[str] = (),
+    rows: Sequence[Mapping[str, object]] = (),
+    key: str = "id",
+    selector: str = "table",
+    timeout: Optional[float] = 10000,
+) -> None:
+    """Assert table headers and cell values in one in-page check with a shared retry loop.
+
+    Instead of one `expect(...)` (and one polling round trip) per header and cell, the whole
+    spec is sent to the page once and re-checked there on every animation frame until it
+    matches or `timeout` ms elapse. On timeout all mismatches are reported together.
+
+    `rows` is a list of dicts mapping column names (mat-table column ids such as
+    "firstName", "dob") to expected text; each row must include `key` to identify it.
+    """
+    spec = {"selector": selector, "headers": list(headers), "rows": [dict(r) for r in rows], "key": key}
+    try:
+        page.wait_for_function(
+            f"(spec) => ({_TABLE_MISMATCHES_JS})(spec).length === 0",
+            arg=spec,
+            timeout=timeout,
+        )
+    except PlaywrightError:
+        # Timed out (or navigated mid-check): re-run once to report the final state.
+        mismatches = page.evaluate(_TABLE_MISMATCHES_JS, spec)
+        if mismatches:
+            raise TableMismatchError(mismatches) from None
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Deque, Dict, Iterator, Optional
+
+from config.settings import (
+    ADAPTIVE_TIMEOUTS,
+    TIMEOUT_FLOOR_MS,
+    TIMEOUT_HISTORY_DIR,
+    TIMEOUT_MAX_MULTIPLIER,
+    TIMEOUT_MIN_SAMPLES,
+    TIMEOUT_SAFETY_FACTOR,
+    TIMEOUT_WINDOW,
+)
+from utils.stats import percentile
+
+# Worst-case defaults (ms) used until enough latency has been observed for an operation.
+# These are the values that used to be hard-coded in the page objects and tests.
+DEFAULT_TIMEOUTS_MS: Dict[str, float] = {
+    "navigation": 15000,
+    "navigation_retry": 5000,
+    "dialog_open": 5000,
+    "save_enabled": 10000,
+    "create_client_response": 20000,
+    "dialog_close": 30000,
+    "dashboard_refresh": 10000,
+    "snackbar": 1500,
+    "row_visible": 10000,
+    "table_verify": 10000,
+}
+
+
+class TimeoutManager:
+    """Derive per-operation timeouts from the p99 latency observed in recent runs.
+
+    Successful waits are recorded with `measure(op)`; `get(op)` returns
+    p99 * safety factor, clamped to [floor, default * max multiplier]. Until an operation has
+    `min_samples` observations the worst-case default is used. Samples are kept in a rolling
+    window and persisted per xdist worker under `history_dir`, then merged on load.
+    """
+
+    def __init__(
+        self,
+        history_dir: Path = TIMEOUT_HISTORY_DIR,
+        *,
+        enabled: bool = ADAPTIVE_TIMEOUTS,
+        safety_factor: float = TIMEOUT_SAFETY_FACTOR,
+        min_samples: int = TIMEOUT_MIN_SAMPLES,
+        window: int = TIMEOUT_WINDOW,
+        floor_ms: float = TIMEOUT_FLOOR_MS,
+        max_multiplier: float = TIMEOUT_MAX_MULTIPLIER,
+    ) -> None:
+        self.history_dir = Path(history_dir)
+        self.enabled = enabled
+        self.safety_factor = safety_factor
+        self.min_samples = min_samples
+        self.window = window
+        self.floor_ms = floor_ms
+        self.max_multiplier = max_multiplier
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        # Samples observed in this process only; merged into this worker's file on save so
+        # history from other workers is never written back twice. Only the last `window`
+        # survive a save, so no more are kept (long soak runs never save).
+        self._new: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._cache: Dict[str, float] = {}
+        self._loaded = False
+
+    # ---------- persistence ----------
+    def _history_file(self) -> Path:
+        worker = os.getenv("PYTEST_XDIST_WORKER", "master")
+        return self.history_dir / f"latency-{worker}.json"
+
+    def load(self) -> None:
+        self._loaded = True
+        if not self.history_dir.exists():
+            return
+        for path in sorted(self.history_dir.glob("latency-*.json")):
+            try:
+                data = json.loads(path.read_text(encoding="utf8"))
+            except (OSError, ValueError):
+                continue
+            for op, samples in data.items():
+                self._samples[op].extend(float(s) for s in samples)
+        self._cache.clear()
+
+    def save(self) -> None:
+        if not self._new:
+            return
+        path = self._history_file()
+        try:
+            data = json.loads(path.read_text(encoding="utf8"))
+        except (OSError, ValueError):
+            data = {}
+        for op, samples in self._new.items():
+            data[op] = (data.get(op, []) + list(samples))[-self.window:]
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data), encoding="utf8")
+        self._new.clear()
+
+    # ---------- API ----------
+    def record(self, op: str, elapsed_ms: float) -> None:
+        if not self._loaded:
+            self.load()
+        self._samples[op].append(round(elapsed_ms, 1))
+        self._new[op].append(round(elapsed_ms, 1))
+        self._cache.pop(op, None)
+
+    @contextmanager
+    def measure(self, op: str) -> Iterator[None]:
+        """Record the duration of the block for `op` if it completes without raising."""
+        start = time.perf_counter()
+        yield
+        self.record(op, (time.perf_counter() - start) * 1000)
+
+    def p99(self, op: str) -> Optional[float]:
+        if not self._loaded:
+            self.load()
+        samples = self._samples.get(op)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        return percentile(samples, 99)
+
+    def get(self, op: str, default: Optional[float] = None) -> float:
+        """Timeout in milliseconds for `op`."""
+        fallback = default if default is not None else DEFAULT_TIMEOUTS_MS.get(op, 10000)
+        if not self.enabled:
+            return fallback
+        if op in self._cache:
+            return self._cache[op]
+        p99 = self.p99(op)
+        if p99 is None:
+            return fallback
+        timeout = min(max(p99 * self.safety_factor, self.floor_ms), fallback * self.max_multiplier)
+        self._cache[op] = timeout
+        return timeout
+
+
+# Shared instance used by page objects and tests; conftest persists it at session end.
+timeouts = TimeoutManager()
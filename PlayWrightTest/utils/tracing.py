@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List
+
+from playwright.sync_api import BrowserContext
+
+from utils.step import step_listeners
+
+
+def _slug(text: str, limit: int = 80) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", text).strip("_")[:limit]
+
+
+class StepTracer:
+    """Keep Playwright tracing in rolling chunks aligned with `utils.step` boundaries.
+
+    Tracing starts once per context; every top-level step gets its own chunk. A chunk is
+    written to disk only when its step fails (or, for activity outside steps, when the test
+    fails), otherwise it is discarded by `stop_chunk()` without a path. Passing tests
+    therefore never serialise a trace.
+    """
+
+    def __init__(self, context: BrowserContext, out_dir: Path, test_id: str, *, screenshots: bool = False) -> None:
+        self.context = context
+        self.out_dir = Path(out_dir)
+        self.test_id = _slug(test_id)
+        self.screenshots = screenshots
+        # Artifacts of failed chunks: {"kind": "trace"|"screenshot", "path": Path, "step": str}
+        self.artifacts: List[Dict[str, Any]] = []
+        self._depth = 0
+        self._index = 0
+
+    def start(self) -> None:
+        self.context.tracing.start(screenshots=self.screenshots, snapshots=True, sources=False)
+        step_listeners.append(self._on_step)
+
+    def _on_step(self, event: str, step_info: Dict[str, Any]) -> None:
+        if event == "start":
+            self._depth += 1
+            if self._depth == 1:
+                # Discards whatever ran since the previous step and opens this step's chunk.
+                self.context.tracing.start_chunk(title=step_info["name"])
+            return
+
+        self._depth -= 1
+        if self._depth == 0:
+            self._index += 1
+            if step_info["status"] == "failed":
+                self._save_chunk(step_info["name"])
+            else:
+                self.context.tracing.stop_chunk()
+            # Open a chunk for activity between steps so a non-step failure is still traced.
+            self.context.tracing.start_chunk()
+
+    def _save_chunk(self, label: str) -> None:
+        base = self.out_dir / f"{self.test_id}-{self._index:02d}-{_slug(label, 40)}"
+        base.parent.mkdir(parents=True, exist_ok=True)
+        trace_path = base.with_suffix(".zip")
+        self.context.tracing.stop_chunk(path=str(trace_path))
+        self.artifacts.append({"kind": "trace", "path": trace_path, "step": label})
+        if self.screenshots:
+            for n, page in enumerate(self.context.pages):
+                shot = base.parent / f"{base.name}-page{n}.png"
+                try:
+                    page.screenshot(path=str(shot))
+                except Exception:
+                    continue
+                self.artifacts.append({"kind": "screenshot", "path": shot, "step": label})
+
+    def finish(self, failed: bool) -> None:
+        """Stop tracing; keep the open chunk only if the test failed outside a saved step."""
+        if self._on_step in step_listeners:
+            step_listeners.remove(self._on_step)
+        try:
+            already_saved = any(a["kind"] == "trace" for a in self.artifacts)
+            if failed and not already_saved:
+                self._save_chunk("test")
+            else:
+                self.context.tracing.stop_chunk()
+        finally:
+            self.context.tracing.stop()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import re
+import sys
+import warnings
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+from playwright.sync_api import Locator
+
+from config.settings import (
+    ARTIFACTS_DIR,
+    VISUAL_BASELINE_DIR,
+    VISUAL_MAX_DIFF_RATIO,
+    VISUAL_MODE,
+    VISUAL_PIXEL_TOLERANCE,
+    VISUAL_RECORD_MISSING,
+)
+
+MODES = ("check", "update", "off")
+
+
+class VisualMismatchError(AssertionError):
+    """Raised by VisualChecker.check when a screenshot differs from its baseline."""
+
+    def __init__(self, key: str, detail: str, diff_path: Optional[Path] = None) -> None:
+        self.key = key
+        self.diff_path = diff_path
+        message = f"Visual mismatch for '{key}': {detail}"
+        if diff_path is not None:
+            message += f" (diff: {diff_path})"
+        super().__init__(message)
+
+
+class MissingBaselineWarning(UserWarning):
+    """Emitted by VisualChecker.check when a baseline is missing and not recorded."""
+
+
+def dhash(image: Image.Image, size: int = 8) -> int:
+    """64-bit difference hash: sign of horizontal gradients on a 9x8 grayscale thumbnail."""
+    small = np.asarray(image.convert("L").resize((size + 1, size), Image.BILINEAR), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int("".join("1" if b else "0" for b in bits), 2)
+
+
+def _decode(png: bytes) -> Image.Image:
+    return Image.open(io.BytesIO(png)).convert("RGB")
+
+
+# Decoded baselines by object path (content-addressed, so entries never go stale).
+_PIXEL_CACHE: Dict[Path, np.ndarray] = {}
+_PIXEL_CACHE_SIZE = 64
+
+
+def _baseline_pixels(path: Path) -> np.ndarray:
+    pixels = _PIXEL_CACHE.get(path)
+    if pixels is None:
+        if len(_PIXEL_CACHE) >= _PIXEL_CACHE_SIZE:
+            _PIXEL_CACHE.pop(next(iter(_PIXEL_CACHE)))
+        pixels = _PIXEL_CACHE[path] = np.asarray(_decode(path.read_bytes()), dtype=np.int16)
+    return pixels
+
+
+class VisualChecker:
+    """Element screenshot comparison against content-addressed baselines.
+
+    Cheapest test first:
+      1. sha256 of the PNG equals the baseline's  -> identical, nothing decoded
+      2. perceptual hash (dHash) equals the baseline's -> visually the same, no pixel diff
+      3. NumPy pixel diff; fails when more than `max_diff_ratio` of the pixels differ by more
+         than `pixel_tolerance` in any channel, and writes a diff image.
+
+    Baseline PNGs are stored once per content hash under `objects/`; `index/<key>.json`
+    points a key (name + engine + platform) at its current object and dHash. Decoded
+    baselines are cached in memory for the session.
+
+    A missing baseline is recorded, unless `record_missing` is off (default under CI): then
+    the check passes with a MissingBaselineWarning and the capture is stored in the same layout
+    under ARTIFACTS_DIR/visual/new, so approving it means copying that tree into the baselines.
+    """
+
+    def __init__(
+        self,
+        baseline_dir: Path = VISUAL_BASELINE_DIR,
+        *,
+        mode: str = VISUAL_MODE,
+        pixel_tolerance: int = VISUAL_PIXEL_TOLERANCE,
+        max_diff_ratio: float = VISUAL_MAX_DIFF_RATIO,
+        record_missing: bool = VISUAL_RECORD_MISSING,
+    ) -> None:
+        self.baseline_dir = Path(baseline_dir)
+        self.mode = mode if mode in MODES else "check"
+        self.pixel_tolerance = pixel_tolerance
+        self.max_diff_ratio = max_diff_ratio
+        self.record_missing = record_missing
+
+    # ---------- storage ----------
+    def _index_path(self, key: str, root: Optional[Path] = None) -> Path:
+        return (root or self.baseline_dir) / "index" / f"{key}.json"
+
+    def _object_path(self, sha: str, root: Optional[Path] = None) -> Path:
+        return (root or self.baseline_dir) / "objects" / sha[:2] / f"{sha}.png"
+
+    def _load_index(self, key: str) -> Optional[dict]:
+        path = self._index_path(key)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf8"))
+
+    def _store(self, key: str, png: bytes, sha: str, image: Image.Image, root: Optional[Path] = None) -> None:
+        obj = self._object_path(sha, root)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            obj.write_bytes(png)
+        index = self._index_path(key, root)
+        index.parent.mkdir(parents=True, exist_ok=True)
+        index.write_text(
+            json.dumps({"sha256": sha, "dhash": f"{dhash(image):016x}", "size": list(image.size)}), encoding="utf8"
+        )
+
+    # ---------- comparison ----------
+    @staticmethod
+    def key_for(locator: Locator, name: str) -> str:
+        browser = locator.page.context.browser
+        engine = browser.browser_type.name if browser is not None else "browser"
+        return re.sub(r"[^\w.-]", "_", f"{name}.{engine}.{sys.platform}")
+
+    def check(self, locator: Locator, name: str, *, mask: Sequence[Locator] = ()) -> None:
+        """Compare a screenshot of `locator` with the baseline `name` (recorded if missing,
+        unless `record_missing` is off)."""
+        if self.mode == "off":
+            return
+        key = self.key_for(locator, name)
+        png = locator.screenshot(animations="disabled", caret="hide", mask=list(mask))
+        sha = hashlib.sha256(png).hexdigest()
+        baseline = self._load_index(key)
+        if baseline is not None and baseline["sha256"] == sha:
+            return
+        image = _decode(png)
+        if baseline is None and self.mode != "update" and not self.record_missing:
+            pending = ARTIFACTS_DIR / "visual" / "new"
+            self._store(key, png, sha, image, pending)
+            warnings.warn(MissingBaselineWarning(
+                f"No visual baseline for '{key}'; capture saved to {self._object_path(sha, pending)}. "
+                f"Approve it by copying {pending} into {self.baseline_dir}."
+            ))
+            return
+        if baseline is None or self.mode == "update":
+            self._store(key, png, sha, image)
+            return
+        if f"{dhash(image):016x}" == baseline["dhash"] and list(image.size) == baseline["size"]:
+            return
+        self._pixel_diff(key, image, baseline)
+
+    def _pixel_diff(self, key: str, image: Image.Image, baseline: dict) -> None:
+        actual = np.asarray(image, dtype=np.int16)
+        expected = _baseline_pixels(self._object_path(baseline["sha256"]))
+        if actual.shape != expected.shape:
+            raise VisualMismatchError(key, f"size {image.size} differs from baseline {tuple(baseline['size'])}")
+        changed = np.abs(actual - expected).max(axis=2) > self.pixel_tolerance
+        ratio = float(changed.mean())
+        if ratio <= self.max_diff_ratio:
+            return
+        out = ARTIFACTS_DIR / "visual" / f"{key}.diff.png"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        overlay = (actual // 3).astype(np.uint8)
+        overlay[changed] = (255, 0, 0)
+        Image.fromarray(overlay).save(out)
+        raise VisualMismatchError(key, f"{ratio:.2%} of pixels differ (limit {self.max_diff_ratio:.2%})", out)
+
+
+# Shared instance used by the page objects; conftest applies --visual.
+visual = VisualChecker()
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import statistics
+import weakref
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+from playwright.sync_api import Page
+
+from config.settings import (
+    ARTIFACTS_DIR,
+    WEBPERF_BUDGETS,
+    WEBPERF_HISTORY,
+    WEBPERF_MODE,
+    WEBPERF_REGRESSION_RATIO,
+    WEBPERF_WINDOW,
+)
+from utils.run_history import git_sha
+
+MODES = ("off", "soft", "hard")
+
+# Runs before any page script on every navigation. Long tasks and LCP are only observable
+# while the page runs (and only in engines that support them), so they are buffered on
+# window.__testproductPerf; Navigation/Resource Timing is read when the page is measured.
+_INIT_SCRIPT = """
+(() => {
+  if (window.__testproductPerf) return;
+  const perf = window.__testproductPerf = { longTasks: [], lcp: null };
+  performance.setResourceTimingBufferSize && performance.setResourceTimingBufferSize(1000);
+  const supported = (PerformanceObserver && PerformanceObserver.supportedEntryTypes) || [];
+  const observe = (type, callback) => {
+    if (!supported.includes(type)) return;
+    new PerformanceObserver(list => list.getEntries().forEach(callback)).observe({ type, buffered: true });
+  };
+  observe('longtask', e => perf.longTasks.push(e.duration));
+  observe('largest-contentful-paint', e => { perf.lcp = e.renderTime || e.loadTime || e.startTime; });
+})();
+"""
+
+_COLLECT_JS = """
+() => {
+  const perf = window.__testproductPerf || { longTasks: null, lcp: null };
+  const nav = performance.getEntriesByType('navigation')[0];
+  const resources = performance.getEntriesByType('resource');
+  const round = v => (v === null || v === undefined || v <= 0) ? null : Math.round(v);
+  const transfer = resources.reduce((sum, r) => sum + (r.transferSize || 0), nav ? nav.transferSize || 0 : 0);
+  return {
+    ttfb_ms: nav ? round(nav.responseStart - nav.startTime) : null,
+    dom_content_loaded_ms: nav ? round(nav.domContentLoadedEventEnd) : null,
+    load_ms: nav ? round(nav.loadEventEnd) : null,
+    lcp_ms: round(perf.lcp),
+    ready_ms: Math.round(performance.now()),
+    long_tasks: perf.longTasks ? perf.longTasks.length : null,
+    total_blocking_ms: perf.longTasks ? Math.round(perf.longTasks.reduce((s, d) => s + Math.max(0, d - 50), 0)) : null,
+    resources: resources.length,
+    transfer_kb: Math.round(transfer / 1024),
+    slowest: resources.slice().sort((a, b) => b.duration - a.duration).slice(0, 3)
+      .map(r => [r.name.split('?')[0].split('/').pop() || r.name, Math.round(r.duration)]),
+  };
+}
+"""
+
+# Metrics summarised per page (medians) and compared with earlier runs.
+METRICS = ("ttfb_ms", "dom_content_loaded_ms", "load_ms", "lcp_ms", "ready_ms", "long_tasks", "total_blocking_ms", "resources", "transfer_kb")
+
+
+def _medians(rows: List[dict]) -> Dict[str, float]:
+    return {
+        metric: statistics.median(values)
+        for metric in METRICS
+        if (values := [row[metric] for row in rows if row.get(metric) is not None])
+    }
+
+
+def summarize(
+    loads: Dict[str, List[dict]], budgets: Dict[str, Dict[str, float]] = WEBPERF_BUDGETS, history: Path = WEBPERF_HISTORY
+) -> Dict[str, dict]:
+    """Per-page medians of a run's loads, compared with the previous WEBPERF_WINDOW runs."""
+    runs = []
+    if history.exists():
+        with history.open(encoding="utf8") as fh:
+            runs = [json.loads(line) for line in fh if line.strip()]
+    summary = {}
+    for page, rows in sorted(loads.items()):
+        medians = _medians(rows)
+        previous = _medians([r["medians"] for r in runs if r["page"] == page][-WEBPERF_WINDOW:])
+        budget = budgets.get(page, {})
+        # Budgeted metrics only, and by at least a tenth of the budget: ignores 3 -> 5 ms.
+        regressed = {
+            metric: [previous[metric], value]
+            for metric, value in medians.items()
+            if metric in budget
+            and previous.get(metric)
+            and value > previous[metric] * WEBPERF_REGRESSION_RATIO
+            and value - previous[metric] >= budget[metric] / 10
+        }
+        summary[page] = {"loads": len(rows), "medians": medians, "previous": previous, "regressed": regressed}
+    return summary
+
+
+def record_run(summary: Dict[str, dict], sha: Optional[str], history: Path = WEBPERF_HISTORY) -> None:
+    """Append one line per page (the run's medians) to the history."""
+    at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    history.parent.mkdir(parents=True, exist_ok=True)
+    with history.open("a", encoding="utf8") as fh:
+        for page, s in summary.items():
+            fh.write(json.dumps({"at": at, "git_sha": sha, "page": page, "loads": s["loads"], "medians": s["medians"]}) + "\n")
+
+
+class PerfBudgetError(AssertionError):
+    """Raised by WebPerfMonitor.measure in hard mode when a page load exceeds its budget."""
+
+
+class WebPerfMonitor:
+    """Page load metrics from the browser's Performance APIs, checked against per-page budgets.
+
+    Page objects call `prepare(page)` before navigating (installs the observer init script
+    once per page) and `measure(page, name)` once the page is usable. `ready_ms` is the time
+    from navigation start to that point. Metrics an engine cannot report (long tasks and LCP
+    outside Chromium) are None and never fail a budget.
+
+    As a pytest plugin it records each test's loads (`web_perf`) and budget overruns
+    (`web_perf_violations`) on the report. `soft` stops there; `hard` also raises
+    PerfBudgetError from the page load. The controller writes the run's loads to
+    .artifacts/web-perf.json, appends per-page medians to WEBPERF_HISTORY (unless `record` is
+    off: sharded runs are recorded by the merge) and reports budgeted medians that regressed
+    against the previous WEBPERF_WINDOW runs.
+    """
+
+    def __init__(
+        self, mode: str = WEBPERF_MODE, budgets: Dict[str, Dict[str, float]] = WEBPERF_BUDGETS, *, record: bool = True
+    ) -> None:
+        self.mode = mode if mode in MODES else "soft"
+        self.budgets = budgets
+        self.record = record
+        self._prepared: "weakref.WeakSet[Page]" = weakref.WeakSet()
+        self.current: List[dict] = []
+        # Controller-side aggregation (from report user properties, so it works under xdist).
+        self.loads: Dict[str, List[dict]] = defaultdict(list)
+        self.violations: List[str] = []
+        self.summary: Optional[Dict[str, dict]] = None
+
+    # ---------- page objects ----------
+    def prepare(self, page: Page) -> None:
+        if self.mode == "off" or page in self._prepared:
+            return
+        page.add_init_script(_INIT_SCRIPT)
+        self._prepared.add(page)
+
+    def measure(self, page: Page, name: str) -> Optional[dict]:
+        """Collect the current page load's metrics as `name` and check them against its budget."""
+        if self.mode == "off":
+            return None
+        metrics = page.evaluate(_COLLECT_JS)
+        over = [
+            f"{name} {metric} {metrics[metric]} > {limit}"
+            for metric, limit in self.budgets.get(name, {}).items()
+            if metrics.get(metric) is not None and metrics[metric] > limit
+        ]
+        self.current.append({"page": name, **metrics, "over": over})
+        if over and self.mode == "hard":
+            raise PerfBudgetError(f"Page load over budget: {'; '.join(over)} (slowest: {metrics['slowest']})")
+        return metrics
+
+    # ---------- plugin ----------
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        self.current = []
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call):
+        outcome = yield
+        if call.when != "teardown" or not self.current:
+            return
+        report = outcome.get_result()
+        report.user_properties.append(("web_perf", self.current))
+        over = sorted({o for load in self.current for o in load["over"]})
+        if over:
+            report.user_properties.append(("web_perf_violations", over))
+
+    def pytest_runtest_logreport(self, report) -> None:
+        props = dict(report.user_properties)
+        for load in props.get("web_perf", ()):
+            self.loads[load["page"]].append({**load, "test": report.nodeid})
+        self.violations.extend(f"{v}  ({report.nodeid})" for v in props.get("web_perf_violations", ()))
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if hasattr(session.config, "workerinput") or not self.loads:
+            return
+        self.summary = summarize(self.loads, self.budgets)
+        ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+        (ARTIFACTS_DIR / "web-perf.json").write_text(
+            json.dumps({"summary": self.summary, "loads": self.loads, "violations": self.violations}, indent=1),
+            encoding="utf8",
+        )
+        if self.record:
+            record_run(self.summary, git_sha(Path(session.config.rootpath)))
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.summary:
+            return
+        terminalreporter.section("Web performance (median per page load)")
+        for page, s in self.summary.items():
+            budget = self.budgets.get(page, {})
+            cells = []
+            for metric, value in s["medians"].items():
+                cell = f"{metric}={value:g}"
+                if metric in budget:
+                    cell += f"/{budget[metric]:g}"
+                if metric in s["regressed"]:
+                    cell += f" (was {s['previous'][metric]:g})"
+                cells.append(cell)
+            terminalreporter.write_line(f"{page} ({s['loads']} loads): {', '.join(cells)}")
+            for metric, (before, now) in s["regressed"].items():
+                terminalreporter.write_line(
+                    f"  regression: {page} {metric} median {now:g} vs {before:g} over the last {WEBPERF_WINDOW} runs"
+                )
+        for violation in self.violations[:10]:
+            terminalreporter.write_line(f"over budget: {violation}")
+        if len(self.violations) > 10:
+            terminalreporter.write_line(f"... {len(self.violations) - 10} more in {ARTIFACTS_DIR / 'web-perf.json'}")
+
+
+# Shared instance used by the page objects; conftest applies --web-perf and registers it.
+web_perf = WebPerfMonitor()
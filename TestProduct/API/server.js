@@ -47,13 +47,24 @@ const swaggerOptions = {
         Client: {
           type: 'object',
           properties: {
-            ClientID: { type: 'integer', format: 'int32' },
-            FirstName: { type: 'string' },
-            LastName: { type: 'string' },
-            DOB: { type: 'string', format: 'date' },
-            Sex: { type: 'string', enum: ['Male', 'Female'] },
-            CreatedByUserID: { type: 'integer', format: 'int32' },
+            id: { type: 'integer', format: 'int32' },
+            firstName: { type: 'string' },
+            lastName: { type: 'string' },
+            dob: { type: 'string', format: 'date' },
+            sex: { type: 'string', enum: ['Male', 'Female'] },
+            createdByUserId: { type: 'integer', format: 'int32' },
           },
+          required: ['id', 'firstName', 'lastName', 'dob', 'sex', 'createdByUserId'],
+        },
+        ClientInput: {
+          type: 'object',
+          properties: {
+            firstName: { type: 'string', maxLength: 25, pattern: '^[A-Za-z]+$' },
+            lastName: { type: 'string', maxLength: 20, pattern: '^[A-Za-z]+$' },
+            dob: { type: 'string', format: 'date', description: 'At least 18 years ago' },
+            sex: { type: 'string', enum: ['Male', 'Female'] },
+          },
+          required: ['firstName', 'lastName', 'dob', 'sex'],
         },
         Error: {
           type: 'object',
@@ -142,20 +153,7 @@ const swaggerOptions = {
           security: [{ bearerAuth: [] }],
           requestBody: {
             required: true,
-            content: {
-              'application/json': {
-                schema: {
-                  type: 'object',
-                  properties: {
-                    firstName: { type: 'string', maxLength: 25, pattern: '^[A-Za-z]+$' },
-                    lastName: { type: 'string', maxLength: 20, pattern: '^[A-Za-z]+$' },
-                    dob: { type: 'string', format: 'date' },
-                    sex: { type: 'string', enum: ['Male', 'Female'] },
-                  },
-                  required: ['firstName', 'lastName', 'dob', 'sex'],
-                },
-              },
-            },
+            content: { 'application/json': { schema: { $ref: '#/components/schemas/ClientInput' } } },
           },
           responses: {
 
@@ -166,6 +164,46 @@ const swaggerOptions = {
           },
         },
       },
+      '/clients/{id}': {
+        parameters: [
+          { name: 'id', in: 'path', required: true, schema: { type: 'integer' } },
+        ],
+        get: {
+          summary: 'Get a client by id',
+          security: [{ bearerAuth: [] }],
+          responses: {
+            200: { description: 'The client', content: { 'application/json': { schema: { $ref: '#/components/schemas/Client' } } } },
+            401: { description: 'Missing token', content: { 'application/json': { schema: { $ref: '#/components/schemas/Error' } } } },
+            403: { description: 'Invalid or expired token, or a client of another user', content: { 'application/json': { schema: { $ref: '#/components/schemas/Error' } } } },
+            404: { description: 'Client not found', content: { 'application/json': { schema: { $ref: '#/components/schemas/Error' } } } },
+          },
+        },
+        put: {
+          summary: 'Update a client',
+          security: [{ bearerAuth: [] }],
+          requestBody: {
+            required: true,
+            content: { 'application/json': { schema: { $ref: '#/components/schemas/ClientInput' } } },
+          },
+          responses: {
+            200: { description: 'Client updated', content: { 'application/json': { schema: { $ref: '#/components/schemas/Client' } } } },
+            400: { description: 'Validation error', content: { 'application/json': { schema: { $ref: '#/components/schemas/Error' } } } },
+            401: { description: 'Missing token', content: { 'application/json': { schema: { $ref: '#/components/schemas/Error' } } } },
+            403: { description: 'Invalid or expired token, or a client of another user', content: { 'application/json': { schema: { $ref: '#/components/schemas/Error' } } } },
+            404: { description: 'Client not found', content: { 'application/json': { schema: { $ref: '#/components/schemas/Error' } } } },
+          },
+        },
+        delete: {
+          summary: 'Delete a client',
+          security: [{ bearerAuth: [] }],
+          responses: {
+            200: { description: 'Client deleted', content: { 'application/json': { schema: { type: 'object', properties: { message: { type: 'string' } } } } } },
+            401: { description: 'Missing token', content: { 'application/json': { schema: { $ref: '#/components/schemas/Error' } } } },
+            403: { description: 'Invalid or expired token, or a client of another user', content: { 'application/json': { schema: { $ref: '#/components/schemas/Error' } } } },
+            404: { description: 'Client not found', content: { 'application/json': { schema: { $ref: '#/components/schemas/Error' } } } },
+          },
+        },
+      },
       '/tokens/status': {
         get: {
           summary: 'Get current token status',
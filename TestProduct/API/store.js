@@ -2,7 +2,10 @@ const fs = require('fs').promises;
 const path = require('path');
 const bcrypt = require('bcryptjs');
 
-const DATA_FILE = path.join(__dirname, 'data.json');
+const SAMPLE_DATA_FILE = path.join(__dirname, 'data.json');
+// DATA_FILE moves the store elsewhere (e.g. an ignored copy for seeded test runs); it starts
+// as a copy of the bundled data.json.
+const DATA_FILE = process.env.DATA_FILE ? path.resolve(process.env.DATA_FILE) : SAMPLE_DATA_FILE;
 
 const TOKEN_FILE = path.join(__dirname, 'token.json');
 
@@ -11,6 +14,15 @@ async function ensureDataFile() {
   try {
     await fs.access(DATA_FILE);
   } catch {
+    if (DATA_FILE !== SAMPLE_DATA_FILE) {
+      await fs.mkdir(path.dirname(DATA_FILE), { recursive: true });
+      try {
+        await fs.copyFile(SAMPLE_DATA_FILE, DATA_FILE);
+        return;
+      } catch {
+        // no bundled data.json: start empty below
+      }
+    }
     const passwordHash = await bcrypt.hash('123456', 10);
     const initial = {
       users: [
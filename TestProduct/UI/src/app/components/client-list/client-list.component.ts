@@ -54,7 +54,7 @@ import { DomSanitizer, SafeResourceUrl } from '@angular/platform-browser';
       </ng-container>
 
       <tr mat-header-row *matHeaderRowDef="displayedColumns"></tr>
-      <tr mat-row *matRowDef="let row; columns: displayedColumns; trackBy: trackByIndex"></tr>
+      <tr mat-row *matRowDef="let row; columns: displayedColumns; trackBy: trackByIndex" [attr.data-client-id]="row.id"></tr>
     </table>
   </div>
   `,